@@ -33,7 +33,7 @@ class PopulateMapAction(Action):
         """
         Places the specified number of entities of a given type on the map.
         """
-        for _ in range(count):
+        for entity in EntityFactory.create_many(entity_type, count):
             try:
                 coord = world_map.find_random_empty_cell()
             except RuntimeError:
@@ -41,5 +41,4 @@ class PopulateMapAction(Action):
             except ValueError as e:
                 game_logger.log(f"[Error]: {e}")
                 continue
-            entity = EntityFactory.create_entity(entity_type)
             world_map.add_entity(coord, entity)
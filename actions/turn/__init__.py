@@ -1,9 +1,11 @@
 from .apply_hunger import ApplyHungerAction
 from .move_creatures import MoveCreaturesAction
 from .spawn_grass import SpawnGrassAction
+from .two_phase_move_creatures import TwoPhaseMoveCreaturesAction
 
 __all__ = [
     "ApplyHungerAction",
     "MoveCreaturesAction",
     "SpawnGrassAction",
+    "TwoPhaseMoveCreaturesAction",
 ]
@@ -2,8 +2,7 @@ from typing import TYPE_CHECKING
 
 from actions import Action
 from config import config
-from entities.base import Creature
-from sim_logging import game_logger
+from sim_logging import EventType, game_logger
 
 if TYPE_CHECKING:
     from world.map import Map
@@ -11,17 +10,22 @@ if TYPE_CHECKING:
 
 class ApplyHungerAction(Action):
     def execute(self, world_map: "Map") -> None:
-        """Applies hunger (HP loss) to all creatures on the map."""
-        entities_with_coords = list(
-            world_map.get_all_entities_with_coords().items()
-        )
+        """
+        Applies hunger (HP loss) to all creatures on the map.
 
-        for coord, entity in entities_with_coords:
-            if isinstance(entity, Creature):
-                entity.take_damage(config.hunger_hp_loss_per_turn)
-                if not entity.is_alive:
-                    game_logger.log(
-                        f"DEATH (starvation): {entity.symbol} {coord} "
-                        f"{config.death_symbol}"
-                    )
-                    world_map.remove_entity(coord)
+        HP of every creature is lowered with one array operation on the
+        creature store and the starved ones are found with one mask.
+        """
+        store = world_map.creature_store
+        dead_ids = store.damage_all(config.hunger_hp_loss_per_turn)
+
+        for creature_id in dead_ids.tolist():
+            entity = store.get(creature_id)
+            coord = store.get_coord(creature_id)
+            game_logger.log_event(
+                EventType.DEATH_STARVATION,
+                entity.entity_type.code,
+                coord.x,
+                coord.y,
+            )
+            world_map.remove_entity(coord)
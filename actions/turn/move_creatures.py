@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 
 from actions import Action
 from entities import Creature
-from sim_logging import game_logger
+from sim_logging import EventType, game_logger
 
 if TYPE_CHECKING:
     from world.map import Map
@@ -11,15 +11,24 @@ if TYPE_CHECKING:
 class MoveCreaturesAction(Action):
     def execute(self, world_map: "Map") -> None:
         """Moves all creatures on the map."""
-        entities_with_coords = list(
-            world_map.get_all_entities_with_coords().items()
+        creatures_with_coords = list(
+            world_map.get_creatures_with_coords().items()
         )
 
-        for coord, entity in entities_with_coords:
+        for coord, entity in creatures_with_coords:
+            # Skip creatures killed earlier in this turn
+            if world_map.get_entity(coord) is not entity:
+                continue
             if isinstance(entity, Creature):
                 try:
                     entity.take_turn(coord, world_map)
                 except ValueError as err:
-                    game_logger.log(
-                        f"ACTION_FAIL: {entity.symbol} at {coord}: {err}"
+                    game_logger.log_event(
+                        EventType.ACTION_FAIL,
+                        entity.entity_type.code,
+                        coord.x,
+                        coord.y,
+                        -1,
+                        -1,
+                        err,
                     )
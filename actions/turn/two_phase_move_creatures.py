@@ -0,0 +1,131 @@
+import random
+from typing import TYPE_CHECKING
+
+from actions import Action
+from config import config
+from entities import Creature
+from entities.base import Intent, IntentType
+
+if TYPE_CHECKING:
+    from pathfinding import PathFinder
+    from world import Coordinate
+    from world.map import Map
+
+_MASK_64 = (1 << 64) - 1
+
+
+def _cell_hash(seed: int, index: int) -> int:
+    """Pseudo-random 64-bit value of a cell index (splitmix64)."""
+    value = (seed + (index + 1) * 0x9E3779B97F4A7C15) & _MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return value ^ (value >> 31)
+
+
+class TwoPhaseMoveCreaturesAction(Action):
+    """
+    Moves all creatures in two phases.
+
+    First every creature decides what to do from the map as it was at
+    the start of the turn, which nothing changes during this phase. The
+    creatures are handled in batches of config.intent_batch_size.
+    Before the first batch, the map indexes and the fields that path
+    finders share between searches are built; each batch then searches
+    with its own forks of the path finders, dropped once it is done, and
+    returns what its creatures decided, paths to keep included, as
+    intents. A batch thus only writes to its own finders, except for
+    the nodes_expanded count of shared flow-field finders and the turn
+    profiler's records, which are only read when profiling. Then the
+    intents are applied: all actions first, then all moves, each in an
+    order given by a per-turn hash of the creatures' cells. A creature killed earlier in the phase
+    does not act, and of several creatures going for the same grass or
+    cell the first one gets it while the others fail and stay.
+
+    The tie-breaking hash and the choice of random moves only depend on
+    the cells and one number drawn per turn, so the outcome does not
+    depend on the order the map lists its creatures in.
+    """
+
+    def execute(self, world_map: "Map") -> None:
+        creatures_with_coords = [
+            (coord, entity)
+            for coord, entity in world_map.get_creatures_with_coords().items()
+            if isinstance(entity, Creature)
+        ]
+        seed = random.getrandbits(64)
+        batch_size = config.intent_batch_size
+
+        world_map.build_indexes()
+        self.prepare_path_finders(world_map, creatures_with_coords)
+
+        intents = []
+        for start in range(0, len(creatures_with_coords), batch_size):
+            batch = creatures_with_coords[start : start + batch_size]
+            # The forks only live while the batch decides
+            intents.extend(
+                self.decide_batch(
+                    world_map, batch, seed, self.fork_path_finders(batch)
+                )
+            )
+        self.resolve(world_map, intents)
+
+    @staticmethod
+    def prepare_path_finders(
+        world_map: "Map",
+        creatures_with_coords: list[tuple["Coordinate", Creature]],
+    ) -> None:
+        """Build the shared fields of the creatures' path finders once."""
+        prepared = set()
+        for coord, creature in creatures_with_coords:
+            if creature.path_finder not in prepared:
+                prepared.add(creature.path_finder)
+                creature.prepare_path_finder(coord, world_map)
+
+    @staticmethod
+    def fork_path_finders(
+        creatures_with_coords: list[tuple["Coordinate", Creature]],
+    ) -> dict["PathFinder", "PathFinder"]:
+        """Forks of the creatures' path finders for one batch."""
+        path_finders = {}
+        for _, creature in creatures_with_coords:
+            path_finder = creature.path_finder
+            if path_finder not in path_finders:
+                path_finders[path_finder] = path_finder.fork()
+        return path_finders
+
+    @staticmethod
+    def decide_batch(
+        world_map: "Map",
+        creatures_with_coords: list[tuple["Coordinate", Creature]],
+        seed: int,
+        path_finders: dict["PathFinder", "PathFinder"],
+    ) -> list[tuple[int, Creature, Intent]]:
+        """
+        Intents of a batch of creatures with their priority, lowest
+        first. Paths are searched with path_finders, the batch's own
+        finders by the creatures' ones. The map and the creatures are
+        only read.
+        """
+        width = world_map.width
+        decided = []
+        for coord, creature in creatures_with_coords:
+            value = _cell_hash(seed, coord.y * width + coord.x)
+            intent = creature.decide(
+                coord, world_map, value, path_finders[creature.path_finder]
+            )
+            decided.append((value, creature, intent))
+        return decided
+
+    @staticmethod
+    def resolve(
+        world_map: "Map", intents: list[tuple[int, Creature, Intent]]
+    ) -> None:
+        """Apply the intents of the turn, actions before moves."""
+        intents.sort(
+            key=lambda item: (item[2].kind != IntentType.ACT, item[0])
+        )
+        for _, creature, intent in intents:
+            # Skip creatures killed earlier in this turn
+            if world_map.get_entity(intent.coord) is not creature:
+                continue
+            creature.apply_intent(intent, world_map)
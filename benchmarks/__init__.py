@@ -0,0 +1,3 @@
+from .suite import BenchmarkCase, build_cases, run_suite
+
+__all__ = ["BenchmarkCase", "build_cases", "run_suite"]
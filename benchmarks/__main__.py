@@ -0,0 +1,135 @@
+"""
+Benchmarks for the turn pipeline.
+
+Record a baseline, then compare a later run against it:
+    python -m benchmarks run --output baseline.json
+    python -m benchmarks run --output current.json
+    python -m benchmarks compare baseline.json current.json --threshold 0.1
+"""
+
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+
+from benchmarks.suite import CREATURE_DENSITIES, build_cases, run_suite
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.command == "run":
+        return run(args)
+    return compare(args)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parses command line arguments."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run and save benchmarks")
+    run_parser.add_argument(
+        "--output", required=True, help="JSON file to write results to"
+    )
+    run_parser.add_argument(
+        "--sizes",
+        type=_parse_size,
+        nargs="+",
+        default=None,
+        help="map sizes as WIDTHxHEIGHT (default: 15x10 up to 2000x2000)",
+    )
+    run_parser.add_argument(
+        "--densities",
+        choices=list(CREATURE_DENSITIES),
+        nargs="+",
+        default=None,
+        help="creature densities (default: all)",
+    )
+    run_parser.add_argument(
+        "--backend", default="dict", help="map backend (default: dict)"
+    )
+    run_parser.add_argument(
+        "--turns", type=int, default=5, help="timed turns per case"
+    )
+    run_parser.add_argument(
+        "--samples", type=int, default=10, help="sampled creatures per case"
+    )
+
+    compare_parser = commands.add_parser(
+        "compare", help="flag slowdowns against a baseline"
+    )
+    compare_parser.add_argument("baseline", help="baseline JSON file")
+    compare_parser.add_argument("current", help="current JSON file")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown that counts as a regression (default: 0.1)",
+    )
+    return parser.parse_args(argv)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Runs the selected cases and writes their timings."""
+    cases = build_cases(args.sizes, args.densities, args.backend)
+    results = run_suite(cases, args.turns, args.samples)
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "turns": args.turns,
+            "samples": args.samples,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2, sort_keys=True)
+    print(f"Saved {len(results)} results to {args.output}")
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Prints per-benchmark ratios; non-zero exit code on regressions."""
+    baseline = _load_results(args.baseline)
+    current = _load_results(args.current)
+
+    regressions = 0
+    for key in sorted(baseline.keys() & current.keys()):
+        before = baseline[key]["median"]
+        after = current[key]["median"]
+        ratio = after / before if before > 0 else float("inf")
+        flag = ""
+        if ratio > 1 + args.threshold:
+            flag = "  SLOWER"
+            regressions += 1
+        elif ratio < 1 - args.threshold:
+            flag = "  faster"
+        print(
+            f"{key}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms "
+            f"(x{ratio:.2f}){flag}"
+        )
+
+    for key in sorted(baseline.keys() - current.keys()):
+        print(f"{key}: missing from {args.current}")
+
+    print(f"\n{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def _load_results(path: str) -> dict[str, dict[str, float]]:
+    with open(path, encoding="utf-8") as report:
+        return json.load(report)["results"]
+
+
+def _parse_size(text: str) -> tuple[int, int]:
+    width, _, height = text.lower().partition("x")
+    try:
+        return int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid map size: {text}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+import contextlib
+import io
+import statistics
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable
+
+from actions.turn import (
+    ApplyHungerAction,
+    MoveCreaturesAction,
+    SpawnGrassAction,
+)
+from config import configure
+from entities import Predator
+from pathfinding import BFSPathFinder
+from rendering import MapRenderer
+from simulation import Simulation
+from sim_logging import game_logger
+from utils import EntityType, seed_random
+from world import MapFactory
+
+MAP_SIZES = [(15, 10), (100, 100), (500, 500), (1000, 1000), (2000, 2000)]
+
+# Share of map cells occupied by creatures (2/3 herbivores)
+CREATURE_DENSITIES = {"low": 0.001, "medium": 0.01, "high": 0.05}
+
+SEED = 12345
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """One map size and creature density, populated from a fixed seed."""
+
+    width: int
+    height: int
+    density: str
+    backend: str = "dict"
+
+    @property
+    def name(self) -> str:
+        return f"{self.backend}/{self.width}x{self.height}/{self.density}"
+
+    @property
+    def creature_counts(self) -> tuple[int, int]:
+        creatures = self.width * self.height * CREATURE_DENSITIES[self.density]
+        herbivores = max(2, round(creatures * 2 / 3))
+        predators = max(1, round(creatures / 3))
+        return herbivores, predators
+
+
+def build_cases(
+    sizes: list[tuple[int, int]] | None = None,
+    densities: list[str] | None = None,
+    backend: str = "dict",
+) -> list[BenchmarkCase]:
+    """All combinations of map sizes and creature densities."""
+    return [
+        BenchmarkCase(width, height, density, backend)
+        for width, height in sizes or MAP_SIZES
+        for density in densities or CREATURE_DENSITIES
+    ]
+
+
+def run_suite(
+    cases: list[BenchmarkCase],
+    turns: int = 5,
+    samples: int = 10,
+    log: Callable[[str], None] = print,
+) -> dict[str, dict[str, float]]:
+    """
+    Time every benchmark of every case.
+
+    Args:
+        cases: Map sizes and densities to run
+        turns: Turns timed for the turn actions and the renderer
+        samples: Creatures sampled for the per-creature benchmarks
+        log: Receives one line per finished benchmark
+
+    Returns:
+        {"<case>/<benchmark>": {"median": s, "min": s, "runs": n}}
+    """
+    results = {}
+    for case in cases:
+        for benchmark, timings in _run_case(case, turns, samples).items():
+            key = f"{case.name}/{benchmark}"
+            results[key] = {
+                "median": statistics.median(timings),
+                "min": min(timings),
+                "runs": len(timings),
+            }
+            log(f"{key}: {results[key]['median'] * 1000:.3f} ms")
+    return results
+
+
+def _run_case(
+    case: BenchmarkCase, turns: int, samples: int
+) -> dict[str, list[float]]:
+    """Populate a map for the case and collect timings per benchmark."""
+    herbivores, predators = case.creature_counts
+    configure(
+        map_width=case.width,
+        map_height=case.height,
+        map_backend=case.backend,
+        initial_herbivores=herbivores,
+        initial_predators=predators,
+    )
+    seed_random(SEED)
+    world_map = MapFactory.create_map()
+    Simulation(world_map).initialize()
+    game_logger.clear()
+
+    timings: dict[str, list[float]] = {
+        "bfs_find_nearest_target_path": [],
+        "predator_get_movement_targets": [],
+        "move_creatures": [],
+        "apply_hunger": [],
+        "spawn_grass": [],
+        "render_map": [],
+    }
+    _time_creature_calls(world_map, samples, timings)
+
+    turn_actions = [
+        ("move_creatures", MoveCreaturesAction()),
+        ("apply_hunger", ApplyHungerAction()),
+        ("spawn_grass", SpawnGrassAction()),
+    ]
+    for _ in range(turns):
+        world_map.begin_turn()
+        for benchmark, action in turn_actions:
+            timings[benchmark].append(_timed(action.execute, world_map))
+        game_logger.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            timings["render_map"].append(
+                _timed(MapRenderer.render_map, world_map)
+            )
+    return timings
+
+
+def _time_creature_calls(
+    world_map, samples: int, timings: dict[str, list[float]]
+) -> None:
+    """Time pathfinding and target gathering for sampled creatures."""
+    path_finder = BFSPathFinder()
+    grass = world_map.get_coords_by_type(EntityType.GRASS)
+    herbivores = sorted(
+        world_map.get_coords_by_type(EntityType.HERBIVORE),
+        key=lambda coord: (coord.y, coord.x),
+    )
+    for coord in herbivores[:samples]:
+        timings["bfs_find_nearest_target_path"].append(
+            _timed(
+                path_finder.find_nearest_target_path, coord, world_map, grass
+            )
+        )
+
+    predators = [
+        creature
+        for creature in world_map.get_creatures_with_coords().values()
+        if isinstance(creature, Predator)
+    ]
+    for predator in predators[:samples]:
+        timings["predator_get_movement_targets"].append(
+            _timed(
+                predator.get_movement_targets,
+                world_map,
+                EntityType.HERBIVORE,
+            )
+        )
+
+
+def _timed(function: Callable, *args) -> float:
+    """Wall time of a single call in seconds."""
+    start = perf_counter()
+    function(*args)
+    return perf_counter() - start
@@ -0,0 +1,217 @@
+"""
+Checkpoints of a running simulation.
+
+A checkpoint is an uncompressed NumPy .npz archive holding the int8
+(height, width) grid of EntityType codes, the type, position and stats
+of every creature as parallel arrays, the paths creatures keep with
+path caching, and a JSON string with the turn and map version counters,
+the config and the random generator states. No entity objects
+are pickled, so saving and loading cost a few array copies plus the
+rebuild of the map indexes; static cells are only added to the
+coordinate indexes when those are first queried.
+"""
+
+import gc
+import json
+import os
+from dataclasses import asdict
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from config import config, configure
+from entities.entity_factory import EntityFactory
+from simulation import Simulation
+from utils import EntityType, get_random_state, set_random_state
+from world import MapFactory
+
+if TYPE_CHECKING:
+    from entities.base import Creature
+    from world import Map
+
+CHECKPOINT_VERSION = 2
+
+
+def save_checkpoint(sim: Simulation, path: str) -> None:
+    """
+    Write the full state of a simulation to path.
+
+    The archive is written next to path first and then renamed over it,
+    so an interrupted save never leaves a truncated checkpoint behind.
+    """
+    world_map = sim.world_map
+    creatures = world_map.get_creatures_with_coords()
+    meta = {
+        "version": CHECKPOINT_VERSION,
+        "backend": MapFactory.get_backend_name(world_map),
+        "width": world_map.width,
+        "height": world_map.height,
+        "turn_count": sim.turn_count,
+        "map_turn": world_map.turn,
+        "map_version": world_map.version,
+        "config": asdict(config),
+        "random_state": get_random_state(),
+    }
+    # Creatures are saved in the order they act in
+    arrays = {
+        "grid": world_map.get_code_grid(),
+        "creature_type": np.fromiter(
+            (c.entity_type.code for c in creatures.values()),
+            np.int8,
+            len(creatures),
+        ),
+        "creature_x": np.fromiter(
+            (coord.x for coord in creatures), np.int32, len(creatures)
+        ),
+        "creature_y": np.fromiter(
+            (coord.y for coord in creatures), np.int32, len(creatures)
+        ),
+        "hp": np.fromiter(
+            (c.hp for c in creatures.values()), np.float64, len(creatures)
+        ),
+        "max_hp": np.fromiter(
+            (c.max_hp for c in creatures.values()),
+            np.float64,
+            len(creatures),
+        ),
+        "speed": np.fromiter(
+            (c.speed for c in creatures.values()), np.int32, len(creatures)
+        ),
+        **_save_cached_paths(world_map, list(creatures.values())),
+    }
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        np.savez(file, meta=np.array(json.dumps(meta)), **arrays)
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(path: str) -> Simulation:
+    """
+    Rebuild a simulation from a checkpoint written by save_checkpoint.
+
+    The shared config and the random generators are reset to their
+    saved values, so the restored run continues exactly like the saved
+    one would have.
+    """
+    with np.load(path) as archive:
+        meta = json.loads(archive["meta"].item())
+        if meta["version"] != CHECKPOINT_VERSION:
+            raise ValueError(
+                f"{path} has unsupported checkpoint version "
+                f"{meta['version']}"
+            )
+        arrays = {name: archive[name] for name in archive.files}
+
+    configure(**meta["config"])
+    world_map = MapFactory.create_map(
+        meta["backend"], meta["width"], meta["height"]
+    )
+    # The rebuild allocates one coordinate per occupied cell and nothing
+    # that forms cycles, so collection passes would only slow it down
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        _restore_static_entities(world_map, arrays["grid"])
+        creatures = _restore_creatures(world_map, arrays)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    world_map.turn = meta["map_turn"]
+    world_map.version = meta["map_version"]
+    _restore_cached_paths(world_map, creatures, arrays)
+    sim = Simulation(world_map)
+    sim.turn_count = meta["turn_count"]
+    sim.initialized = True
+    set_random_state(meta["random_state"])
+    return sim
+
+
+def _restore_static_entities(world_map: "Map", grid: np.ndarray) -> None:
+    """Bulk-add the static entities of a saved code grid."""
+    world_map.add_static_grid(
+        grid,
+        [
+            EntityFactory.create_entity(entity_type)
+            for entity_type in EntityType
+            if entity_type not in EntityType.creatures()
+        ],
+    )
+
+
+def _restore_creatures(
+    world_map: "Map", arrays: dict[str, np.ndarray]
+) -> list["Creature"]:
+    """Re-create the saved creatures in their saved order."""
+    coords = [
+        world_map.get_coord(x, y)
+        for x, y in zip(
+            arrays["creature_x"].tolist(), arrays["creature_y"].tolist()
+        )
+    ]
+    creatures = []
+    for code, hp, max_hp, speed in zip(
+        arrays["creature_type"].tolist(),
+        arrays["hp"].tolist(),
+        arrays["max_hp"].tolist(),
+        arrays["speed"].tolist(),
+    ):
+        creature = EntityFactory.create_entity(EntityType.from_code(code))
+        creature.hp = hp
+        creature.max_hp = max_hp
+        creature.speed = speed
+        creatures.append(creature)
+    world_map.add_entities(coords, creatures)
+    return creatures
+
+
+def _save_cached_paths(
+    world_map: "Map", creatures: list["Creature"]
+) -> dict[str, np.ndarray]:
+    """
+    Arrays of the paths kept by the creatures: the length of every path
+    (0 for none), its map version, and the flat cell indexes of all
+    paths one after another.
+    """
+    paths = [creature.cached_path or [] for creature in creatures]
+    return {
+        "path_length": np.fromiter(
+            (len(path) for path in paths), np.int32, len(paths)
+        ),
+        "path_version": np.fromiter(
+            (creature.cached_path_version for creature in creatures),
+            np.int64,
+            len(creatures),
+        ),
+        "path_cells": np.fromiter(
+            (
+                coord.y * world_map.width + coord.x
+                for path in paths
+                for coord in path
+            ),
+            np.int64,
+        ),
+    }
+
+
+def _restore_cached_paths(
+    world_map: "Map",
+    creatures: list["Creature"],
+    arrays: dict[str, np.ndarray],
+) -> None:
+    """Give the restored creatures back the paths they kept."""
+    cells = arrays["path_cells"].tolist()
+    offset = 0
+    for creature, length, version in zip(
+        creatures,
+        arrays["path_length"].tolist(),
+        arrays["path_version"].tolist(),
+    ):
+        if length:
+            creature.cached_path = [
+                world_map.index_to_coord(index)
+                for index in cells[offset : offset + length]
+            ]
+            creature.cached_path_version = version
+            offset += length
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, replace
 
 
 @dataclass(frozen=True)
@@ -7,6 +7,11 @@ class SimulationConfig:
 
     map_width: int = 15
     map_height: int = 10
+    # Map storage backend: "dict" (sparse), "grid" (dense NumPy array)
+    # or "chunked" (NumPy tiles allocated only where entities are)
+    map_backend: str = "dict"
+    # Side of the tiles of the "chunked" backend
+    map_chunk_size: int = 64
 
     # Initial number of creatures
     initial_herbivores: int = 6
@@ -23,6 +28,30 @@ class SimulationConfig:
 
     herbivore_speed: int = 1
     predator_speed: int = 2
+    # Manhattan distance within which creatures see and search for
+    # targets; 0 for no limit
+    herbivore_vision_radius: int = 0
+    predator_vision_radius: int = 0
+
+    # Pathfinding mode: "bfs" (one search per creature), "flow_field"
+    # (one shared distance field per target type per turn),
+    # "incremental_flow_field" (shared fields repaired where the map
+    # changed) or "nearest_targets" (one A* search per creature towards
+    # its nearest_target_count nearest targets only)
+    path_finding_mode: str = "bfs"
+    nearest_target_count: int = 8
+    # Side of the buckets of cells the target index groups targets in
+    target_bucket_size: int = 16
+    # Whether creatures keep their last path and follow it while it
+    # stays usable instead of searching again every turn
+    path_caching: bool = False
+    # Creature turn mode: "sequential" (each creature acts on the map
+    # left by the previous ones) or "two_phase" (all creatures decide
+    # from the map at the start of the turn, then the intents are
+    # applied in a deterministic order)
+    turn_mode: str = "sequential"
+    # Creatures deciding together in one batch in "two_phase" mode
+    intent_batch_size: int = 256
 
     # Object generation parameters (0.1 = 10%)
     initial_grass_percent: float = 0.1
@@ -41,8 +70,20 @@ class SimulationConfig:
     damage_symbol: str = "💥"
     death_symbol: str = "💀"
 
-    # Simulation delay (seconds)
+    # Minimum time between the starts of two turns in automatic mode
+    # (seconds); turns slower than this run back to back, 0 runs flat-out
     turn_delay: float = 1.8
+    # Frames per second drawn by a background thread in automatic mode,
+    # independently of the turn rate; 0 draws frames from the turn loop
+    render_fps: float = 0.0
+    # Without render_fps, draw a frame every render_every turns
+    render_every: int = 1
+    # Draw maps larger than the terminal zoomed out, one glyph per block
+    # of cells, instead of a window of single cells
+    render_overview: bool = False
+    # Side of the blocks of cells whose entities each map keeps counted
+    # for the zoomed-out view; a glyph covers one or more blocks
+    overview_block_size: int = 8
 
     show_column_and_row_numbers: bool = False
 
@@ -51,3 +92,16 @@ class SimulationConfig:
 
 
 config = SimulationConfig()
+
+
+def configure(**overrides) -> SimulationConfig:
+    """
+    Reset the shared config to defaults with the given overrides applied.
+
+    Modules import the config instance directly, so it is updated in
+    place instead of being replaced.
+    """
+    updated = replace(SimulationConfig(), **overrides)
+    for field in fields(SimulationConfig):
+        object.__setattr__(config, field.name, getattr(updated, field.name))
+    return config
@@ -0,0 +1,335 @@
+"""
+Parallel parameter sweeps over SimulationConfig.
+
+Every combination of the override grid is run once per seed in a
+ProcessPoolExecutor worker. Finished runs are appended to a JSON Lines
+file as they complete, so an interrupted sweep resumes by skipping the
+runs already in the file.
+
+Example:
+    python ensemble.py --param predator_speed=1,2,3 \\
+        --param hunger_hp_loss_per_turn=2.5,5 --seeds 100 --turns 5000 \\
+        --results sweep.jsonl --csv sweep.csv
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Iterable
+
+from config import SimulationConfig, configure
+
+
+@dataclass(frozen=True)
+class RunSpec:
+    """One simulation of a sweep: config overrides plus a seed."""
+
+    overrides: dict[str, Any]
+    seed: int
+    max_turns: int
+    curve_interval: int = 1
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used to skip finished runs on resume."""
+        return json.dumps(
+            {
+                "overrides": self.overrides,
+                "seed": self.seed,
+                "max_turns": self.max_turns,
+                "curve_interval": self.curve_interval,
+            },
+            sort_keys=True,
+        )
+
+
+@dataclass(frozen=True)
+class RunResult:
+    """Outcome of one simulation of a sweep."""
+
+    key: str
+    overrides: dict[str, Any]
+    seed: int
+    winner: str
+    extinction_turn: int | None
+    turns: int
+    herbivores: int
+    predators: int
+    elapsed: float
+    # (turn, herbivores, predators, grass) samples
+    population_curve: list[tuple[int, int, int, int]]
+
+
+def build_grid(params: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """Cartesian product of parameter values as a list of overrides."""
+    names = sorted(params)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(params[name] for name in names))
+    ]
+
+
+def build_specs(
+    grid: list[dict[str, Any]],
+    seeds: Iterable[int],
+    max_turns: int,
+    curve_interval: int = 1,
+) -> list[RunSpec]:
+    """One RunSpec per combination of overrides and seed."""
+    seeds = list(seeds)
+    return [
+        RunSpec(overrides, seed, max_turns, curve_interval)
+        for overrides in grid
+        for seed in seeds
+    ]
+
+
+def run_single(spec: RunSpec) -> RunResult:
+    """Run one simulation; executed inside a worker process."""
+    # Imported here so the simulation modules are only loaded inside the
+    # worker process, when it runs
+    from sim_logging import game_logger
+    from simulation import Simulation
+    from utils import EntityType, seed_random
+    from world import MapFactory
+
+    configure(**spec.overrides)
+    seed_random(spec.seed)
+    game_logger.configure(counts_only=True)
+
+    curve = []
+    extinction_turn = None
+
+    def record(sim: Simulation) -> None:
+        nonlocal extinction_turn
+        herbivores, predators = sim.world_map.get_creatures_count()
+        if extinction_turn is None and (herbivores == 0 or predators == 0):
+            extinction_turn = sim.turn_count
+        if sim.turn_count % spec.curve_interval == 0:
+            grass = sim.world_map.count_by_type(EntityType.GRASS)
+            curve.append((sim.turn_count, herbivores, predators, grass))
+
+    sim = Simulation(MapFactory.create_map())
+    summary = sim.run_headless(
+        max_turns=spec.max_turns, progress_interval=0, on_turn=record
+    )
+    return RunResult(
+        key=spec.key,
+        overrides=spec.overrides,
+        seed=spec.seed,
+        winner=_get_winner(summary.herbivores, summary.predators),
+        extinction_turn=extinction_turn,
+        turns=summary.turns,
+        herbivores=summary.herbivores,
+        predators=summary.predators,
+        elapsed=summary.elapsed,
+        population_curve=curve,
+    )
+
+
+def run_ensemble(
+    specs: list[RunSpec],
+    results_path: str,
+    max_workers: int | None = None,
+) -> list[RunResult]:
+    """
+    Run all specs not yet present in results_path across worker processes.
+
+    Args:
+        specs: Runs of the sweep
+        results_path: JSON Lines file results are appended to
+        max_workers: Number of worker processes (all cores if omitted)
+
+    Returns:
+        Results of every spec, including those loaded from earlier runs
+
+    Raises:
+        RuntimeError: If any run failed. The runs that finished are
+        still written, so running the sweep again retries only the
+        failed ones.
+    """
+    done = {result.key: result for result in load_results(results_path)}
+    pending = [spec for spec in specs if spec.key not in done]
+    total = len(specs)
+    print(f"{total - len(pending)} of {total} runs already finished.")
+
+    failed = []
+    if pending:
+        with (
+            open(results_path, "a", encoding="utf-8") as results_file,
+            ProcessPoolExecutor(max_workers or os.cpu_count()) as executor,
+        ):
+            _terminate_partial_line(results_file)
+            futures = {
+                executor.submit(run_single, spec): spec for spec in pending
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as error:
+                    spec = futures[future]
+                    failed.append(spec)
+                    print(
+                        f"Run failed: {spec.overrides} seed={spec.seed}: "
+                        f"{error!r}"
+                    )
+                    continue
+                results_file.write(json.dumps(asdict(result)) + "\n")
+                results_file.flush()
+                os.fsync(results_file.fileno())
+                done[result.key] = result
+                print(
+                    f"[{len(done)}/{total}] {result.overrides} "
+                    f"seed={result.seed}: {result.winner} "
+                    f"after {result.turns} turns"
+                )
+
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {total} runs failed")
+    return [done[spec.key] for spec in specs]
+
+
+def load_results(results_path: str) -> list[RunResult]:
+    """Load finished runs, ignoring a partially written last line."""
+    if not os.path.exists(results_path):
+        return []
+
+    results = []
+    with open(results_path, encoding="utf-8") as results_file:
+        for line in results_file:
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            data["population_curve"] = [
+                tuple(sample) for sample in data["population_curve"]
+            ]
+            results.append(RunResult(**data))
+    return results
+
+
+def _terminate_partial_line(results_file) -> None:
+    """End a line left unfinished by a crash so new results stay valid."""
+    if results_file.tell() == 0:
+        return
+    with open(results_file.name, "rb") as existing:
+        existing.seek(-1, os.SEEK_END)
+        if existing.read(1) != b"\n":
+            results_file.write("\n")
+
+
+def write_csv(results: list[RunResult], csv_path: str) -> None:
+    """Write one row per run, without population curves."""
+    param_names = sorted({name for r in results for name in r.overrides})
+    columns = [
+        "seed",
+        "winner",
+        "extinction_turn",
+        "turns",
+        "herbivores",
+        "predators",
+        "elapsed",
+    ]
+    with open(csv_path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(param_names + columns)
+        for result in results:
+            writer.writerow(
+                [result.overrides.get(name) for name in param_names]
+                + [getattr(result, column) for column in columns]
+            )
+
+
+def _get_winner(herbivores: int, predators: int) -> str:
+    """Name the surviving side of a finished run."""
+    if herbivores == 0 and predators == 0:
+        return "none"
+    if herbivores == 0:
+        return "predators"
+    if predators == 0:
+        return "herbivores"
+    return "undecided"
+
+
+def _parse_param(text: str) -> tuple[str, list[Any]]:
+    """Parse "name=v1,v2" using the type of the config field."""
+    name, _, raw_values = text.partition("=")
+    field_types = {
+        field.name: field.type for field in fields(SimulationConfig)
+    }
+    if name not in field_types or not raw_values:
+        raise argparse.ArgumentTypeError(f"invalid parameter: {text}")
+
+    field_type = field_types[name]
+    convert = _parse_bool if field_type is bool else field_type
+    return name, [convert(value) for value in raw_values.split(",")]
+
+
+def _merge_params(
+    params: list[tuple[str, list[Any]]],
+) -> dict[str, list[Any]]:
+    """Join the values of parameters given more than once, in order."""
+    merged: dict[str, list[Any]] = {}
+    for name, values in params:
+        known = merged.setdefault(name, [])
+        for value in values:
+            if value not in known:
+                known.append(value)
+    return merged
+
+
+def _parse_bool(value: str) -> bool:
+    return value.lower() in ("1", "true", "yes")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Parallel parameter sweeps over SimulationConfig"
+    )
+    parser.add_argument(
+        "--param",
+        type=_parse_param,
+        action="append",
+        default=[],
+        help="config field and its values, e.g. predator_speed=1,2,3",
+    )
+    parser.add_argument(
+        "--seeds", type=int, default=10, help="number of seeds per point"
+    )
+    parser.add_argument(
+        "--first-seed", type=int, default=0, help="first seed of the range"
+    )
+    parser.add_argument(
+        "--turns", type=int, default=1000, help="maximum turns per run"
+    )
+    parser.add_argument(
+        "--curve-interval",
+        type=int,
+        default=1,
+        help="turns between population curve samples",
+    )
+    parser.add_argument(
+        "--results",
+        default="ensemble_results.jsonl",
+        help="JSON Lines file with per-run results (used to resume)",
+    )
+    parser.add_argument("--csv", help="also write a summary table as CSV")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes"
+    )
+    args = parser.parse_args(argv)
+
+    grid = build_grid(_merge_params(args.param))
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    specs = build_specs(grid, seeds, args.turns, args.curve_interval)
+    results = run_ensemble(specs, args.results, args.workers)
+    if args.csv:
+        write_csv(results, args.csv)
+
+
+if __name__ == "__main__":
+    main()
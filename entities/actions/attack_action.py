@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 
 from config import config
 from entities.base import Creature
-from sim_logging import game_logger
+from sim_logging import EventType, game_logger
 
 if TYPE_CHECKING:
     from world import Coordinate, Map
@@ -28,16 +28,24 @@ class AttackAction:
         damage = getattr(attacker, "attack_power", 0)
         target_entity.take_damage(damage)
 
-        game_logger.log(
-            f"ATTACK: {attacker.symbol} {from_coord} "
-            f"{config.attack_symbol} {target_entity.symbol} "
-            f"{target_coord} {config.damage_symbol} {int(damage)}"
+        game_logger.log_event(
+            EventType.ATTACK,
+            attacker.entity_type.code,
+            from_coord.x,
+            from_coord.y,
+            target_entity.entity_type.code,
+            target_coord.x,
+            target_coord.y,
+            damage,
         )
 
         if not target_entity.is_alive:
-            game_logger.log(
-                f"DEATH (battle): {target_entity.symbol} {config.death_symbol}"
-                f" {target_coord} by {attacker.symbol}"
+            game_logger.log_event(
+                EventType.DEATH_BATTLE,
+                target_entity.entity_type.code,
+                target_coord.x,
+                target_coord.y,
+                attacker.entity_type.code,
             )
             world_map.remove_entity(target_coord)
 
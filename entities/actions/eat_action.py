@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 
 from config import config
-from sim_logging import game_logger
+from sim_logging import EventType, game_logger
 
 if TYPE_CHECKING:
     from entities.base import Creature
@@ -27,7 +27,12 @@ class EatAction:
         world_map.remove_entity(target_coord)
         eater.restore_hp(config.grass_recovery_hp)
 
-        game_logger.log(
-            f"EAT: {eater.symbol} {from_coord} ate "
-            f"{target_entity.symbol} {target_coord}"
+        game_logger.log_event(
+            EventType.EAT,
+            eater.entity_type.code,
+            from_coord.x,
+            from_coord.y,
+            target_entity.entity_type.code,
+            target_coord.x,
+            target_coord.y,
         )
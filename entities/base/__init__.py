@@ -1,4 +1,5 @@
 from .creature import Creature
 from .entity import Entity
+from .intent import Intent, IntentType
 
-__all__ = ["Entity", "Creature"]
+__all__ = ["Entity", "Creature", "Intent", "IntentType"]
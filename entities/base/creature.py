@@ -1,16 +1,19 @@
 from abc import ABC, abstractmethod
 from random import choice
+from time import perf_counter
 from typing import TYPE_CHECKING
 
 from config import config
 from pathfinding import BFSPathFinder
-from sim_logging import game_logger
+from sim_logging import EventType, game_logger, turn_profiler
 from world import Coordinate, Map
 
 from .entity import Entity
+from .intent import Intent, IntentType
 
 if TYPE_CHECKING:
     from utils import EntityType
+    from world.creature_store import CreatureStore
 
 
 class Creature(Entity, ABC):
@@ -23,13 +26,83 @@ class Creature(Entity, ABC):
         speed: int,
         hp: float,
         path_finder=None,
+        vision_radius: int = 0,
     ) -> None:
         super().__init__(symbol, entity_type)
-        self.speed = speed
-        self.max_hp = hp
-        self.hp = hp
+        # Own values, used while the creature is not bound to a store
+        self._speed = speed
+        self._max_hp = hp
+        self._hp = hp
+        self._store: "CreatureStore | None" = None
+        self._id = -1
         # Strategy for pathfinding (default: BFS)
         self.path_finder = path_finder or BFSPathFinder()
+        # Distance within which targets are seen and searched for (0: any)
+        self.vision_radius = vision_radius
+        # Rest of the last path found, starting at the creature's cell,
+        # and the map version right after the creature moved along it
+        self.cached_path: list[Coordinate] | None = None
+        self.cached_path_version = 0
+
+    @property
+    def creature_id(self) -> int:
+        """Slot in the creature store of the map (-1 when unbound)."""
+        return self._id
+
+    @property
+    def hp(self) -> float:
+        if self._store is None:
+            return self._hp
+        return float(self._store.hp[self._id])
+
+    @hp.setter
+    def hp(self, value: float) -> None:
+        if self._store is None:
+            self._hp = value
+        else:
+            self._store.hp[self._id] = value
+
+    @property
+    def max_hp(self) -> float:
+        if self._store is None:
+            return self._max_hp
+        return float(self._store.max_hp[self._id])
+
+    @max_hp.setter
+    def max_hp(self, value: float) -> None:
+        if self._store is None:
+            self._max_hp = value
+        else:
+            self._store.max_hp[self._id] = value
+
+    @property
+    def speed(self) -> int:
+        if self._store is None:
+            return self._speed
+        return int(self._store.speed[self._id])
+
+    @speed.setter
+    def speed(self, value: int) -> None:
+        if self._store is None:
+            self._speed = value
+        else:
+            self._store.speed[self._id] = value
+
+    def bind_store(self, store: "CreatureStore", creature_id: int) -> None:
+        """Make the creature a view of a slot in the store."""
+        self._store = store
+        self._id = creature_id
+
+    def unbind_store(self) -> None:
+        """Copy the stored values back and detach from the store."""
+        store, creature_id = self._store, self._id
+        if store is None:
+            return
+        self._hp = float(store.hp[creature_id])
+        self._max_hp = float(store.max_hp[creature_id])
+        self._speed = int(store.speed[creature_id])
+        self._store = None
+        self._id = -1
 
     def take_turn(self, start_coord: Coordinate, world_map: Map) -> None:
         """Full turn: attempt an action, then move."""
@@ -43,13 +116,102 @@ class Creature(Entity, ABC):
                 self.perform_action(start_coord, nearby_target, world_map)
                 return
             except ValueError as err:
-                game_logger.log(
-                    f"ACTION_FAIL: {self.symbol} at {start_coord} "
-                    f"-> {nearby_target}: {err}"
+                self._log_action_fail(start_coord, nearby_target, err)
+
+        if self.cached_path is not None and self._follow_cached_path(
+            start_coord, world_map
+        ):
+            return
+
+        self._move_towards_targets(
+            start_coord,
+            world_map,
+            self._get_path_targets(start_coord, world_map, target_type),
+        )
+
+    def prepare_path_finder(
+        self, start_coord: Coordinate, world_map: Map
+    ) -> None:
+        """
+        Build the field the path finder shares between the searches of
+        the turn, so that searches run by decide() only read it.
+        """
+        if self.path_finder.accepts_target_subsets:
+            # Such finders share nothing between searches
+            return
+        self.path_finder.prepare(
+            world_map,
+            self._get_path_targets(
+                start_coord, world_map, self.get_target_type()
+            ),
+        )
+
+    def decide(
+        self,
+        start_coord: Coordinate,
+        world_map: Map,
+        roll: int,
+        path_finder=None,
+    ) -> Intent:
+        """
+        Choose the action of the turn like take_turn, without changing
+        the map or the creature. roll is a non-negative random number
+        picking the cell of a random move. path_finder, if given, runs
+        the path search instead of the creature's own, a fork of it
+        taken after prepare_path_finder().
+        """
+        target_type = self.get_target_type()
+        nearby_target = self._find_nearby_entity(
+            start_coord, world_map, target_type
+        )
+        if nearby_target:
+            return Intent(IntentType.ACT, start_coord, nearby_target)
+
+        step = None
+        if self.cached_path is not None:
+            step = self._next_cached_step(start_coord, world_map)
+        if step is None:
+            target_coords = self._get_path_targets(
+                start_coord, world_map, target_type
+            )
+            if target_coords is None or target_coords:
+                step = self._next_path_step(
+                    start_coord, world_map, target_coords, path_finder
                 )
+        if step is not None:
+            return Intent(IntentType.MOVE, start_coord, *step)
+
+        available_moves = self._get_free_neighbors(start_coord, world_map)
+        if available_moves:
+            return Intent(
+                IntentType.MOVE,
+                start_coord,
+                available_moves[roll % len(available_moves)],
+            )
+        return Intent(IntentType.STAY, start_coord)
 
-        target_coords = self.get_movement_targets(world_map, target_type)
-        self._move_towards_targets(start_coord, world_map, target_coords)
+    def apply_intent(self, intent: Intent, world_map: Map) -> None:
+        """
+        Carry out an intent chosen by decide(). An action or move that
+        the map no longer allows is logged as failed. Unless the intent
+        is an action, the path kept so far was followed or given up by
+        decide() and is replaced by the rest of the intent's path.
+        """
+        if intent.kind == IntentType.ACT:
+            try:
+                self.perform_action(intent.coord, intent.target, world_map)
+            except ValueError as err:
+                self._log_action_fail(intent.coord, intent.target, err)
+            return
+        self.cached_path = None
+        if intent.kind == IntentType.MOVE:
+            try:
+                self._move_to(intent.coord, intent.target, world_map)
+            except ValueError as err:
+                self._log_move_fail(intent.coord, intent.target, err)
+                return
+            if intent.path is not None:
+                self._keep_path(intent.path, world_map)
 
     @abstractmethod
     def get_target_type(self) -> "EntityType": ...
@@ -64,6 +226,72 @@ class Creature(Entity, ABC):
         self, world_map: Map, target_type: "EntityType"
     ) -> list[Coordinate]: ...
 
+    def is_movement_target(self, coord: Coordinate, world_map: Map) -> bool:
+        """
+        Whether a cell is still a movement target. By default, a cell
+        holding an entity of the target type.
+        """
+        entity = world_map.get_entity(coord)
+        return (
+            entity is not None
+            and entity.entity_type == self.get_target_type()
+        )
+
+    def get_nearest_movement_targets(
+        self,
+        start_coord: Coordinate,
+        world_map: Map,
+        target_type: "EntityType",
+        count: int | None = None,
+        max_distance: int | None = None,
+    ) -> list[Coordinate]:
+        """
+        Get the movement targets of the count targets nearest to
+        start_coord (all if None) within max_distance steps, if given.
+        By default the targets' own cells.
+        """
+        return world_map.find_nearest(
+            target_type, start_coord, count, max_distance
+        )
+
+    def _get_path_targets(
+        self,
+        start_coord: Coordinate,
+        world_map: Map,
+        target_type: "EntityType",
+    ) -> list[Coordinate] | None:
+        """
+        Targets for the next path search, None when the path finder
+        reuses the targets gathered earlier this turn.
+        """
+        if not self.path_finder.needs_targets(world_map):
+            return None
+        return self._gather_targets(start_coord, world_map, target_type)
+
+    def _gather_targets(
+        self,
+        start_coord: Coordinate,
+        world_map: Map,
+        target_type: "EntityType",
+    ) -> list[Coordinate]:
+        """
+        Gather the movement targets for the path finder: the visible
+        or nearest ones if it accepts a subset, otherwise all of them.
+        """
+        path_finder = self.path_finder
+        visible = self.vision_radius and path_finder.accepts_target_subsets
+        if not visible and not path_finder.nearest_targets:
+            return self.get_movement_targets(world_map, target_type)
+        return self.get_nearest_movement_targets(
+            start_coord,
+            world_map,
+            target_type,
+            config.nearest_target_count
+            if path_finder.nearest_targets
+            else None,
+            self.vision_radius if visible else None,
+        )
+
     def _find_nearby_entity(
         self,
         start_coord: Coordinate,
@@ -81,34 +309,146 @@ class Creature(Entity, ABC):
         self,
         start_coord: Coordinate,
         world_map: Map,
-        target_coords: list[Coordinate],
+        target_coords: list[Coordinate] | None,
     ) -> None:
-        """Move creature towards targets or make random move."""
-        if target_coords:
-            try:
-                path = self.path_finder.find_nearest_target_path(
-                    start_coord, world_map, target_coords
-                )
-            except NotImplementedError:
-                # Fallback to BFS if current strategy is not implemented
-                fallback = BFSPathFinder()
-                path = fallback.find_nearest_target_path(
-                    start_coord, world_map, target_coords
-                )
-            if path and len(path) > 1:
-                steps = min(self.speed, len(path) - 1)
-                next_coord = path[steps]
+        """
+        Move creature towards targets or make random move.
+        target_coords is None when the path finder already holds them.
+        Targets beyond the vision radius are not searched for.
+        With path caching, the rest of the path is kept for later turns.
+        """
+        if target_coords is None or target_coords:
+            step = self._next_path_step(start_coord, world_map, target_coords)
+            if step is not None:
+                next_coord, rest = step
                 try:
                     self._move_to(start_coord, next_coord, world_map)
+                    if rest is not None:
+                        self._keep_path(rest, world_map)
                     return
                 except ValueError as err:
-                    game_logger.log(
-                        f"MOVE_FAIL: {self.symbol} {start_coord} -> "
-                        f"{next_coord} error: {err}"
-                    )
+                    self._log_move_fail(start_coord, next_coord, err)
 
         self._make_random_move(start_coord, world_map)
 
+    def _next_path_step(
+        self,
+        start_coord: Coordinate,
+        world_map: Map,
+        target_coords: list[Coordinate] | None,
+        path_finder=None,
+    ) -> tuple[Coordinate, list[Coordinate] | None] | None:
+        """
+        Search a path to the targets, with path_finder if given instead
+        of the creature's own. Returns the cell to move to this turn
+        and, with path caching, the rest of the path from it; None if no
+        target is reachable.
+        """
+        path_finder = path_finder or self.path_finder
+        keeps_path = self._keeps_paths()
+        # A kept path must reach the target, not stop after one turn
+        max_steps = None if keeps_path else self.speed
+        if turn_profiler.enabled:
+            path = self._find_path_profiled(
+                start_coord, world_map, target_coords, max_steps, path_finder
+            )
+        else:
+            path = path_finder.find_nearest_target_path(
+                start_coord,
+                world_map,
+                target_coords,
+                max_steps,
+                self.vision_radius or None,
+            )
+        if not path or len(path) < 2:
+            return None
+        steps = min(self.speed, len(path) - 1)
+        return path[steps], path[steps:] if keeps_path else None
+
+    def _find_path_profiled(
+        self,
+        start_coord: Coordinate,
+        world_map: Map,
+        target_coords: list[Coordinate] | None,
+        max_steps: int | None,
+        path_finder,
+    ) -> list[Coordinate] | None:
+        """Find a path and record the call in the turn profiler."""
+        start = perf_counter()
+        path = path_finder.find_nearest_target_path(
+            start_coord,
+            world_map,
+            target_coords,
+            max_steps,
+            self.vision_radius or None,
+        )
+        turn_profiler.record_path_search(
+            type(path_finder).__name__,
+            perf_counter() - start,
+            path_finder.nodes_expanded,
+            path,
+        )
+        return path
+
+    def _keeps_paths(self) -> bool:
+        """
+        Whether paths are kept between turns. Strategies sharing one
+        field between creatures already reuse their work.
+        """
+        return config.path_caching and self.path_finder.accepts_target_subsets
+
+    def _keep_path(self, path: list[Coordinate], world_map: Map) -> None:
+        """Keep the rest of a path after moving to its first cell."""
+        if len(path) > 1:
+            self.cached_path = path
+            self.cached_path_version = world_map.version
+
+    def _follow_cached_path(
+        self, start_coord: Coordinate, world_map: Map
+    ) -> bool:
+        """
+        Move along the kept path if it is still usable, and drop it
+        otherwise. Returns whether the creature moved.
+        """
+        step = self._next_cached_step(start_coord, world_map)
+        self.cached_path = None
+        if step is None:
+            return False
+        next_coord, rest = step
+        self._move_to(start_coord, next_coord, world_map)
+        self._keep_path(rest, world_map)
+        return True
+
+    def _next_cached_step(
+        self, start_coord: Coordinate, world_map: Map
+    ) -> tuple[Coordinate, list[Coordinate]] | None:
+        """
+        Check the kept path. Returns the cell to move to this turn and
+        the rest of the path from it, or None if the path is no longer
+        usable.
+
+        The path is usable while the cells entered this turn are free
+        and its last cell is still a movement target. If the map has not
+        changed since the creature last moved along it, only the cell
+        moved to is checked.
+        """
+        path = self.cached_path
+        if path[0] != start_coord:
+            return None
+        steps = min(self.speed, len(path) - 1)
+        next_coord = path[steps]
+        if not world_map.is_cell_empty(next_coord.x, next_coord.y):
+            return None
+        if world_map.version != self.cached_path_version and not (
+            all(
+                world_map.is_cell_empty(coord.x, coord.y)
+                for coord in path[1:steps]
+            )
+            and self.is_movement_target(path[-1], world_map)
+        ):
+            return None
+        return next_coord, path[steps:]
+
     def _move_to(
         self, start_coord: Coordinate, target_coord: Coordinate, world_map: Map
     ) -> None:
@@ -117,26 +457,63 @@ class Creature(Entity, ABC):
             raise ValueError("target cell is occupied")
 
         world_map.move_entity(start_coord, target_coord)
-        game_logger.log(f"MOVE {self.symbol}: {start_coord} -> {target_coord}")
+        game_logger.log_event(
+            EventType.MOVE,
+            self.entity_type.code,
+            start_coord.x,
+            start_coord.y,
+            target_coord.x,
+            target_coord.y,
+        )
 
     def _make_random_move(
         self, start_coord: Coordinate, world_map: Map
     ) -> None:
         """Make a random move to an available neighboring cell."""
-        available_moves = [
-            neighbor
-            for neighbor in world_map.get_neighbors_cells(start_coord)
-            if world_map.is_cell_empty(neighbor.x, neighbor.y)
-        ]
+        available_moves = self._get_free_neighbors(start_coord, world_map)
         if available_moves:
             next_position = choice(available_moves)
             try:
                 self._move_to(start_coord, next_position, world_map)
             except ValueError as err:
-                game_logger.log(
-                    f"MOVE_FAIL: {self.symbol} {start_coord} -> "
-                    f"{next_position} error: {err}"
-                )
+                self._log_move_fail(start_coord, next_position, err)
+
+    @staticmethod
+    def _get_free_neighbors(
+        start_coord: Coordinate, world_map: Map
+    ) -> list[Coordinate]:
+        """Get the empty neighboring cells."""
+        return [
+            neighbor
+            for neighbor in world_map.get_neighbors_cells(start_coord)
+            if world_map.is_cell_empty(neighbor.x, neighbor.y)
+        ]
+
+    def _log_action_fail(
+        self, start_coord: Coordinate, target_coord: Coordinate, err: Exception
+    ) -> None:
+        game_logger.log_event(
+            EventType.ACTION_FAIL,
+            self.entity_type.code,
+            start_coord.x,
+            start_coord.y,
+            target_coord.x,
+            target_coord.y,
+            err,
+        )
+
+    def _log_move_fail(
+        self, start_coord: Coordinate, target_coord: Coordinate, err: Exception
+    ) -> None:
+        game_logger.log_event(
+            EventType.MOVE_FAIL,
+            self.entity_type.code,
+            start_coord.x,
+            start_coord.y,
+            target_coord.x,
+            target_coord.y,
+            err,
+        )
 
     @property
     def is_alive(self) -> bool:
@@ -152,7 +529,6 @@ class Creature(Entity, ABC):
         healed_amount = min(self.max_hp - self.hp, amount)
         self.hp += healed_amount
         if healed_amount > 0:
-            game_logger.log(
-                f"HEAL: {self.symbol} {config.health_symbol}"
-                f" {healed_amount:.0f} HP"
+            game_logger.log_event(
+                EventType.HEAL, self.entity_type.code, healed_amount
             )
@@ -4,6 +4,8 @@ from utils import EntityType
 
 
 class Entity(ABC):
+    __slots__ = ("symbol", "entity_type")
+
     def __init__(self, symbol: str, entity_type: EntityType) -> None:
         """
         A base class for all entities in the game.
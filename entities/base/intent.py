@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from world import Coordinate
+
+
+class IntentType(IntEnum):
+    """What a creature decided to do this turn."""
+
+    STAY = 0
+    ACT = 1  # eat or attack the target at target
+    MOVE = 2  # move to target
+
+
+@dataclass(frozen=True)
+class Intent:
+    """
+    Action a creature chose from the map as it was at the start of the
+    turn, applied later by the turn resolver.
+
+    coord is the cell of the creature when it decided. path is the rest
+    of its path from target on, kept after the move with path caching.
+    """
+
+    kind: IntentType
+    coord: "Coordinate"
+    target: "Coordinate | None" = None
+    path: "list[Coordinate] | None" = None
@@ -1,5 +1,15 @@
+from functools import partial
+from typing import Callable
+
+from config import config
 from entities.base import Entity
-from pathfinding import AStarPathFinder, BFSPathFinder
+from pathfinding import (
+    AStarPathFinder,
+    BFSPathFinder,
+    FlowFieldPathFinder,
+    IncrementalFlowFieldPathFinder,
+    PathFinder,
+)
 from utils.enums import EntityType
 
 from .herbivore import Herbivore
@@ -18,21 +28,96 @@ class EntityFactory:
         EntityType.TREE: Tree,
     }
 
-    _path_finders = {
-        EntityType.HERBIVORE: BFSPathFinder(),
-        EntityType.PREDATOR: AStarPathFinder(),
+    # Pathfinding strategy per creature type for each config mode
+    _path_finder_modes: dict[
+        str, dict[EntityType, Callable[[], PathFinder]]
+    ] = {
+        "bfs": {
+            EntityType.HERBIVORE: BFSPathFinder,
+            EntityType.PREDATOR: AStarPathFinder,
+        },
+        "flow_field": {
+            EntityType.HERBIVORE: FlowFieldPathFinder,
+            EntityType.PREDATOR: FlowFieldPathFinder,
+        },
+        "incremental_flow_field": {
+            EntityType.HERBIVORE: partial(
+                IncrementalFlowFieldPathFinder, EntityType.GRASS
+            ),
+            EntityType.PREDATOR: partial(
+                IncrementalFlowFieldPathFinder, EntityType.HERBIVORE
+            ),
+        },
+        "nearest_targets": {
+            EntityType.HERBIVORE: partial(
+                AStarPathFinder, nearest_targets=True
+            ),
+            EntityType.PREDATOR: partial(
+                AStarPathFinder, nearest_targets=True
+            ),
+        },
     }
 
+    # Flyweights of stateless (non-creature) types, created on first use
+    _shared_entities: dict[EntityType, Entity] = {}
+
+    # Shared strategy instances, created on first use
+    _path_finders: dict[tuple[str, EntityType], PathFinder] = {}
+
+    @classmethod
+    def get_path_finding_modes(cls) -> list[str]:
+        """Return the names of the registered pathfinding modes."""
+        return list(cls._path_finder_modes)
+
+    @classmethod
+    def get_path_finder(cls, entity_type: EntityType) -> PathFinder:
+        """Return the shared path finder for a type in the current mode."""
+        mode = config.path_finding_mode
+        if mode not in cls._path_finder_modes:
+            raise ValueError(f"Pathfinding mode {mode} is not registered")
+
+        key = (mode, entity_type)
+        if key not in cls._path_finders:
+            create_finder = cls._path_finder_modes[mode].get(
+                entity_type, BFSPathFinder
+            )
+            cls._path_finders[key] = create_finder()
+        return cls._path_finders[key]
+
     @classmethod
     def create_entity(cls, entity_type: EntityType) -> Entity:
+        """
+        Create an entity of the given type.
+        Stateless types return their shared flyweight instance.
+        """
         if entity_type not in cls._registry:
             raise ValueError(f"Entity type {entity_type} is not registered")
 
+        if entity_type not in EntityType.creatures():
+            return cls._get_shared_entity(entity_type)
+
         # Obtain the corresponding pathfinding strategy
-        path_finder = cls._path_finders.get(entity_type, BFSPathFinder())
+        path_finder = cls.get_path_finder(entity_type)
+        return cls._registry[entity_type](path_finder)
+
+    @classmethod
+    def create_many(cls, entity_type: EntityType, count: int) -> list[Entity]:
+        """Create count entities of the given type at once."""
+        if entity_type not in cls._registry:
+            raise ValueError(f"Entity type {entity_type} is not registered")
+
+        if entity_type not in EntityType.creatures():
+            return [cls._get_shared_entity(entity_type)] * count
 
+        path_finder = cls.get_path_finder(entity_type)
         entity_class = cls._registry[entity_type]
-        try:
-            return entity_class(path_finder)
-        except TypeError:
-            return entity_class()
+        return [entity_class(path_finder) for _ in range(count)]
+
+    @classmethod
+    def _get_shared_entity(cls, entity_type: EntityType) -> Entity:
+        """Return the single instance of a stateless entity type."""
+        entity = cls._shared_entities.get(entity_type)
+        if entity is None:
+            entity = cls._registry[entity_type]()
+            cls._shared_entities[entity_type] = entity
+        return entity
@@ -22,6 +22,7 @@ class Herbivore(Creature):
             speed=config.herbivore_speed,
             hp=config.base_herbivore_hp,
             path_finder=path_finder,
+            vision_radius=config.herbivore_vision_radius,
         )
 
     def get_target_type(self) -> EntityType:
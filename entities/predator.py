@@ -22,6 +22,7 @@ class Predator(Creature):
             speed=config.predator_speed,
             hp=config.base_predator_hp,
             path_finder=path_finder,
+            vision_radius=config.predator_vision_radius,
         )
         self.attack_power = config.predator_attack_damage
 
@@ -45,17 +46,55 @@ class Predator(Creature):
         self, world_map: Map, target_type: EntityType
     ) -> list[Coordinate]:
         """Get coordinates around herbivores for movement."""
-        herbivore_coords = world_map.get_coords_by_type(target_type)
-        if not herbivore_coords:
-            return []
+        return self._get_cells_around(
+            world_map, world_map.get_coords_by_type(target_type)
+        )
+
+    def is_movement_target(self, coord: Coordinate, world_map: Map) -> bool:
+        """Whether a cell is an empty cell next to a herbivore."""
+        if not world_map.is_cell_empty(coord.x, coord.y):
+            return False
+        for neighbor in world_map.get_neighbors_cells(coord):
+            entity = world_map.get_entity(neighbor)
+            if entity and entity.entity_type == EntityType.HERBIVORE:
+                return True
+        return False
+
+    def get_nearest_movement_targets(
+        self,
+        start_coord: Coordinate,
+        world_map: Map,
+        target_type: EntityType,
+        count: int | None = None,
+        max_distance: int | None = None,
+    ) -> list[Coordinate]:
+        """
+        Get coordinates around the nearest herbivores for movement.
+        A cell next to a herbivore is one step nearer than the herbivore.
+        """
+        if max_distance is not None:
+            max_distance += 1
+        return self._get_cells_around(
+            world_map,
+            world_map.find_nearest(
+                target_type, start_coord, count, max_distance
+            ),
+        )
 
+    @staticmethod
+    def _get_cells_around(
+        world_map: Map, herbivore_coords: list[Coordinate]
+    ) -> list[Coordinate]:
+        """Get the empty cells next to the given herbivores."""
         target_coords = []
+        seen = set()
         for coord in herbivore_coords:
             for neighbor in world_map.get_neighbors_cells(coord):
                 if (
                     world_map.is_cell_empty(neighbor.x, neighbor.y)
-                    and neighbor not in target_coords
+                    and neighbor not in seen
                 ):
+                    seen.add(neighbor)
                     target_coords.append(neighbor)
 
         return target_coords
@@ -4,6 +4,8 @@ from utils import EntityType
 
 
 class Grass(Entity):
+    __slots__ = ()
+
     def __init__(self) -> None:
         """
         A class that represents grass on the game map.
@@ -4,6 +4,8 @@ from utils import EntityType
 
 
 class Rock(Entity):
+    __slots__ = ()
+
     def __init__(self) -> None:
         """
         A class that represents a rock on the game map.
@@ -4,6 +4,8 @@ from utils import EntityType
 
 
 class Tree(Entity):
+    __slots__ = ()
+
     def __init__(self) -> None:
         """
         A class that represents a tree on the game map.
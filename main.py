@@ -1,16 +1,51 @@
+import argparse
 import sys
+from typing import Callable
 
+from checkpoint import load_checkpoint, save_checkpoint
+from config import configure
+from entities.entity_factory import EntityFactory
+from replay import EventRecorder, play_replay
+from sim_logging import EventCategory, EventLevel, game_logger, turn_profiler
 from simulation import Simulation
+from utils import seed_random
 from utils.menu import show_main_menu
-from world import Map
+from world import MapFactory
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    configure(**_get_config_overrides(args))
+    if args.seed is not None:
+        seed_random(args.seed)
+    game_logger.configure(
+        min_level=EventLevel[args.log_level.upper()],
+        categories=args.log_categories,
+        # Nothing prints events in headless mode, so only count them
+        counts_only=args.headless,
+    )
+    if args.profile_json or args.profile_csv or args.slow_turn_ms:
+        turn_profiler.enable(
+            args.slow_turn_ms / 1000 if args.slow_turn_ms else None
+        )
+
+    if args.replay:
+        play_replay(
+            args.replay, args.replay_from, args.replay_to, args.replay_delay
+        )
+        return
+
+    if args.headless:
+        run_headless(args)
+        return
+
     while True:
         choice = show_main_menu()
 
         if choice in ("1", "2"):
-            run_simulation(choice)
+            run_simulation(choice, args)
+            if turn_profiler.enabled:
+                export_profile(args)
         elif choice == "0":
             print("Exit.")
             break
@@ -18,15 +53,261 @@ def main() -> None:
             print("Invalid choice. Please try again.")
 
 
-def run_simulation(choice: str) -> None:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parses command line arguments."""
+    parser = argparse.ArgumentParser(description="Ecosystem simulation")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run without rendering, delays or menus",
+    )
+    parser.add_argument(
+        "--turns",
+        type=int,
+        default=None,
+        help="maximum number of turns in headless mode",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="random seed"
+    )
+    parser.add_argument(
+        "--map-backend",
+        choices=MapFactory.get_backend_names(),
+        default=None,
+        help="map storage backend (default: config.map_backend)",
+    )
+    parser.add_argument(
+        "--path-finding-mode",
+        choices=EntityFactory.get_path_finding_modes(),
+        default=None,
+        help="pathfinding mode (default: config.path_finding_mode)",
+    )
+    parser.add_argument(
+        "--until",
+        choices=("extinction", "turns"),
+        default="extinction",
+        help="stop at the first extinction or only after --turns turns",
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=1.0,
+        help="seconds between headless progress lines (0 disables them)",
+    )
+    parser.add_argument(
+        "--profile-json",
+        metavar="PATH",
+        help="profile turns and write the summary as JSON",
+    )
+    parser.add_argument(
+        "--profile-csv",
+        metavar="PATH",
+        help="profile turns and write per-turn timings as CSV",
+    )
+    parser.add_argument(
+        "--slow-turn-ms",
+        type=float,
+        default=None,
+        metavar="MS",
+        help="profile turns and log those slower than MS milliseconds",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=[level.name.lower() for level in EventLevel],
+        default="debug",
+        help="lowest level of events that are logged",
+    )
+    parser.add_argument(
+        "--log-categories",
+        type=_parse_categories,
+        default=None,
+        metavar="NAMES",
+        help="comma-separated event categories to log (default: all): "
+        + ", ".join(EventCategory.all()),
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="write the events of the run to a binary event log",
+    )
+    parser.add_argument(
+        "--keyframe-interval",
+        type=int,
+        default=100,
+        metavar="K",
+        help="turns between full-map keyframes in the event log",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="render a recorded event log instead of simulating",
+    )
+    parser.add_argument(
+        "--replay-from",
+        type=int,
+        default=0,
+        metavar="TURN",
+        help="first turn shown in replay mode",
+    )
+    parser.add_argument(
+        "--replay-to",
+        type=int,
+        default=None,
+        metavar="TURN",
+        help="last turn shown in replay mode (default: last recorded)",
+    )
+    parser.add_argument(
+        "--replay-delay",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="seconds between replayed frames (default: config.turn_delay)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="PATH",
+        help="save the headless run to PATH when it ends and every "
+        "--checkpoint-every turns",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=None,
+        metavar="N",
+        help="turns between checkpoints (default: only at the end)",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="PATH",
+        help="continue the run saved in a checkpoint",
+    )
+    args = parser.parse_args(argv)
+    if args.checkpoint_every is not None:
+        if args.checkpoint_every < 1:
+            parser.error("--checkpoint-every must be at least 1")
+        if not args.checkpoint:
+            parser.error("--checkpoint-every requires --checkpoint")
+    if args.resume and (args.map_backend or args.path_finding_mode):
+        parser.error(
+            "--map-backend and --path-finding-mode cannot change a resumed run"
+        )
+    if args.checkpoint and not args.headless:
+        parser.error("--checkpoint requires --headless")
+    if args.keyframe_interval < 1:
+        parser.error("--keyframe-interval must be at least 1")
+    if args.headless and args.until == "turns" and args.turns is None:
+        parser.error("--until turns requires --turns")
+    return args
+
+
+def _get_config_overrides(args: argparse.Namespace) -> dict[str, str]:
+    """Returns the config fields set on the command line."""
+    overrides = {}
+    if args.map_backend:
+        overrides["map_backend"] = args.map_backend
+    if args.path_finding_mode:
+        overrides["path_finding_mode"] = args.path_finding_mode
+    return overrides
+
+
+def _parse_categories(text: str) -> list[str]:
+    """Parses a comma-separated list of event categories."""
+    categories = [name.strip() for name in text.split(",") if name.strip()]
+    unknown = set(categories) - set(EventCategory.all())
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown event categories: {', '.join(sorted(unknown))}"
+        )
+    return categories
+
+
+def run_simulation(choice: str, args: argparse.Namespace) -> None:
     """Runs simulation in the selected mode."""
     mode = "auto" if choice == "1" else "step"
-    world_map = Map()
-    sim = Simulation(world_map)
-    sim.start_simulation(mode=mode)
+    sim = create_simulation(args)
+    try:
+        sim.start_simulation(mode=mode)
+    finally:
+        if sim.recorder:
+            sim.recorder.close()
     print("Return to main menu.")
 
 
+def create_simulation(args: argparse.Namespace) -> Simulation:
+    """Creates a new simulation, or restores the one given by --resume."""
+    if args.resume:
+        sim = load_checkpoint(args.resume)
+    else:
+        sim = Simulation(MapFactory.create_map())
+    sim.recorder = create_recorder(args)
+    return sim
+
+
+def create_recorder(args: argparse.Namespace) -> EventRecorder | None:
+    """Creates the event recorder requested by --record, if any."""
+    if not args.record:
+        return None
+    return EventRecorder(args.record, args.keyframe_interval)
+
+
+def run_headless(args: argparse.Namespace) -> None:
+    """Runs a headless simulation and prints its summary."""
+    sim = create_simulation(args)
+    try:
+        summary = sim.run_headless(
+            max_turns=args.turns,
+            until_extinction=args.until == "extinction",
+            progress_interval=args.progress_interval,
+            on_turn=_checkpoint_callback(args),
+        )
+    finally:
+        if sim.recorder:
+            sim.recorder.close()
+    if args.checkpoint:
+        save_checkpoint(sim, args.checkpoint)
+    print("\n=== Simulation end ===\n")
+    print(summary.end_message)
+    print(
+        f"Turns: {summary.turns}, herbivores: {summary.herbivores}, "
+        f"predators: {summary.predators}, grass: {summary.grass}"
+    )
+    print(
+        f"Elapsed: {summary.elapsed:.2f}s "
+        f"({summary.turns_per_second:.1f} turns/sec)"
+    )
+    counts = game_logger.get_counts()
+    if counts:
+        print(
+            "Events: "
+            + ", ".join(f"{name} {count}" for name, count in counts.items())
+        )
+    if turn_profiler.enabled:
+        print(turn_profiler.format_summary())
+        export_profile(args)
+
+
+def _checkpoint_callback(
+    args: argparse.Namespace,
+) -> Callable[[Simulation], None] | None:
+    """Returns the per-turn hook saving periodic checkpoints, if any."""
+    if not args.checkpoint_every:
+        return None
+
+    def on_turn(sim: Simulation) -> None:
+        if sim.turn_count > 0 and sim.turn_count % args.checkpoint_every == 0:
+            save_checkpoint(sim, args.checkpoint)
+
+    return on_turn
+
+
+def export_profile(args: argparse.Namespace) -> None:
+    """Writes the collected turn timings to the requested files."""
+    if args.profile_json:
+        turn_profiler.export_json(args.profile_json)
+    if args.profile_csv:
+        turn_profiler.export_csv(args.profile_csv)
+
+
 def handle_keyboard_interrupt() -> None:
     """Handles keyboard interrupt."""
     print("\nGame interrupted by user. Goodbye!")
@@ -1,5 +1,15 @@
 from .astar import AStarPathFinder
 from .base import PathFinder
 from .bfs import BFSPathFinder
+from .distance_field import DistanceField
+from .flow_field import FlowFieldPathFinder
+from .incremental_flow_field import IncrementalFlowFieldPathFinder
 
-__all__ = ["BFSPathFinder", "AStarPathFinder", "PathFinder"]
+__all__ = [
+    "BFSPathFinder",
+    "AStarPathFinder",
+    "FlowFieldPathFinder",
+    "IncrementalFlowFieldPathFinder",
+    "DistanceField",
+    "PathFinder",
+]
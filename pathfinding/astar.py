@@ -1,10 +1,322 @@
+import heapq
+from array import array
+
 from .base import PathFinder
 
 
+class _GoalIndex:
+    """
+    Goals grouped into square buckets for a multi-target heuristic.
+
+    The heuristic of a cell is its Manhattan distance to the nearest
+    bounding box of goals in a bucket. It never overestimates and changes
+    by at most 1 per step, so A* stays optimal with a closed set.
+    """
+
+    BUCKET_SIZE = 8
+
+    def __init__(self, goals: set[int], width: int) -> None:
+        size = self.BUCKET_SIZE
+        boxes: dict[tuple[int, int], list[int]] = {}
+        for index in goals:
+            x, y = index % width, index // width
+            key = (x // size, y // size)
+            box = boxes.get(key)
+            if box is None:
+                boxes[key] = [x, x, y, y]
+            else:
+                box[0] = min(box[0], x)
+                box[1] = max(box[1], x)
+                box[2] = min(box[2], y)
+                box[3] = max(box[3], y)
+        self._boxes = boxes
+        # Candidate boxes per bucket of the searched cell
+        self._candidates: dict[tuple[int, int], list[list[int]]] = {}
+
+    def estimate(self, x: int, y: int) -> int:
+        """Lower bound of the distance from (x, y) to the nearest goal."""
+        size = self.BUCKET_SIZE
+        key = (x // size, y // size)
+        candidates = self._candidates.get(key)
+        if candidates is None:
+            candidates = self._find_candidates(key)
+            self._candidates[key] = candidates
+
+        best = -1
+        for min_x, max_x, min_y, max_y in candidates:
+            dx = min_x - x if x < min_x else (x - max_x if x > max_x else 0)
+            dy = min_y - y if y < min_y else (y - max_y if y > max_y else 0)
+            distance = dx + dy
+            if best < 0 or distance < best:
+                best = distance
+        return best
+
+    def _find_candidates(self, key: tuple[int, int]) -> list[list[int]]:
+        """
+        Boxes that may hold the nearest goal for cells of a bucket.
+
+        A cell is at least size * (d - 2) + 2 steps from any goal in a
+        bucket d buckets away (Manhattan distance between buckets), and
+        at most size * (n + 2) - 2 steps from the goals in the closest
+        goal bucket, n buckets away. A box whose bucket is 4 or more
+        buckets further away than the closest one can thus never be
+        nearer, so it is skipped.
+        """
+        bx, by = key
+        distances = [
+            (abs(gx - bx) + abs(gy - by), box)
+            for (gx, gy), box in self._boxes.items()
+        ]
+        nearest = min(distance for distance, _ in distances)
+        return [box for distance, box in distances if distance <= nearest + 3]
+
+
 class AStarPathFinder(PathFinder):
-    """A* pathfinding strategy (placeholder)."""
+    """
+    A* pathfinding towards the nearest of many targets.
+
+    Uses a binary heap and flat per-cell buffers that are kept between
+    calls; a generation stamp marks which buffer entries belong to the
+    current search, so nothing is cleared or reallocated per call.
+    Searches whose window has more than MAX_BUFFER_CELLS cells, such as
+    unbounded searches on large maps, keep their scores in dicts that
+    are dropped after the call instead, so a finder never holds buffers
+    the size of a large map.
+
+    With nearest_targets, callers pass only the targets nearest to the
+    start. The search then heads for a few goals instead of every
+    target, which keeps it short on maps with sparse targets.
+    """
+
+    # Largest searched window kept in the flat buffers (16 B per cell)
+    MAX_BUFFER_CELLS = 1 << 16
+
+    def __init__(self, nearest_targets: bool = False) -> None:
+        self.nearest_targets = nearest_targets
+        self._size = 0
+        self._generation = 0
+        self._stamp = array("I")
+        self._g_score = array("i")
+        self._came_from = array("i")
+        self._closed = array("I")
+        self._heap: list[tuple[int, int, int]] = []
+        self.nodes_expanded = 0
+
+    def fork(self) -> "AStarPathFinder":
+        """A new finder with its own search buffers."""
+        return AStarPathFinder(self.nearest_targets)
 
     def find_nearest_target_path(
-        self, start_coord, world_map, targets
+        self,
+        start_coord,
+        world_map,
+        targets,
+        max_steps=None,
+        max_distance=None,
+    ) -> list | None:
+        """
+        Find the shortest path to the nearest target using A*.
+
+        With max_distance, cells more than max_distance steps away are
+        not searched, and the search runs in the window of cells within
+        that distance, so its buffers are sized to the window rather
+        than the map. Larger windows are searched with dicts.
+        Returns:
+            The path to the target coordinate (same shape as BFS) or None
+            if no path is found.
+        """
+        # Searched window; cell indexes below are y * columns + x with x
+        # and y relative to its top-left cell (left, top)
+        left, top = 0, 0
+        columns, rows = world_map.width, world_map.height
+        if max_distance is not None:
+            left = max(0, start_coord.x - max_distance)
+            top = max(0, start_coord.y - max_distance)
+            columns = min(columns, start_coord.x + max_distance + 1) - left
+            rows = min(rows, start_coord.y + max_distance + 1) - top
+        start = (start_coord.y - top) * columns + start_coord.x - left
+        goals = {
+            (coord.y - top) * columns + coord.x - left
+            for coord in targets
+            if 0 <= coord.x - left < columns and 0 <= coord.y - top < rows
+        }
+        goals.discard(start)
+        self.nodes_expanded = 0
+        if not goals:
+            return None
+
+        window = (left, top, columns, rows)
+        index = _GoalIndex(goals, columns)
+        if columns * rows > self.MAX_BUFFER_CELLS:
+            found = self._search_sparse(
+                start, goals, index, world_map, max_distance, window
+            )
+        else:
+            found = self._search_buffered(
+                start, goals, index, world_map, max_distance, window
+            )
+        if found is None:
+            return None
+        goal, came_from = found
+        return self._restore_path(
+            goal, came_from, world_map, max_steps, left, top, columns
+        )
+
+    def _search_buffered(
+        self,
+        start: int,
+        goals: set[int],
+        index: _GoalIndex,
+        world_map,
+        max_distance,
+        window: tuple[int, int, int, int],
+    ) -> tuple[int, array] | None:
+        """
+        Search the window with the flat buffers. Returns the goal reached
+        and the parent buffer, or None.
+        """
+        left, top, columns, rows = window
+        self._prepare_buffers(columns * rows)
+        generation = self._generation
+        stamp, closed = self._stamp, self._closed
+        g_score, came_from = self._g_score, self._came_from
+        heap = self._heap
+        heap.clear()
+
+        stamp[start] = generation
+        g_score[start] = 0
+        came_from[start] = -1
+        h = index.estimate(start % columns, start // columns)
+        heap.append((h, h, start))
+
+        while heap:
+            _, _, current = heapq.heappop(heap)
+            if closed[current] == generation:
+                continue
+            closed[current] = generation
+            self.nodes_expanded += 1
+
+            if current in goals:
+                return current, came_from
+
+            x, y = current % columns, current // columns
+            next_g = g_score[current] + 1
+            if max_distance is not None and next_g > max_distance:
+                continue
+            for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+                if not (0 <= nx < columns and 0 <= ny < rows):
+                    continue
+                neighbor = ny * columns + nx
+                if closed[neighbor] == generation:
+                    continue
+                if stamp[neighbor] == generation and (
+                    g_score[neighbor] <= next_g
+                ):
+                    continue
+                if neighbor not in goals and not world_map.is_cell_empty(
+                    nx + left, ny + top
+                ):
+                    continue
+
+                stamp[neighbor] = generation
+                g_score[neighbor] = next_g
+                came_from[neighbor] = current
+                h = index.estimate(nx, ny)
+                # Ties on f are broken towards cells closer to a goal
+                heapq.heappush(heap, (next_g + h, h, neighbor))
+        return None
+
+    def _search_sparse(
+        self,
+        start: int,
+        goals: set[int],
+        index: _GoalIndex,
+        world_map,
+        max_distance,
+        window: tuple[int, int, int, int],
+    ) -> tuple[int, dict[int, int]] | None:
+        """
+        Search the window keeping scores only for the cells reached.
+        Returns the goal reached and the parent dict, or None.
+        """
+        left, top, columns, rows = window
+        g_score = {start: 0}
+        came_from = {start: -1}
+        closed = set()
+        h = index.estimate(start % columns, start // columns)
+        heap = [(h, h, start)]
+
+        while heap:
+            _, _, current = heapq.heappop(heap)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.nodes_expanded += 1
+
+            if current in goals:
+                return current, came_from
+
+            x, y = current % columns, current // columns
+            next_g = g_score[current] + 1
+            if max_distance is not None and next_g > max_distance:
+                continue
+            for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+                if not (0 <= nx < columns and 0 <= ny < rows):
+                    continue
+                neighbor = ny * columns + nx
+                if neighbor in closed:
+                    continue
+                score = g_score.get(neighbor)
+                if score is not None and score <= next_g:
+                    continue
+                if neighbor not in goals and not world_map.is_cell_empty(
+                    nx + left, ny + top
+                ):
+                    continue
+
+                g_score[neighbor] = next_g
+                came_from[neighbor] = current
+                h = index.estimate(nx, ny)
+                # Ties on f are broken towards cells closer to a goal
+                heapq.heappush(heap, (next_g + h, h, neighbor))
+        return None
+
+    def _prepare_buffers(self, size: int) -> None:
+        """Start a new search generation, growing buffers if needed."""
+        if size > self._size:
+            self._size = size
+            self._generation = 0
+            self._stamp = array("I", [0]) * size
+            self._closed = array("I", [0]) * size
+            self._g_score = array("i", [0]) * size
+            self._came_from = array("i", [0]) * size
+        self._generation += 1
+
+    @staticmethod
+    def _restore_path(
+        goal: int,
+        came_from,
+        world_map,
+        max_steps,
+        left: int,
+        top: int,
+        columns: int,
     ) -> list:
-        raise NotImplementedError("A* pathfinding not implemented")
+        """
+        Restore the path from start to goal from the parents of the
+        searched cells, given the window the search ran in.
+        """
+        width = world_map.width
+        path = []
+        node = goal
+        while node != -1:
+            path.append(
+                world_map.index_to_coord(
+                    (node // columns + top) * width + node % columns + left
+                )
+            )
+            node = came_from[node]
+        path.reverse()
+        if max_steps is not None:
+            return path[: max_steps + 1]
+        return path
@@ -4,9 +4,53 @@ from abc import ABC, abstractmethod
 class PathFinder(ABC):
     """Strategy interface for pathfinding on the world map."""
 
+    # Nodes expanded by the last search, for profiling
+    nodes_expanded = 0
+    # Whether the search is only given the targets nearest to the start
+    # (config.nearest_target_count of them) instead of all targets
+    nearest_targets = False
+    # Whether a search may be given only some of the targets, such as
+    # those a creature can see; False for strategies sharing one field
+    # built from all targets between creatures
+    accepts_target_subsets = True
+
     @abstractmethod
     def find_nearest_target_path(
-        self, start_coord, world_map, targets
+        self,
+        start_coord,
+        world_map,
+        targets,
+        max_steps=None,
+        max_distance=None,
     ) -> list | None:
-        """Return a path from start to one of targets (including both ends)."""
+        """
+        Return a path from start to one of targets (including both ends).
+
+        If max_steps is given, the path may be cut after that many steps.
+        If max_distance is given, only targets at most that many steps
+        away are looked for, and None is returned if there is none.
+        """
         raise NotImplementedError
+
+    def needs_targets(self, world_map) -> bool:
+        """
+        Whether the caller must gather targets for the next search.
+        Strategies that reuse targets within a turn may return False.
+        """
+        return True
+
+    def prepare(self, world_map, targets) -> None:
+        """
+        Build the state shared by the searches of the current turn from
+        targets (None when needs_targets() is False), so that searches
+        only read it. Nothing to build by default.
+        """
+
+    def fork(self) -> "PathFinder":
+        """
+        Return a finder whose searches can run alongside this one's.
+        Searches that only read the state built by prepare() can share
+        the finder itself; strategies keeping search state in the
+        instance return a new one.
+        """
+        return self
@@ -1,46 +1,71 @@
-from collections import deque
-
 from .base import PathFinder
 
 
 class BFSPathFinder(PathFinder):
+    """Breadth-first search over flat y * width + x cell indices."""
+
+    def fork(self) -> "BFSPathFinder":
+        """A new finder, counting its own expanded nodes."""
+        return BFSPathFinder()
+
     def find_nearest_target_path(
         self,
         start_coord,
         world_map,
         targets,
+        max_steps=None,
+        max_distance=None,
     ) -> list | None:
         """
         Find the nearest path to a target coordinate using BFS.
+        The search is done one distance layer at a time, and stops after
+        layer max_distance if it is given.
         Returns:
             The path to the target coordinate or None if no path is found.
         """
-        queue = deque([start_coord])
+        width, height = world_map.width, world_map.height
+        start = start_coord.y * width + start_coord.x
+        goals = {coord.y * width + coord.x for coord in targets}
+        layer = [start]
+        distance = 0
 
         # Dictionary for path restoration: {child_cell: parent_cell}
-        came_from = {start_coord: None}
-
-        while queue:
-            current = queue.popleft()
-
-            if current in targets and current != start_coord:
-                # Restore path from target to start
-                path = []
-                path_node = current
-                while path_node is not None:
-                    path.append(path_node)
-                    path_node = came_from[path_node]
-                path.reverse()  # Reverse to get path from start to target
-                return path
-
-            for neighbor in world_map.get_neighbors_cells(current):
-                if neighbor in came_from:
-                    continue
+        came_from = {start: -1}
 
-                if (
-                    world_map.is_cell_empty(neighbor.x, neighbor.y)
-                    or neighbor in targets
+        self.nodes_expanded = 0
+        while layer:
+            next_layer = []
+            for current in layer:
+                self.nodes_expanded += 1
+
+                if current in goals and current != start:
+                    # Restore path from target to start
+                    path = []
+                    path_node = current
+                    while path_node != -1:
+                        path.append(world_map.index_to_coord(path_node))
+                        path_node = came_from[path_node]
+                    path.reverse()  # Reverse to get path from start to target
+                    if max_steps is not None:
+                        return path[: max_steps + 1]
+                    return path
+
+                if max_distance is not None and distance >= max_distance:
+                    continue
+                x, y = current % width, current // width
+                # Same order as Map.get_neighbors_cells: up, down, left, right
+                for nx, ny in (
+                    (x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)
                 ):
-                    came_from[neighbor] = current
-                    queue.append(neighbor)
+                    if not (0 <= nx < width and 0 <= ny < height):
+                        continue
+                    neighbor = ny * width + nx
+                    if neighbor in came_from:
+                        continue
+
+                    if neighbor in goals or world_map.is_cell_empty(nx, ny):
+                        came_from[neighbor] = current
+                        next_layer.append(neighbor)
+            layer = next_layer
+            distance += 1
         return None
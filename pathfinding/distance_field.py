@@ -0,0 +1,177 @@
+from array import array
+from collections import deque
+
+# Distance of cells that cannot reach any source
+UNREACHED = -1
+
+
+class DistanceField:
+    """
+    Unit-cost distance field from a set of source cells, repaired in place.
+
+    Cells are flat y * width + x indices and changes are applied in
+    batches. Adding sources or unblocking cells only lowers distances, so
+    one BFS runs outward from the changed cells. Removing sources or
+    blocking cells first collects, level by level, the cells that lost
+    every neighbor one step closer to a source. Then it re-seeds those
+    cells from the intact boundary. Only the cells affected by a change
+    are visited.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.distances = array("i", [UNREACHED]) * self.size
+        self.blocked = bytearray(self.size)
+        self.sources: set[int] = set()
+        # Number of cells whose distance was (re)computed
+        self.cells_updated = 0
+
+    def rebuild(self, sources: set[int], blocked: set[int]) -> None:
+        """Recompute the whole field with a multi-source BFS."""
+        self.distances = array("i", [UNREACHED]) * self.size
+        self.blocked = bytearray(self.size)
+        for index in blocked:
+            self.blocked[index] = 1
+        self.sources = set(sources)
+        for index in self.sources:
+            self.distances[index] = 0
+        self._propagate_decrease(list(self.sources))
+
+    def add_sources(self, indices) -> None:
+        """Make cells sources (distance 0)."""
+        seeds = []
+        for index in indices:
+            if index not in self.sources:
+                self.sources.add(index)
+                self.blocked[index] = 0
+                self.distances[index] = 0
+                seeds.append(index)
+        self._propagate_decrease(seeds)
+
+    def remove_sources(self, indices) -> None:
+        """Turn sources back into ordinary cells."""
+        removed = [index for index in indices if index in self.sources]
+        self.sources.difference_update(removed)
+        self._repair_increase(removed)
+
+    def block(self, indices) -> None:
+        """Make cells impassable."""
+        changed = [index for index in indices if not self.blocked[index]]
+        for index in changed:
+            self.blocked[index] = 1
+        self._repair_increase(changed)
+
+    def unblock(self, indices) -> None:
+        """Make cells passable again."""
+        changed = [index for index in indices if self.blocked[index]]
+        for index in changed:
+            self.blocked[index] = 0
+        seeds = []
+        for index in changed:
+            best = self._best_neighbor_distance(index)
+            if best != UNREACHED:
+                self.distances[index] = best + 1
+                seeds.append(index)
+        self._propagate_decrease(seeds)
+
+    def _neighbors(self, index: int) -> list[int]:
+        """Flat indices of the 4 cardinal neighbors inside the map."""
+        width = self.width
+        x = index % width
+        neighbors = []
+        if index >= width:
+            neighbors.append(index - width)
+        if index < self.size - width:
+            neighbors.append(index + width)
+        if x > 0:
+            neighbors.append(index - 1)
+        if x < width - 1:
+            neighbors.append(index + 1)
+        return neighbors
+
+    def _best_neighbor_distance(self, index: int) -> int:
+        """Smallest reached distance among passable neighbors."""
+        best = UNREACHED
+        distances, blocked = self.distances, self.blocked
+        for neighbor in self._neighbors(index):
+            distance = distances[neighbor]
+            if distance != UNREACHED and not blocked[neighbor] and (
+                best == UNREACHED or distance < best
+            ):
+                best = distance
+        return best
+
+    def _propagate_decrease(self, seeds: list[int]) -> None:
+        """Relax distances outward from cells whose distance dropped."""
+        distances, blocked = self.distances, self.blocked
+        seeds.sort(key=distances.__getitem__)
+        queue = deque(seeds)
+        updated = 0
+        while queue:
+            index = queue.popleft()
+            distance = distances[index] + 1
+            for neighbor in self._neighbors(index):
+                if blocked[neighbor]:
+                    continue
+                current = distances[neighbor]
+                if current == UNREACHED or current > distance:
+                    distances[neighbor] = distance
+                    queue.append(neighbor)
+                    updated += 1
+        self.cells_updated += updated
+
+    def _repair_increase(self, cells: list[int]) -> None:
+        """Repair the field after cells stopped supporting their region."""
+        distances, blocked = self.distances, self.blocked
+
+        # Invalidated cells grouped by their old distance
+        pending: dict[int, list[int]] = {}
+        affected = []
+        for cell in cells:
+            if distances[cell] != UNREACHED:
+                pending.setdefault(distances[cell], []).append(cell)
+                distances[cell] = UNREACHED
+                affected.append(cell)
+
+        # Collect unsupported cells level by level, so every possible
+        # support of a level is settled before the next one is checked
+        level_distance = min(pending, default=0)
+        while pending:
+            level = pending.pop(level_distance, None)
+            level_distance += 1
+            if level is None:
+                level_distance = min(pending)
+                continue
+
+            candidates = set()
+            for cell in level:
+                for neighbor in self._neighbors(cell):
+                    if (
+                        distances[neighbor] == level_distance
+                        and neighbor not in self.sources
+                    ):
+                        candidates.add(neighbor)
+            unsupported = [
+                cell
+                for cell in candidates
+                if self._best_neighbor_distance(cell) != level_distance - 1
+            ]
+            for cell in unsupported:
+                distances[cell] = UNREACHED
+            if unsupported:
+                pending.setdefault(level_distance, []).extend(unsupported)
+                affected.extend(unsupported)
+
+        # Re-seed affected cells from their still valid neighbors
+        seeds = []
+        for cell in affected:
+            if blocked[cell]:
+                continue
+            best = self._best_neighbor_distance(cell)
+            if best != UNREACHED:
+                distances[cell] = best + 1
+                seeds.append(cell)
+        self.cells_updated += len(affected)
+        self._propagate_decrease(seeds)
@@ -0,0 +1,160 @@
+from array import array
+from collections import deque
+
+import numpy as np
+
+from utils import EMPTY_CELL_CODE
+
+from .base import PathFinder
+
+# Field values of cells not reached by the search and of occupied cells
+UNREACHED = -1
+BLOCKED = -2
+
+
+class FlowFieldPathFinder(PathFinder):
+    """
+    Shared distance field ("flow field") pathfinding.
+
+    On the first call of a turn one multi-source BFS is run from all
+    targets over empty cells; every later call in the same turn reuses
+    that field and only walks downhill from the start cell. The field is
+    keyed by the map turn, so one instance must serve a single target
+    type (EntityFactory keeps one instance per creature type).
+    """
+
+    # The field is built from all targets, whichever creature asks first
+    accepts_target_subsets = False
+
+    def __init__(self) -> None:
+        self._field_map = None
+        self._field_turn = -1
+        self._field: array | None = None
+
+    def needs_targets(self, world_map) -> bool:
+        """Targets are only needed to build the first field of a turn."""
+        return not self._is_field_current(world_map)
+
+    def prepare(self, world_map, targets) -> None:
+        """Build the field of the current turn, if not built yet."""
+        self._get_field(world_map, targets)
+
+    def find_nearest_target_path(
+        self,
+        start_coord,
+        world_map,
+        targets,
+        max_steps=None,
+        max_distance=None,
+    ) -> list | None:
+        """
+        Walk downhill on the turn's distance field through empty cells.
+        Returns:
+            The path towards the nearest target (cut after max_steps
+            steps) or None if no target is reachable, or none within
+            max_distance steps.
+        """
+        field = self._get_field(world_map, targets)
+        path = self._walk_downhill(start_coord, world_map, field, max_steps)
+        if path and max_distance is not None:
+            # The start cell is occupied, the first step tells the distance
+            step = path[1]
+            if field[step.y * world_map.width + step.x] >= max_distance:
+                path = None
+        # Cells visited while walking the field downhill
+        self.nodes_expanded = len(path) if path else 0
+        return path
+
+    @staticmethod
+    def _walk_downhill(
+        start_coord, world_map, field, max_steps
+    ) -> list | None:
+        """Follow strictly decreasing distances through empty cells."""
+        width = world_map.width
+
+        path = [start_coord]
+        current = start_coord
+        current_distance = field[current.y * width + current.x]
+        if current_distance <= 0:
+            # Unreached cells and the targets themselves have no downhill
+            current_distance = len(field)
+
+        while max_steps is None or len(path) <= max_steps:
+            best = None
+            best_distance = current_distance
+            for neighbor in world_map.get_neighbors_cells(current):
+                distance = field[neighbor.y * width + neighbor.x]
+                if 0 <= distance < best_distance and world_map.is_cell_empty(
+                    neighbor.x, neighbor.y
+                ):
+                    best = neighbor
+                    best_distance = distance
+            if best is None:
+                break
+            path.append(best)
+            current = best
+            current_distance = best_distance
+            if current_distance == 0:
+                break
+
+        return path if len(path) > 1 else None
+
+    def _get_field(self, world_map, targets) -> array:
+        """Return the distance field of the current turn, building it once."""
+        if not self._is_field_current(world_map):
+            self._field = self.build_field(world_map, targets)
+            self._field_map = world_map
+            self._field_turn = world_map.turn
+        return self._field
+
+    def _is_field_current(self, world_map) -> bool:
+        """Check if the cached field was built for this map and turn."""
+        return (
+            self._field_map is world_map
+            and self._field_turn == world_map.turn
+        )
+
+    @staticmethod
+    def build_field(world_map, targets) -> array:
+        """
+        Multi-source BFS from all targets over empty cells. Occupied
+        cells are marked from the map's code tiles, so no mask of the
+        whole map is built besides the field.
+
+        Returns:
+            Flat array indexed by y * width + x holding the step distance
+            to the nearest target, UNREACHED for empty cells no target
+            can be reached from and BLOCKED for other occupied cells.
+        """
+        width, height = world_map.width, world_map.height
+        size = width * height
+        field = array("i", [UNREACHED]) * size
+        cells = np.frombuffer(field, dtype=np.intc).reshape(height, width)
+        for left, top, codes in world_map.get_code_tiles():
+            rows, columns = codes.shape
+            cells[top : top + rows, left : left + columns][
+                codes != EMPTY_CELL_CODE
+            ] = BLOCKED
+        del cells
+
+        queue = deque()
+        for coord in targets:
+            index = coord.y * width + coord.x
+            if field[index] < 0:
+                field[index] = 0
+                queue.append(index)
+
+        while queue:
+            index = queue.popleft()
+            distance = field[index] + 1
+            x = index % width
+            for neighbor, is_inside in (
+                (index - width, index >= width),
+                (index + width, index < size - width),
+                (index - 1, x > 0),
+                (index + 1, x < width - 1),
+            ):
+                if is_inside and field[neighbor] == UNREACHED:
+                    field[neighbor] = distance
+                    queue.append(neighbor)
+        return field
@@ -0,0 +1,140 @@
+from utils import EntityType
+
+from .distance_field import DistanceField
+from .flow_field import FlowFieldPathFinder
+
+
+class IncrementalFlowFieldPathFinder(FlowFieldPathFinder):
+    """
+    Flow field kept across turns and repaired only where the map changed.
+
+    Sources are the cells of the target type itself (grass for
+    herbivores, herbivores for predators), so walking downhill stops
+    next to a target. Other static entities block the field, creatures
+    do not: they move every turn and are only checked while walking.
+    The finder subscribes to the changes of the map and notes the cells
+    where a source or blocking entity was added, removed or moved. At
+    the first call of a turn only those cells are compared with the
+    previous turn, and each difference is applied to the DistanceField
+    as a local repair.
+    """
+
+    # Above this many changes per cell a full rebuild is cheaper than
+    # repairing each change separately
+    REBUILD_CHANGE_RATIO = 0.01
+    # Repairs touching more than this share of cells cost more than a
+    # rebuild (moving sources shift whole regions); the following turns
+    # are then rebuilt before repairs are tried again
+    REPAIR_COST_RATIO = 0.5
+    REBUILD_BACKOFF_TURNS = 8
+
+    def __init__(self, target_type: EntityType) -> None:
+        super().__init__()
+        self.target_type = target_type
+        self._blocking_types = [
+            entity_type
+            for entity_type in EntityType
+            if entity_type not in EntityType.creatures()
+            and entity_type != target_type
+        ]
+        self._tracked_types = {target_type, *self._blocking_types}
+        self._distance_field: DistanceField | None = None
+        self._source_coords: set = set()
+        self._blocked_coords: set = set()
+        # Cells of sources or blocking entities changed since the last
+        # repair, noted by _on_map_change
+        self._touched_coords: set = set()
+        self._rebuild_turns_left = 0
+
+    def needs_targets(self, world_map) -> bool:
+        """Sources are read from the map, callers never gather targets."""
+        return False
+
+    def _get_field(self, world_map, targets):
+        """Return the field of the current turn, repairing it once."""
+        if self._field_map is not world_map:
+            if self._field_map is not None:
+                self._field_map.unsubscribe(self._on_map_change)
+            world_map.subscribe(self._on_map_change)
+            self._rebuild(world_map)
+        elif self._field_turn != world_map.turn:
+            self._sync(world_map)
+        self._field_map = world_map
+        self._field_turn = world_map.turn
+        return self._distance_field.distances
+
+    def _on_map_change(self, change, coord, entity, to_coord) -> None:
+        """Note the cells of a map change that may affect the field."""
+        if entity.entity_type in self._tracked_types:
+            self._touched_coords.add(coord)
+            if to_coord is not None:
+                self._touched_coords.add(to_coord)
+
+    def _read_map(self, world_map) -> tuple[set, set]:
+        """Current source and blocked coordinate sets of the map."""
+        sources = world_map.get_coord_set_by_type(self.target_type)
+        blocked = set()
+        for entity_type in self._blocking_types:
+            blocked |= world_map.get_coord_set_by_type(entity_type)
+        return sources, blocked
+
+    def _rebuild(self, world_map) -> None:
+        """Build the field from scratch from the current map state."""
+        width = world_map.width
+        sources, blocked = self._read_map(world_map)
+        field = self._distance_field
+        if (
+            field is None
+            or field.width != width
+            or field.height != world_map.height
+        ):
+            self._distance_field = DistanceField(width, world_map.height)
+        self._distance_field.rebuild(
+            {coord.y * width + coord.x for coord in sources},
+            {coord.y * width + coord.x for coord in blocked},
+        )
+        self._source_coords, self._blocked_coords = sources, blocked
+        self._touched_coords = set()
+
+    def _sync(self, world_map) -> None:
+        """Apply the map changes since the last turn as local repairs."""
+        width = world_map.width
+        field = self._distance_field
+        sources, blocked = self._source_coords, self._blocked_coords
+        unblocked, added, removed, newly_blocked = [], [], [], []
+        for coord in self._touched_coords:
+            entity = world_map.get_entity(coord)
+            entity_type = entity.entity_type if entity else None
+            is_source = entity_type == self.target_type
+            is_blocked = entity_type in self._blocking_types
+            if is_source != (coord in sources):
+                (added if is_source else removed).append(coord)
+            if is_blocked != (coord in blocked):
+                (newly_blocked if is_blocked else unblocked).append(coord)
+        self._touched_coords = set()
+
+        changes = len(unblocked) + len(added) + len(removed)
+        changes += len(newly_blocked)
+        if (
+            self._rebuild_turns_left > 0
+            or changes > field.size * self.REBUILD_CHANGE_RATIO
+        ):
+            self._rebuild_turns_left = max(0, self._rebuild_turns_left - 1)
+            self._rebuild(world_map)
+            return
+
+        sources.update(added)
+        sources.difference_update(removed)
+        blocked.update(newly_blocked)
+        blocked.difference_update(unblocked)
+
+        # Distance-lowering changes first keep the later repairs small
+        updated_before = field.cells_updated
+        field.unblock(coord.y * width + coord.x for coord in unblocked)
+        field.add_sources(coord.y * width + coord.x for coord in added)
+        field.remove_sources(coord.y * width + coord.x for coord in removed)
+        field.block(coord.y * width + coord.x for coord in newly_blocked)
+
+        repaired = field.cells_updated - updated_before
+        if repaired > field.size * self.REPAIR_COST_RATIO:
+            self._rebuild_turns_left = self.REBUILD_BACKOFF_TURNS
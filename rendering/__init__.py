@@ -1,3 +1,4 @@
 from .map_renderer import MapRenderer
+from .render_loop import RenderLoop
 
-__all__ = ['MapRenderer']
+__all__ = ['MapRenderer', 'RenderLoop']
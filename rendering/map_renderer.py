@@ -1,68 +1,297 @@
-import os
+import shutil
+import sys
+import unicodedata
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 from config import config
-from sim_logging import game_logger
-from world import Coordinate
+from sim_logging import entity_symbol, game_logger
+from utils import EMPTY_CELL_CODE, EntityType
+
+from .viewport import MapView, capture_overview, capture_window
 
 if TYPE_CHECKING:
     from world import Map
 
+# ANSI escape sequences
+_CLEAR_SCREEN = "\x1b[H\x1b[2J"
+_CLEAR_TO_END = "\x1b[J"
+# Rows above the map: the header line and a blank line
+_HEADER_ROWS = 2
+# Row prefix "yy |  " shown with column and row numbers
+_ROW_NUMBER_WIDTH = 6
+# Rows kept free below the map for the logs when it is larger than the
+# terminal
+_MIN_LOG_ROWS = 6
+
+
+def _move_cursor(row: int, column: int) -> str:
+    """Escape sequence moving the cursor to a 1-based row and column."""
+    return f"\x1b[{row};{column}H"
+
+
+def _display_width(text: str) -> int:
+    """Number of terminal columns text occupies."""
+    width = 0
+    for char in text:
+        if unicodedata.combining(char) or "\ufe00" <= char <= "\ufe0f":
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in "WF" else 1
+    return width
+
+
+def _fit_log_lines(lines: list[str], columns: int, rows: int) -> list[str]:
+    """
+    Keep the log lines that fit in rows terminal rows of the given
+    width, wrapping included. The rest are replaced by a note.
+    """
+    heights = [
+        max(1, -(-_display_width(line) // max(columns, 1))) for line in lines
+    ]
+    if sum(heights) <= rows:
+        return lines
+    if rows < 1:
+        return []
+    kept = used = 0
+    for height in heights:
+        if used + height > rows - 1:
+            break
+        used += height
+        kept += 1
+    return lines[:kept] + [f"... {len(lines) - kept} more log lines"]
+
 
 class MapRenderer:
-    """Class for rendering the game map."""
+    """
+    Class for rendering the game map.
+
+    Frames are drawn incrementally: the code grid of the last frame is
+    kept, and the next frame only moves the cursor to the cells that
+    changed and rewrites them, followed by the header and the logs. A
+    frame is sent as a single write. The whole screen is redrawn on the
+    first frame, after invalidate(), when the shown part of the map
+    changes and when the frame does not fit in the terminal.
+
+    A map larger than the terminal is shown through a movable window of
+    cells, or zoomed out to fit when overview mode is on.
+    """
+
+    # Shown part of the map, None when the screen must be redrawn
+    _last_view: MapView | None = None
+    # Top-left cell of the window on maps larger than the terminal
+    _view_x = 0
+    _view_y = 0
+    # Overview mode, None to follow config.render_overview
+    _overview: bool | None = None
 
     @classmethod
     def render_frame(cls, world_map: "Map", turn_count: int) -> None:
-        """Prints the full simulation frame: header, logs, and map."""
-        cls._clear_console()
-        cls._print_header(turn_count)
-        game_logger.print_game_logs()
-        cls.render_map(world_map)
+        """Draws the simulation frame: header, map and logs."""
+        cls.render_snapshot(
+            cls.capture_view(world_map),
+            turn_count,
+            game_logger.format_game_logs(),
+        )
 
-    @staticmethod
-    def _clear_console() -> None:
-        """Clears the console."""
-        os.system("cls" if os.name == "nt" else "clear")
+    @classmethod
+    def capture_view(cls, world_map: "Map") -> MapView:
+        """
+        Capture the part of the map the next frame shows: all of it if
+        it fits in the terminal, otherwise the window or the overview.
+        The work done is proportional to the number of glyphs shown.
+        """
+        columns, rows = cls._get_map_area()
+        if world_map.width <= columns and world_map.height <= rows:
+            return capture_window(world_map, 0, 0, columns, rows)
+        if cls.is_overview():
+            return capture_overview(world_map, columns, rows)
+        view = capture_window(
+            world_map, cls._view_x, cls._view_y, columns, rows
+        )
+        cls._view_x, cls._view_y = view.x, view.y
+        return view
+
+    @classmethod
+    def render_snapshot(
+        cls, view: MapView, turn_count: int, log_lines: list[str]
+    ) -> None:
+        """
+        Draws a frame from a captured state: the shown part of the map
+        and the formatted log lines of the turn. The renderer keeps view.
+        """
+        glyphs = cls._get_glyphs()
+        map_top = _HEADER_ROWS + 1 + cls._column_header_rows()
+        log_top = map_top + view.codes.shape[0] + 1
+        terminal = shutil.get_terminal_size()
+        log_lines = _fit_log_lines(
+            log_lines, terminal.columns, terminal.lines - log_top
+        )
+
+        # A frame taller than the terminal scrolls it, so it can only be
+        # drawn in full
+        fits = log_top <= terminal.lines
+        last_view = cls._last_view
+        full_redraw = (
+            not fits
+            or last_view is None
+            or last_view.geometry != view.geometry
+        )
+        header = cls._format_header(turn_count, view.caption)
+        if full_redraw:
+            parts = [_CLEAR_SCREEN, header, "\n\n"]
+            parts.extend(cls._format_map(view, glyphs))
+        else:
+            parts = [_move_cursor(1, 1), header]
+            parts.extend(
+                cls._format_changes(
+                    last_view.codes, view.codes, glyphs, map_top
+                )
+            )
+        parts.append(_move_cursor(log_top, 1))
+        parts.append(_CLEAR_TO_END)
+        parts.extend(line + "\n" for line in log_lines)
+
+        sys.stdout.write("".join(parts))
+        sys.stdout.flush()
+        cls._last_view = view if fits else None
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Redraw the whole screen on the next frame."""
+        cls._last_view = None
+
+    @classmethod
+    def move_view(cls, dx: int, dy: int) -> None:
+        """
+        Move the window over a map larger than the terminal by
+        (dx, dy) cells. It is kept inside the map on the next frame.
+        """
+        cls._view_x = max(0, cls._view_x + dx)
+        cls._view_y = max(0, cls._view_y + dy)
+
+    @classmethod
+    def is_overview(cls) -> bool:
+        """Whether maps larger than the terminal are zoomed out."""
+        if cls._overview is None:
+            return config.render_overview
+        return cls._overview
+
+    @classmethod
+    def toggle_overview(cls) -> None:
+        """Switch between the window and the overview of large maps."""
+        cls._overview = not cls.is_overview()
+
+    @classmethod
+    def get_view_size(cls) -> tuple[int, int]:
+        """Columns and rows of cells the window shows at most."""
+        return cls._get_map_area()
+
+    @classmethod
+    def render_map(cls, world_map: "Map") -> None:
+        """
+        Prints the whole game map. Column and row numbers are shown if
+        config.show_column_and_row_numbers is True.
+        """
+        view = MapView(
+            world_map.get_code_grid(),
+            0,
+            0,
+            1,
+            world_map.width,
+            world_map.height,
+        )
+        sys.stdout.write("".join(cls._format_map(view, cls._get_glyphs())))
 
     @staticmethod
-    def _print_header(turn_count: int) -> None:
-        """Prints the header with the turn number."""
+    def _format_header(turn_count: int, caption: str) -> str:
+        """Formats the header line with the turn number."""
         header = (
-            f"=== Turn {turn_count} ===\n"
+            f"=== Turn {turn_count} ==="
             if turn_count > 0
             else "=== Start of simulation ==="
         )
-        print(header)
+        if caption:
+            header += f" {caption}"
+        return header + "\x1b[K"
 
-    @staticmethod
-    def render_map(world_map: "Map") -> None:
-        """
-        Prints the game map. Column and row numbers are shown if
-        config.show_column_and_row_numbers is True.
-        """
+    @classmethod
+    def _format_map(cls, view: MapView, glyphs: np.ndarray) -> list[str]:
+        """Formats every row of a view as text lines."""
+        lines = []
         show_numbers = config.show_column_and_row_numbers
-
         if show_numbers:
-            col_numbers = "      " + " ".join(
-                f"{x:2}" for x in range(world_map.width)
+            width = view.codes.shape[1]
+            cell_width = _display_width(glyphs[EMPTY_CELL_CODE])
+            separator = "    " + "-" * (width * cell_width + 1)
+            col_numbers = "      " + "".join(
+                f"{view.x + column * view.scale:>{cell_width - 1}} "
+                for column in range(width)
             )
-            separator = "    " + "-" * (world_map.width * 3 + 1)
-            print(separator)
-            print(col_numbers)
-            print(separator)
-
-        for y in range(world_map.height):
-            row_symbols = [
-                world_map.get_entity(Coordinate(x, y)).symbol
-                if world_map.get_entity(Coordinate(x, y))
-                else config.empty_cell_symbol
-                for x in range(world_map.width)
-            ]
-
-            if show_numbers:
-                row_str = " ".join(row_symbols)
-                print(f"{y:2} |  " + row_str)
-            else:
-                row_str = "".join(row_symbols)
-                print(row_str)
+            lines += [separator + "\n", col_numbers + "\n", separator + "\n"]
+
+        for row, glyph_row in enumerate(glyphs[view.codes].tolist()):
+            y = view.y + row * view.scale
+            prefix = f"{y:2} |  " if show_numbers else ""
+            lines.append(prefix + "".join(glyph_row) + "\n")
+        return lines
+
+    @staticmethod
+    def _format_changes(
+        last_codes: np.ndarray,
+        codes: np.ndarray,
+        glyphs: np.ndarray,
+        map_top: int,
+    ) -> list[str]:
+        """Cursor moves and glyphs rewriting the cells that changed."""
+        width = codes.shape[1]
+        cell_width = _display_width(glyphs[EMPTY_CELL_CODE])
+        left = _ROW_NUMBER_WIDTH if config.show_column_and_row_numbers else 0
+        parts = []
+        cursor = -1
+        for index in np.flatnonzero(last_codes != codes).tolist():
+            # Adjacent changed cells are written without moving the cursor
+            if index != cursor:
+                y, x = divmod(index, width)
+                parts.append(
+                    _move_cursor(map_top + y, left + x * cell_width + 1)
+                )
+            parts.append(glyphs[codes.flat[index]])
+            cursor = index + 1 if (index + 1) % width else -1
+        return parts
+
+    @staticmethod
+    def _column_header_rows() -> int:
+        """Rows taken by the column numbers above the map."""
+        return 3 if config.show_column_and_row_numbers else 0
+
+    @classmethod
+    def _get_map_area(cls) -> tuple[int, int]:
+        """Columns and rows of glyphs that fit in the terminal."""
+        terminal = shutil.get_terminal_size()
+        left = _ROW_NUMBER_WIDTH if config.show_column_and_row_numbers else 0
+        cell_width = _display_width(cls._get_glyphs()[EMPTY_CELL_CODE])
+        map_top = _HEADER_ROWS + 1 + cls._column_header_rows()
+        columns = (terminal.columns - left) // cell_width
+        rows = terminal.lines - map_top - _MIN_LOG_ROWS
+        return max(columns, 1), max(rows, 1)
+
+    @staticmethod
+    def _get_glyphs() -> np.ndarray:
+        """
+        Text of a cell per EntityType code, padded to a common width.
+        Cells are followed by a space when column numbers are shown.
+        """
+        symbols = [config.empty_cell_symbol] * (len(EntityType) + 1)
+        for entity_type in EntityType:
+            symbols[entity_type.code] = entity_symbol(entity_type.code)
+        cell_width = max(_display_width(symbol) for symbol in symbols)
+        separator = " " if config.show_column_and_row_numbers else ""
+        return np.array(
+            [
+                symbol + " " * (cell_width - _display_width(symbol))
+                + separator
+                for symbol in symbols
+            ],
+            dtype=object,
+        )
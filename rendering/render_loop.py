@@ -0,0 +1,89 @@
+import threading
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from sim_logging import game_logger
+
+from .map_renderer import MapRenderer
+
+if TYPE_CHECKING:
+    from world import Map
+
+
+class RenderLoop:
+    """
+    Draws frames on a background thread at a fixed rate, independently
+    of how fast the simulation steps.
+
+    The thread never reads the map while a turn runs. When a frame is
+    due it raises a flag, and the simulation captures the state of the
+    next finished turn (shown part of the map and log lines) in
+    publish(). Turns
+    that finish while no frame is due are not captured, so a renderer
+    that falls behind skips frames instead of slowing the simulation.
+    """
+
+    def __init__(self, fps: float) -> None:
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        self.interval = 1 / fps
+        self._lock = threading.Lock()
+        # (map view, turn, log lines) waiting to be drawn
+        self._snapshot: tuple | None = None
+        self._frame_due = threading.Event()
+        self._snapshot_ready = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start drawing frames."""
+        self._stopped.clear()
+        self._frame_due.set()
+        self._thread = threading.Thread(
+            target=self._run, name="render-loop", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread after the frame it is drawing, if any."""
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._snapshot_ready.set()
+        self._thread.join()
+        self._thread = None
+
+    def publish(self, world_map: "Map", turn_count: int) -> None:
+        """
+        Offer the state after a finished turn, called by the simulation.
+        The events of turns that are not captured are dropped.
+        """
+        if not self._frame_due.is_set():
+            game_logger.clear()
+            return
+        snapshot = (
+            MapRenderer.capture_view(world_map),
+            turn_count,
+            game_logger.format_game_logs(),
+        )
+        with self._lock:
+            self._snapshot = snapshot
+        self._frame_due.clear()
+        self._snapshot_ready.set()
+
+    def _run(self) -> None:
+        next_frame = perf_counter()
+        while True:
+            self._snapshot_ready.wait()
+            if self._stopped.is_set():
+                return
+            with self._lock:
+                snapshot, self._snapshot = self._snapshot, None
+                self._snapshot_ready.clear()
+            MapRenderer.render_snapshot(*snapshot)
+
+            # Start the next frame on schedule, or at once when behind
+            next_frame = max(next_frame + self.interval, perf_counter())
+            if self._stopped.wait(next_frame - perf_counter()):
+                return
+            self._frame_due.set()
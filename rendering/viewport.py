@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from utils import EMPTY_CELL_CODE, EntityType
+
+if TYPE_CHECKING:
+    from world import Map
+
+
+@dataclass(frozen=True)
+class MapView:
+    """
+    Part of a map captured for one frame.
+
+    codes holds one EntityType code per glyph. A glyph is a single cell
+    when scale is 1, otherwise it stands for a scale x scale block of
+    cells. (x, y) is the map cell under the top-left glyph.
+    """
+
+    codes: np.ndarray
+    x: int
+    y: int
+    scale: int
+    map_width: int
+    map_height: int
+
+    @property
+    def geometry(self) -> tuple[int, int, int, tuple[int, int]]:
+        """Position, scale and size; frames differing in it are redrawn."""
+        return self.x, self.y, self.scale, self.codes.shape
+
+    @property
+    def caption(self) -> str:
+        """Describes the shown part of the map, empty for the whole map."""
+        if self.scale > 1:
+            return f"overview, 1 glyph = {self.scale}x{self.scale} cells"
+        rows, columns = self.codes.shape
+        if (columns, rows) == (self.map_width, self.map_height):
+            return ""
+        return (
+            f"cells ({self.x}, {self.y})-({self.x + columns - 1}, "
+            f"{self.y + rows - 1}) of {self.map_width}x{self.map_height}"
+        )
+
+
+def capture_window(
+    world_map: "Map", x: int, y: int, columns: int, rows: int
+) -> MapView:
+    """
+    Capture the cells of a window of the map. The window is shrunk to
+    the map and moved inside it if needed.
+    """
+    columns = min(columns, world_map.width)
+    rows = min(rows, world_map.height)
+    x = max(0, min(x, world_map.width - columns))
+    y = max(0, min(y, world_map.height - rows))
+    return MapView(
+        world_map.get_code_window(x, y, columns, rows),
+        x,
+        y,
+        1,
+        world_map.width,
+        world_map.height,
+    )
+
+
+def capture_overview(world_map: "Map", columns: int, rows: int) -> MapView:
+    """
+    Capture the whole map zoomed out to fit columns x rows glyphs.
+
+    Every glyph covers a square group of the blocks the map keeps
+    counts for. It shows a predator if the group holds one, else a
+    herbivore if it holds one, else its most common static type or
+    emptiness.
+    """
+    block_counts = world_map.block_counts
+    block_rows, block_columns = block_counts.shape
+    factor = max(
+        -(-block_columns // max(columns, 1)), -(-block_rows // max(rows, 1))
+    )
+    counts, areas = block_counts.downsample(factor)
+
+    candidates = counts.copy()
+    candidates[EMPTY_CELL_CODE] = areas - counts.sum(axis=0)
+    for entity_type in EntityType.creatures():
+        candidates[entity_type.code] = -1
+    codes = candidates.argmax(axis=0).astype(np.int8)
+    for entity_type in (EntityType.HERBIVORE, EntityType.PREDATOR):
+        code = entity_type.code
+        codes[counts[code] > 0] = code
+    return MapView(
+        codes,
+        0,
+        0,
+        factor * block_counts.block_size,
+        world_map.width,
+        world_map.height,
+    )
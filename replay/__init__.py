@@ -0,0 +1,5 @@
+from .player import ReplayMap, play_replay
+from .reader import EventLogReader
+from .recorder import EventRecorder
+
+__all__ = ["EventLogReader", "EventRecorder", "ReplayMap", "play_replay"]
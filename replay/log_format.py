@@ -0,0 +1,59 @@
+"""
+Layout of the binary event log.
+
+All values are little-endian. The file starts with a header and is
+followed by blocks, each one a tag byte, a turn number and the byte
+length of its payload:
+
+- TURN_TAG: the recorded events of one turn, back to back. Every event
+  is its EventType byte followed by the fields of EVENT_FIELDS.
+- KEYFRAME_TAG: zlib-compressed int8 (height, width) grid of EntityType
+  codes, the map after the block's turn.
+
+Blocks are self-delimiting, so a reader can index a file by skipping
+from one block header to the next, and a file cut short by a crash
+stays readable up to its last complete block.
+"""
+
+import struct
+
+from sim_logging import EventType
+
+MAGIC = b"ECOLOG\x00\x01"
+
+# magic, width, height, keyframe interval, coordinate format
+HEADER = struct.Struct("<8sIIIc")
+# tag, turn, payload length
+BLOCK_HEADER = struct.Struct("<BII")
+
+TURN_TAG = 1
+KEYFRAME_TAG = 2
+
+# Struct codes of the fields after the event type byte. "C" stands for
+# a coordinate, stored as "H" on maps up to 65535 cells wide and high
+# and as "I" otherwise; "B" is an EntityType code.
+EVENT_FIELDS = {
+    EventType.MOVE: "BCCCC",
+    EventType.HEAL: "Bf",
+    EventType.EAT: "BCCBCC",
+    EventType.ATTACK: "BCCBCCf",
+    EventType.DEATH_BATTLE: "BCCB",
+    EventType.DEATH_STARVATION: "BCC",
+    EventType.ADD: "BCC",
+}
+
+
+def coordinate_format(width: int, height: int) -> bytes:
+    """Smallest struct code holding every coordinate of the map."""
+    return b"H" if max(width, height) <= 0xFFFF else b"I"
+
+
+def build_event_structs(
+    coord_format: bytes,
+) -> dict[EventType, struct.Struct]:
+    """Struct of each recorded event type, including its type byte."""
+    coord = coord_format.decode()
+    return {
+        event_type: struct.Struct("<B" + fields.replace("C", coord))
+        for event_type, fields in EVENT_FIELDS.items()
+    }
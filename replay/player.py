@@ -0,0 +1,78 @@
+from time import sleep
+
+import numpy as np
+
+from config import config
+from rendering import MapRenderer
+from sim_logging import game_logger
+from world import BlockCounts
+
+from .reader import EventLogReader, apply_events
+
+
+class ReplayMap:
+    """
+    Read-only map rebuilt from an event log.
+
+    Holds only the grid of EntityType codes and provides the part of the
+    Map interface MapRenderer uses.
+    """
+
+    def __init__(self, grid: np.ndarray) -> None:
+        self.height, self.width = grid.shape
+        self.grid = grid
+
+    def get_code_grid(self) -> np.ndarray:
+        """Get a copy of the int8 (height, width) grid of codes."""
+        return self.grid.copy()
+
+    def get_code_window(
+        self, x: int, y: int, width: int, height: int
+    ) -> np.ndarray:
+        """Get a copy of a window of the grid of codes."""
+        return self.grid[y : y + height, x : x + width].copy()
+
+    @property
+    def block_counts(self) -> BlockCounts:
+        """Entity counts per block, counted from the grid on each use."""
+        return BlockCounts.from_code_grid(
+            self.grid, config.overview_block_size
+        )
+
+    def apply_events(self, events: list[tuple]) -> None:
+        apply_events(self.grid, events)
+
+
+def play_replay(
+    path: str,
+    start_turn: int = 0,
+    end_turn: int | None = None,
+    delay: float | None = None,
+) -> None:
+    """
+    Render a recorded run turn by turn.
+
+    Args:
+        path: Event log written by EventRecorder
+        start_turn: First rendered turn (reached through a keyframe),
+            at least the first turn of the log
+        end_turn: Last rendered turn (the last recorded turn if omitted)
+        delay: Seconds between frames (config.turn_delay if omitted)
+    """
+    delay = config.turn_delay if delay is None else delay
+    with EventLogReader(path) as reader:
+        end_turn = reader.last_turn if end_turn is None else end_turn
+        end_turn = min(end_turn, reader.last_turn)
+        start_turn = max(start_turn, reader.first_turn)
+        replay_map = ReplayMap(reader.read_state(start_turn))
+        game_logger.clear()
+        MapRenderer.invalidate()
+        MapRenderer.render_frame(replay_map, start_turn)
+
+        for turn in range(start_turn + 1, end_turn + 1):
+            sleep(delay)
+            events = reader.read_events(turn)
+            for event in events:
+                game_logger.log_event(*event)
+            replay_map.apply_events(events)
+            MapRenderer.render_frame(replay_map, turn)
@@ -0,0 +1,140 @@
+import bisect
+import zlib
+
+import numpy as np
+
+from sim_logging import EventType
+from utils import EMPTY_CELL_CODE
+
+from .log_format import (
+    BLOCK_HEADER,
+    HEADER,
+    KEYFRAME_TAG,
+    MAGIC,
+    TURN_TAG,
+    build_event_structs,
+)
+
+
+class EventLogReader:
+    """
+    Random access to a binary event log written by EventRecorder.
+
+    Opening a log indexes the offsets of its blocks. The map at any turn
+    is rebuilt from the nearest earlier keyframe plus the events of the
+    turns in between.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        magic, width, height, interval, coord_format = HEADER.unpack(
+            self._file.read(HEADER.size)
+        )
+        if magic != MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} is not an event log")
+        self.width = width
+        self.height = height
+        self.keyframe_interval = interval
+        self._structs = build_event_structs(coord_format)
+        # (offset, length) of the payload of every block, by turn
+        self._turns: dict[int, tuple[int, int]] = {}
+        self._keyframes: dict[int, tuple[int, int]] = {}
+        self._index()
+        self._keyframe_turns = sorted(self._keyframes)
+        if not self._keyframe_turns:
+            self._file.close()
+            raise ValueError(f"{path} has no keyframe")
+        # First turn of the log, above 0 when recording a resumed run
+        self.first_turn = self._keyframe_turns[0]
+        # Last turn stored completely in the log
+        self.last_turn = max(self._turns, default=self.first_turn)
+
+    def __enter__(self) -> "EventLogReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def read_events(self, turn: int) -> list[tuple]:
+        """Decode the events recorded during a turn."""
+        if turn not in self._turns:
+            return []
+        payload = self._read_payload(*self._turns[turn])
+        structs = self._structs
+        events = []
+        offset = 0
+        while offset < len(payload):
+            event_struct = structs[payload[offset]]
+            event = event_struct.unpack_from(payload, offset)
+            events.append((EventType(event[0]), *event[1:]))
+            offset += event_struct.size
+        return events
+
+    def read_state(self, turn: int) -> np.ndarray:
+        """Rebuild the int8 (height, width) code grid after a turn."""
+        if not self.first_turn <= turn <= self.last_turn:
+            raise ValueError(
+                f"turn {turn} is outside the log "
+                f"({self.first_turn}-{self.last_turn})"
+            )
+        position = bisect.bisect_right(self._keyframe_turns, turn) - 1
+        keyframe_turn = self._keyframe_turns[position]
+        grid = self._read_keyframe(keyframe_turn)
+        for next_turn in range(keyframe_turn + 1, turn + 1):
+            apply_events(grid, self.read_events(next_turn))
+        return grid
+
+    def _read_keyframe(self, turn: int) -> np.ndarray:
+        data = zlib.decompress(self._read_payload(*self._keyframes[turn]))
+        grid = np.frombuffer(data, dtype=np.int8)
+        return grid.reshape(self.height, self.width).copy()
+
+    def _read_payload(self, offset: int, length: int) -> bytes:
+        self._file.seek(offset)
+        return self._file.read(length)
+
+    def _index(self) -> None:
+        """Record the payload offsets of all complete blocks."""
+        file = self._file
+        file.seek(0, 2)
+        size = file.tell()
+        offset = HEADER.size
+        while offset + BLOCK_HEADER.size <= size:
+            file.seek(offset)
+            tag, turn, length = BLOCK_HEADER.unpack(
+                file.read(BLOCK_HEADER.size)
+            )
+            payload_offset = offset + BLOCK_HEADER.size
+            if payload_offset + length > size:
+                # Block cut short, e.g. by a crash while recording
+                break
+            if tag == TURN_TAG:
+                self._turns[turn] = (payload_offset, length)
+            elif tag == KEYFRAME_TAG:
+                self._keyframes[turn] = (payload_offset, length)
+            offset = payload_offset + length
+
+
+def apply_events(grid: np.ndarray, events: list[tuple]) -> None:
+    """Apply the map changes of recorded events to a code grid."""
+    for event in events:
+        event_type = event[0]
+        if event_type == EventType.MOVE:
+            _, code, x, y, to_x, to_y = event
+            grid[y, x] = EMPTY_CELL_CODE
+            grid[to_y, to_x] = code
+        elif event_type == EventType.EAT:
+            grid[event[6], event[5]] = EMPTY_CELL_CODE
+        elif event_type in (
+            EventType.DEATH_BATTLE,
+            EventType.DEATH_STARVATION,
+        ):
+            grid[event[3], event[2]] = EMPTY_CELL_CODE
+        elif event_type == EventType.ADD:
+            _, code, x, y = event
+            grid[y, x] = code
@@ -0,0 +1,92 @@
+import zlib
+from typing import TYPE_CHECKING
+
+from sim_logging import game_logger
+
+from .log_format import (
+    BLOCK_HEADER,
+    HEADER,
+    KEYFRAME_TAG,
+    MAGIC,
+    TURN_TAG,
+    build_event_structs,
+    coordinate_format,
+)
+
+if TYPE_CHECKING:
+    from world import Map
+
+
+class EventRecorder:
+    """
+    Writes the events of a run to a compact binary log.
+
+    Events reach the recorder through a game_logger sink, so they are
+    recorded whatever the logger filters are. They are encoded once per
+    turn; every keyframe_interval turns a compressed keyframe of the
+    whole map is written as well, so a replay can jump to any turn.
+    """
+
+    def __init__(self, path: str, keyframe_interval: int = 100) -> None:
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self._file = None
+        self._pending: list[tuple] = []
+        self._structs = {}
+
+    def __enter__(self) -> "EventRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start(self, world_map: "Map", turn: int = 0) -> None:
+        """
+        Write the header and a keyframe of the current map, then start
+        listening. turn is the current turn, above 0 for resumed runs.
+        """
+        coord_format = coordinate_format(world_map.width, world_map.height)
+        self._structs = build_event_structs(coord_format)
+        self._file = open(self.path, "wb")
+        self._file.write(
+            HEADER.pack(
+                MAGIC,
+                world_map.width,
+                world_map.height,
+                self.keyframe_interval,
+                coord_format,
+            )
+        )
+        self._write_keyframe(turn, world_map)
+        game_logger.add_sink(self._pending.append)
+
+    def end_turn(self, turn: int, world_map: "Map") -> None:
+        """Write the events of a finished turn and a keyframe if due."""
+        if self._file is None:
+            return
+        structs = self._structs
+        payload = b"".join(
+            structs[event[0]].pack(*event)
+            for event in self._pending
+            if event[0] in structs
+        )
+        self._pending.clear()
+        self._file.write(BLOCK_HEADER.pack(TURN_TAG, turn, len(payload)))
+        self._file.write(payload)
+        if turn % self.keyframe_interval == 0:
+            self._write_keyframe(turn, world_map)
+
+    def close(self) -> None:
+        """Stop listening and close the file."""
+        if self._file is None:
+            return
+        game_logger.remove_sink(self._pending.append)
+        self._file.close()
+        self._file = None
+
+    def _write_keyframe(self, turn: int, world_map: "Map") -> None:
+        payload = zlib.compress(world_map.get_code_grid().tobytes())
+        self._file.write(BLOCK_HEADER.pack(KEYFRAME_TAG, turn, len(payload)))
+        self._file.write(payload)
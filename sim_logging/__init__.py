@@ -1,3 +1,12 @@
+from .events import EventCategory, EventLevel, EventType, entity_symbol
 from .logger import game_logger
+from .profiler import turn_profiler
 
-__all__ = ["game_logger"]
+__all__ = [
+    "EventCategory",
+    "EventLevel",
+    "EventType",
+    "entity_symbol",
+    "game_logger",
+    "turn_profiler",
+]
@@ -0,0 +1,212 @@
+from enum import IntEnum
+
+from config import config
+from utils import EntityType
+
+
+class EventType(IntEnum):
+    """
+    Types of simulation events.
+
+    An event is stored as a tuple of its type followed by a few plain
+    values (entity type codes, cell coordinates, amounts, the exception
+    of a failure), listed next to each member. Text is only built when
+    the event is formatted.
+    """
+
+    MESSAGE = 0  # text
+    MOVE = 1  # code, from x, from y, to x, to y
+    HEAL = 2  # code, amount
+    EAT = 3  # code, x, y, target code, target x, target y
+    ATTACK = 4  # code, x, y, target code, target x, target y, damage
+    DEATH_BATTLE = 5  # code, x, y, attacker code
+    DEATH_STARVATION = 6  # code, x, y
+    ADD = 7  # code, x, y
+    ACTION_FAIL = 8  # code, x, y, target x, target y (-1 if none), exception
+    MOVE_FAIL = 9  # code, from x, from y, to x, to y, exception
+    SLOW_TURN = 10  # turn, seconds, slowest action, its seconds
+
+
+class EventLevel(IntEnum):
+    """Severity used to filter events."""
+
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+
+
+class EventCategory:
+    """Groups of event types that can be enabled together."""
+
+    MOVEMENT = "movement"
+    FEEDING = "feeding"
+    COMBAT = "combat"
+    LIFECYCLE = "lifecycle"
+    DIAGNOSTICS = "diagnostics"
+
+    @classmethod
+    def all(cls) -> list[str]:
+        return [
+            cls.MOVEMENT,
+            cls.FEEDING,
+            cls.COMBAT,
+            cls.LIFECYCLE,
+            cls.DIAGNOSTICS,
+        ]
+
+
+EVENT_LEVELS = {
+    EventType.MESSAGE: EventLevel.WARNING,
+    EventType.MOVE: EventLevel.DEBUG,
+    EventType.HEAL: EventLevel.DEBUG,
+    EventType.EAT: EventLevel.INFO,
+    EventType.ATTACK: EventLevel.INFO,
+    EventType.DEATH_BATTLE: EventLevel.INFO,
+    EventType.DEATH_STARVATION: EventLevel.INFO,
+    EventType.ADD: EventLevel.DEBUG,
+    EventType.ACTION_FAIL: EventLevel.WARNING,
+    EventType.MOVE_FAIL: EventLevel.WARNING,
+    EventType.SLOW_TURN: EventLevel.WARNING,
+}
+
+EVENT_CATEGORIES = {
+    EventType.MESSAGE: EventCategory.DIAGNOSTICS,
+    EventType.MOVE: EventCategory.MOVEMENT,
+    EventType.HEAL: EventCategory.FEEDING,
+    EventType.EAT: EventCategory.FEEDING,
+    EventType.ATTACK: EventCategory.COMBAT,
+    EventType.DEATH_BATTLE: EventCategory.COMBAT,
+    EventType.DEATH_STARVATION: EventCategory.LIFECYCLE,
+    EventType.ADD: EventCategory.LIFECYCLE,
+    EventType.ACTION_FAIL: EventCategory.DIAGNOSTICS,
+    EventType.MOVE_FAIL: EventCategory.MOVEMENT,
+    EventType.SLOW_TURN: EventCategory.DIAGNOSTICS,
+}
+
+# Config field holding the symbol of each entity type
+_SYMBOL_FIELDS = {
+    EntityType.HERBIVORE: "herbivore_symbol",
+    EntityType.PREDATOR: "predator_symbol",
+    EntityType.GRASS: "grass_symbol",
+    EntityType.ROCK: "rock_symbol",
+    EntityType.TREE: "tree_symbol",
+}
+
+
+def format_event(event: tuple) -> tuple[str, str]:
+    """
+    Format an event for display.
+
+    Returns:
+        The group the event is printed under and its text
+    """
+    event_type, *args = event
+    formatter = _FORMATTERS.get(event_type)
+    if formatter is None:
+        return "OTHER", str(args)
+    return formatter(*args)
+
+
+def entity_symbol(code: int) -> str:
+    """Symbol of an entity type given by its storage code."""
+    return getattr(config, _SYMBOL_FIELDS[EntityType.from_code(code)])
+
+
+def _cell(x: int, y: int) -> str:
+    return f"({x}, {y})"
+
+
+def _format_message(text: str) -> tuple[str, str]:
+    group, separator, rest = text.partition(":")
+    if not separator:
+        return "OTHER", text
+    return group, rest.strip()
+
+
+def _format_move(code, x, y, to_x, to_y) -> tuple[str, str]:
+    return (
+        f"MOVE {entity_symbol(code)}",
+        f"{_cell(x, y)} -> {_cell(to_x, to_y)}",
+    )
+
+
+def _format_heal(code, amount) -> tuple[str, str]:
+    return "HEAL", (
+        f"{entity_symbol(code)} {config.health_symbol} {amount:.0f} HP"
+    )
+
+
+def _format_eat(code, x, y, target_code, to_x, to_y) -> tuple[str, str]:
+    return "EAT", (
+        f"{entity_symbol(code)} {_cell(x, y)} ate "
+        f"{entity_symbol(target_code)} {_cell(to_x, to_y)}"
+    )
+
+
+def _format_attack(
+    code, x, y, target_code, to_x, to_y, damage
+) -> tuple[str, str]:
+    return "ATTACK", (
+        f"{entity_symbol(code)} {_cell(x, y)} {config.attack_symbol} "
+        f"{entity_symbol(target_code)} {_cell(to_x, to_y)} "
+        f"{config.damage_symbol} {int(damage)}"
+    )
+
+
+def _format_death_battle(code, x, y, attacker_code) -> tuple[str, str]:
+    return "DEATH (battle)", (
+        f"{entity_symbol(code)} {config.death_symbol} {_cell(x, y)} "
+        f"by {entity_symbol(attacker_code)}"
+    )
+
+
+def _format_death_starvation(code, x, y) -> tuple[str, str]:
+    return "DEATH (starvation)", (
+        f"{entity_symbol(code)} {_cell(x, y)} {config.death_symbol}"
+    )
+
+
+def _format_add(code, x, y) -> tuple[str, str]:
+    return "ADD", f"{entity_symbol(code)} to {_cell(x, y)}"
+
+
+def _format_action_fail(code, x, y, to_x, to_y, error) -> tuple[str, str]:
+    if to_x < 0:
+        return "ACTION_FAIL", (
+            f"{entity_symbol(code)} at {_cell(x, y)}: {error}"
+        )
+    return "ACTION_FAIL", (
+        f"{entity_symbol(code)} at {_cell(x, y)} -> "
+        f"{_cell(to_x, to_y)}: {error}"
+    )
+
+
+def _format_move_fail(code, x, y, to_x, to_y, error) -> tuple[str, str]:
+    return "MOVE_FAIL", (
+        f"{entity_symbol(code)} {_cell(x, y)} -> {_cell(to_x, to_y)} "
+        f"error: {error}"
+    )
+
+
+def _format_slow_turn(
+    turn, seconds, action, action_seconds
+) -> tuple[str, str]:
+    return "SLOW_TURN", (
+        f"turn {turn} took {seconds * 1000:.1f} ms"
+        f" ({action} {action_seconds * 1000:.1f} ms)"
+    )
+
+
+_FORMATTERS = {
+    EventType.MESSAGE: _format_message,
+    EventType.MOVE: _format_move,
+    EventType.HEAL: _format_heal,
+    EventType.EAT: _format_eat,
+    EventType.ATTACK: _format_attack,
+    EventType.DEATH_BATTLE: _format_death_battle,
+    EventType.DEATH_STARVATION: _format_death_starvation,
+    EventType.ADD: _format_add,
+    EventType.ACTION_FAIL: _format_action_fail,
+    EventType.MOVE_FAIL: _format_move_fail,
+    EventType.SLOW_TURN: _format_slow_turn,
+}
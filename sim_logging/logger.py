@@ -1,42 +1,131 @@
-from collections import defaultdict
+from collections import defaultdict, deque
+from typing import Callable
 
 from config import config
 
+from .events import (
+    EVENT_CATEGORIES,
+    EVENT_LEVELS,
+    EventCategory,
+    EventLevel,
+    EventType,
+    format_event,
+)
+
 
 class Logger:
-    """Class for logging simulation events."""
+    """
+    Class for logging simulation events.
+
+    Events are kept as tuples of an EventType and a few plain values in a
+    bounded ring buffer; text is only built when the log is printed or
+    formatted. Events can be filtered by level and category, and in
+    counts-only mode only the number of events of each type is kept.
+    """
+
+    # Events kept between two prints; older ones are dropped first
+    DEFAULT_CAPACITY = 100_000
 
     def __init__(self) -> None:
-        self._messages: list[str] = []
+        self.counts_only = False
+        self._events: deque[tuple] = deque(maxlen=self.DEFAULT_CAPACITY)
+        self._counts = [0] * len(EventType)
+        self._enabled = [True] * len(EventType)
+        # Callables receiving every event, whatever the filters are
+        self._sinks: list[Callable[[tuple], None]] = []
+
+    def configure(
+        self,
+        min_level: EventLevel | None = None,
+        categories: list[str] | None = None,
+        counts_only: bool | None = None,
+        capacity: int | None = None,
+    ) -> None:
+        """
+        Set which events are recorded and how.
+
+        Args:
+            min_level: Lowest level recorded (all levels if omitted)
+            categories: EventCategory names recorded (all if omitted)
+            counts_only: Count events without keeping them
+            capacity: Maximum number of events kept in the buffer
+        """
+        min_level = min_level or EventLevel.DEBUG
+        categories = set(categories or EventCategory.all())
+        unknown = categories - set(EventCategory.all())
+        if unknown:
+            raise ValueError(f"Unknown event categories: {sorted(unknown)}")
+
+        self._enabled = [
+            EVENT_LEVELS[event_type] >= min_level
+            and EVENT_CATEGORIES[event_type] in categories
+            for event_type in EventType
+        ]
+        if counts_only is not None:
+            self.counts_only = counts_only
+        if capacity is not None:
+            self._events = deque(self._events, maxlen=capacity)
+
+    def add_sink(self, sink: Callable[[tuple], None]) -> None:
+        """Pass every future event to sink, before filtering."""
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink: Callable[[tuple], None]) -> None:
+        """Stop passing events to sink."""
+        self._sinks.remove(sink)
+
+    def log_event(self, event_type: EventType, *args) -> None:
+        """Record an event given by its type and plain values."""
+        if self._sinks:
+            event = (event_type, *args)
+            for sink in self._sinks:
+                sink(event)
+        if not self._enabled[event_type]:
+            return
+        self._counts[event_type] += 1
+        if not self.counts_only:
+            self._events.append((event_type, *args))
 
     def log(self, message: str) -> None:
-        """Add a message to the log."""
-        self._messages.append(message)
+        """Add a free-form message to the log."""
+        self.log_event(EventType.MESSAGE, message)
 
-    def _get_messages_and_clear(self) -> list[str]:
-        """Get all messages and clear the log."""
-        messages = self._messages.copy()
-        self._messages.clear()
-        return messages
+    def clear(self) -> None:
+        """Drop all buffered events without printing them."""
+        self._events.clear()
 
-    def print_game_logs(self) -> None:
-        """Group and prints all accumulated events messages."""
-        grouped = defaultdict(list)
-        logs = self._get_messages_and_clear()
+    def get_counts(self) -> dict[str, int]:
+        """Number of recorded events per type, including cleared ones."""
+        return {
+            event_type.name: self._counts[event_type]
+            for event_type in EventType
+            if self._counts[event_type]
+        }
 
-        for log in logs:
-            parts = log.split(":", 1)
-            if len(parts) == 2:
-                action_type, rest = parts
-                grouped[action_type].append(rest.strip())
-            else:
-                grouped["OTHER"].append(log)
+    def reset_counts(self) -> None:
+        """Set all event counts back to zero."""
+        self._counts = [0] * len(EventType)
 
+    def format_game_logs(self) -> list[str]:
+        """Group all buffered events as lines of text and clear the log."""
+        grouped = defaultdict(list)
+        for event in self._events:
+            group, text = format_event(event)
+            grouped[group].append(text)
+        self._events.clear()
+
+        lines = []
         for action_type, messages in grouped.items():
             action_type_print = f"{action_type}: "
             for i in range(0, len(messages), config.max_logs_per_line):
                 chunk = messages[i : i + config.max_logs_per_line]
-                print(action_type_print + ", ".join(chunk))
+                lines.append(action_type_print + ", ".join(chunk))
+        return lines
+
+    def print_game_logs(self) -> None:
+        """Group and prints all buffered events messages."""
+        for line in self.format_game_logs():
+            print(line)
         print()
 
 
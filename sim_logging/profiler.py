@@ -0,0 +1,261 @@
+import csv
+import json
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from .events import EventType
+from .logger import game_logger
+
+
+@dataclass
+class _PathSearchStats:
+    """Aggregated pathfinder calls of one strategy."""
+
+    calls: int = 0
+    seconds: float = 0.0
+    nodes_expanded: int = 0
+    path_length: int = 0
+    not_found: int = 0
+
+
+@dataclass
+class _TurnRecord:
+    """Timings collected during a single turn."""
+
+    turn: int
+    seconds: float = 0.0
+    actions: dict[str, float] = field(default_factory=dict)
+    path_calls: int = 0
+    path_seconds: float = 0.0
+    nodes_expanded: int = 0
+    path_length: int = 0
+
+
+class TurnProfiler:
+    """
+    Class for timing turns, turn actions and pathfinder calls.
+
+    Disabled by default: callers check `enabled` before taking any
+    timestamps, so a disabled profiler costs one attribute lookup per
+    turn and per pathfinder call.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.slow_turn_threshold: float | None = None
+        self.reset()
+
+    def enable(self, slow_turn_threshold: float | None = None) -> None:
+        """
+        Start collecting timings.
+
+        Args:
+            slow_turn_threshold: Turns slower than this many seconds are
+            logged and listed in the export
+        """
+        self.enabled = True
+        self.slow_turn_threshold = slow_turn_threshold
+
+    def disable(self) -> None:
+        """Stop collecting timings (collected data is kept)."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Drop all collected data."""
+        self._turns: list[_TurnRecord] = []
+        self._current: _TurnRecord | None = None
+        self._path_stats: dict[str, _PathSearchStats] = defaultdict(
+            _PathSearchStats
+        )
+        self._action_names: list[str] = []
+        self.slow_turns: list[tuple[int, float]] = []
+
+    def start_turn(self, turn: int) -> None:
+        """Open the record of a new turn."""
+        self._current = _TurnRecord(turn)
+
+    def record_action(self, name: str, seconds: float) -> None:
+        """Add the wall time of one action to the current turn."""
+        if self._current is None:
+            return
+        if name not in self._action_names:
+            self._action_names.append(name)
+        self._current.actions[name] = (
+            self._current.actions.get(name, 0.0) + seconds
+        )
+
+    def record_path_search(
+        self,
+        finder_name: str,
+        seconds: float,
+        nodes_expanded: int,
+        path: list | None,
+    ) -> None:
+        """Record one pathfinder call."""
+        stats = self._path_stats[finder_name]
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.nodes_expanded += nodes_expanded
+        if path:
+            stats.path_length += len(path) - 1
+        else:
+            stats.not_found += 1
+
+        if self._current is not None:
+            self._current.path_calls += 1
+            self._current.path_seconds += seconds
+            self._current.nodes_expanded += nodes_expanded
+            if path:
+                self._current.path_length += len(path) - 1
+
+    def end_turn(self, seconds: float) -> None:
+        """Close the current turn with its total wall time."""
+        record = self._current
+        if record is None:
+            return
+        record.seconds = seconds
+        self._turns.append(record)
+        self._current = None
+
+        if (
+            self.slow_turn_threshold is not None
+            and seconds > self.slow_turn_threshold
+        ):
+            self.slow_turns.append((record.turn, seconds))
+            slowest = max(record.actions, key=record.actions.get, default="")
+            game_logger.log_event(
+                EventType.SLOW_TURN,
+                record.turn,
+                seconds,
+                slowest,
+                record.actions.get(slowest, 0.0),
+            )
+
+    def latency_percentiles(self) -> dict[str, float]:
+        """p50/p95/p99 and max turn latency in seconds."""
+        latencies = sorted(record.seconds for record in self._turns)
+        if not latencies:
+            return {}
+        return {
+            "p50": self._percentile(latencies, 50),
+            "p95": self._percentile(latencies, 95),
+            "p99": self._percentile(latencies, 99),
+            "max": latencies[-1],
+        }
+
+    def latency_histogram(self) -> dict[str, int]:
+        """Turn counts per power-of-two bucket of microseconds."""
+        histogram: dict[int, int] = defaultdict(int)
+        for record in self._turns:
+            micros = max(1, int(record.seconds * 1_000_000))
+            histogram[2 ** math.ceil(math.log2(micros))] += 1
+        return {
+            f"<={bucket}us": histogram[bucket] for bucket in sorted(histogram)
+        }
+
+    def summary(self) -> dict:
+        """Aggregated statistics of all collected turns."""
+        turns = len(self._turns)
+        actions = {}
+        for name in self._action_names:
+            total = sum(
+                record.actions.get(name, 0.0) for record in self._turns
+            )
+            actions[name] = {
+                "total": total,
+                "mean": total / turns if turns else 0.0,
+            }
+        path_finders = {}
+        for name, stats in self._path_stats.items():
+            path_finders[name] = {
+                "calls": stats.calls,
+                "total": stats.seconds,
+                "mean": stats.seconds / stats.calls if stats.calls else 0.0,
+                "mean_nodes_expanded": (
+                    stats.nodes_expanded / stats.calls if stats.calls else 0.0
+                ),
+                "mean_path_length": (
+                    stats.path_length / (stats.calls - stats.not_found)
+                    if stats.calls > stats.not_found
+                    else 0.0
+                ),
+                "not_found": stats.not_found,
+            }
+        return {
+            "turns": turns,
+            "turn_latency": self.latency_percentiles(),
+            "turn_latency_histogram": self.latency_histogram(),
+            "actions": actions,
+            "path_finders": path_finders,
+            "slow_turns": [
+                {"turn": turn, "seconds": seconds}
+                for turn, seconds in self.slow_turns
+            ],
+        }
+
+    def format_summary(self) -> str:
+        """Short human-readable report of the collected data."""
+        summary = self.summary()
+        lines = [f"Profiled turns: {summary['turns']}"]
+        latency = summary["turn_latency"]
+        if latency:
+            lines.append(
+                "Turn latency: "
+                + ", ".join(
+                    f"{name} {seconds * 1000:.2f} ms"
+                    for name, seconds in latency.items()
+                )
+            )
+        for name, stats in summary["actions"].items():
+            lines.append(f"  {name}: mean {stats['mean'] * 1000:.2f} ms")
+        for name, stats in summary["path_finders"].items():
+            lines.append(
+                f"  {name}: {stats['calls']} calls, "
+                f"mean {stats['mean'] * 1000:.3f} ms, "
+                f"{stats['mean_nodes_expanded']:.0f} nodes expanded"
+            )
+        if summary["slow_turns"]:
+            lines.append(f"Slow turns: {len(summary['slow_turns'])}")
+        return "\n".join(lines)
+
+    def export_json(self, path: str) -> None:
+        """Write the summary as JSON."""
+        with open(path, "w", encoding="utf-8") as output:
+            json.dump(self.summary(), output, indent=2)
+
+    def export_csv(self, path: str) -> None:
+        """Write one row per turn with action and pathfinding timings."""
+        path_columns = [
+            "path_calls",
+            "path_seconds",
+            "nodes_expanded",
+            "path_length",
+        ]
+        action_names = self._action_names
+        with open(path, "w", newline="", encoding="utf-8") as output:
+            writer = csv.writer(output)
+            writer.writerow(["turn", "seconds"] + action_names + path_columns)
+            for record in self._turns:
+                actions = [
+                    record.actions.get(name, 0.0) for name in action_names
+                ]
+                writer.writerow(
+                    [record.turn, record.seconds]
+                    + actions
+                    + [
+                        record.path_calls,
+                        record.path_seconds,
+                        record.nodes_expanded,
+                        record.path_length,
+                    ]
+                )
+
+    @staticmethod
+    def _percentile(sorted_values: list[float], percent: float) -> float:
+        """Nearest-rank percentile of an already sorted list."""
+        rank = math.ceil(percent / 100 * len(sorted_values))
+        return sorted_values[max(0, rank - 1)]
+
+
+turn_profiler = TurnProfiler()
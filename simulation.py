@@ -1,34 +1,93 @@
-from time import sleep
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from time import perf_counter, sleep
+from typing import TYPE_CHECKING, Callable
 
 from actions.init import PopulateMapAction
 from actions.turn import (
     ApplyHungerAction,
     MoveCreaturesAction,
     SpawnGrassAction,
+    TwoPhaseMoveCreaturesAction,
 )
 from config import config
-from rendering import MapRenderer
+from rendering import MapRenderer, RenderLoop
+from sim_logging import game_logger, turn_profiler
+from utils import EntityType
 from utils.menu import (
     show_pause_menu,
     show_step_menu,
 )
 
 if TYPE_CHECKING:
+    from replay import EventRecorder
     from world import Map
 
 
+# Creature movement action of each config.turn_mode
+_MOVE_ACTIONS = {
+    "sequential": MoveCreaturesAction,
+    "two_phase": TwoPhaseMoveCreaturesAction,
+}
+
+# Step mode keys moving the map view by half a screen, as (dx, dy)
+_VIEW_MOVES = {"w": (0, -1), "a": (-1, 0), "s": (0, 1), "d": (1, 0)}
+
+
+@dataclass(frozen=True)
+class RunSummary:
+    """
+    Outcome of a headless simulation run. turns is the turn count at the
+    end, turns_run the turns this run stepped (fewer after a resume).
+    """
+
+    turns: int
+    turns_run: int
+    elapsed: float
+    herbivores: int
+    predators: int
+    grass: int
+    end_message: str
+
+    @property
+    def turns_per_second(self) -> float:
+        return self.turns_run / self.elapsed if self.elapsed > 0 else 0.0
+
+
 class Simulation:
-    def __init__(self, world_map: "Map") -> None:
+    def __init__(
+        self, world_map: "Map", recorder: "EventRecorder | None" = None
+    ) -> None:
         self.world_map = world_map
+        # Writes the events of the run to a binary log when set
+        self.recorder = recorder
+        if config.turn_mode not in _MOVE_ACTIONS:
+            raise ValueError(f"Turn mode {config.turn_mode} is not registered")
+        if config.render_every < 1:
+            raise ValueError("render_every must be at least 1")
         self.init_actions = [PopulateMapAction()]
         self.turn_actions = [
-            MoveCreaturesAction(),
+            _MOVE_ACTIONS[config.turn_mode](),
             ApplyHungerAction(),
             SpawnGrassAction(),
         ]
         self.turn_count = 0
+        # False until the map is populated (True for restored checkpoints)
+        self.initialized = False
         self._is_stopped = False
+        # perf_counter() time before which the next paced turn waits
+        self._next_turn_at = 0.0
+
+    def initialize(self) -> None:
+        """
+        Run the init actions that populate the map, unless it already
+        holds a populated or restored state, and start recording.
+        """
+        if not self.initialized:
+            for action in self.init_actions:
+                action.execute(self.world_map)
+            self.initialized = True
+        if self.recorder:
+            self.recorder.start(self.world_map, self.turn_count)
 
     def start_simulation(self, mode: str) -> None:
         """
@@ -38,9 +97,9 @@ class Simulation:
             mode: Simulation mode - "step" for step-by-step,
             "auto" for automatic
         """
-        for action in self.init_actions:
-            action.execute(self.world_map)
+        self.initialize()
 
+        MapRenderer.invalidate()
         MapRenderer.render_frame(self.world_map, self.turn_count)
 
         if mode == "step":
@@ -54,21 +113,106 @@ class Simulation:
         else:
             print(self._get_simulation_end_message())
 
-    def next_turn(self, with_delay: bool = True) -> None:
+    def run_headless(
+        self,
+        max_turns: int | None = None,
+        until_extinction: bool = True,
+        progress_interval: float = 1.0,
+        on_turn: Callable[["Simulation"], None] | None = None,
+    ) -> RunSummary:
+        """
+        Run the simulation without rendering, delays or menus.
+
+        Args:
+            max_turns: Maximum number of turns (None for no limit)
+            until_extinction: Stop as soon as herbivores or predators die out
+            progress_interval: Seconds between progress lines (0 disables)
+            on_turn: Called after initialization and after every turn
+        """
+        if max_turns is None and not until_extinction:
+            raise ValueError("max_turns is required without until_extinction")
+
+        self.initialize()
+        game_logger.clear()
+        game_logger.reset_counts()
+        if on_turn:
+            on_turn(self)
+
+        start = perf_counter()
+        start_turn = self.turn_count
+        next_progress = start + progress_interval
+        while max_turns is None or self.turn_count < max_turns:
+            if until_extinction and not self._is_simulation_running:
+                break
+            self.next_turn(with_delay=False, render=False)
+            game_logger.clear()
+            if on_turn:
+                on_turn(self)
+
+            if progress_interval > 0 and perf_counter() >= next_progress:
+                self._print_progress(
+                    perf_counter() - start, self.turn_count - start_turn
+                )
+                next_progress = perf_counter() + progress_interval
+
+        herbivores, predators = self.world_map.get_creatures_count()
+        return RunSummary(
+            turns=self.turn_count,
+            turns_run=self.turn_count - start_turn,
+            elapsed=perf_counter() - start,
+            herbivores=herbivores,
+            predators=predators,
+            grass=self.world_map.count_by_type(EntityType.GRASS),
+            end_message=self._get_simulation_end_message(),
+        )
+
+    def next_turn(self, with_delay: bool = True, render: bool = True) -> None:
         """
         Execute the next turn of the simulation.
 
         Args:
-            with_delay: Whether to wait for a delay before the next turn
+            with_delay: Whether to keep turns at least config.turn_delay
+                seconds apart
+            render: Whether to render the frame after the turn
         """
-        self.turn_count += 1
         if with_delay:
-            sleep(config.turn_delay)
+            self._wait_for_turn_slot()
+        self.turn_count += 1
+
+        self.world_map.begin_turn()
+        if turn_profiler.enabled:
+            self._run_profiled_turn_actions()
+        else:
+            for action in self.turn_actions:
+                action.execute(self.world_map)
+        if self.recorder:
+            self.recorder.end_turn(self.turn_count, self.world_map)
+
+        if render:
+            MapRenderer.render_frame(self.world_map, self.turn_count)
+
+    def _wait_for_turn_slot(self) -> None:
+        """
+        Sleep until config.turn_delay has passed since the previous
+        paced turn started. A turn that is already late starts at once.
+        """
+        now = perf_counter()
+        if now < self._next_turn_at:
+            sleep(self._next_turn_at - now)
+            now = self._next_turn_at
+        self._next_turn_at = now + config.turn_delay
 
+    def _run_profiled_turn_actions(self) -> None:
+        """Run the turn actions, recording their wall times."""
+        turn_profiler.start_turn(self.turn_count)
+        turn_start = perf_counter()
         for action in self.turn_actions:
+            action_start = perf_counter()
             action.execute(self.world_map)
-
-        MapRenderer.render_frame(self.world_map, self.turn_count)
+            turn_profiler.record_action(
+                type(action).__name__, perf_counter() - action_start
+            )
+        turn_profiler.end_turn(perf_counter() - turn_start)
 
     def stop(self) -> None:
         """Stop the simulation."""
@@ -77,11 +221,14 @@ class Simulation:
     @staticmethod
     def _show_step_menu() -> str:
         """Show the step mode menu and get user choice."""
+        # The menu and its input scroll the screen below the last frame
+        MapRenderer.invalidate()
         return show_step_menu()
 
     @staticmethod
     def _show_pause_menu() -> str:
         """Show the pause menu and get user choice."""
+        MapRenderer.invalidate()
         return show_pause_menu()
 
     @property
@@ -99,6 +246,14 @@ class Simulation:
             elif choice == "2":
                 self.stop()
                 break
+            elif choice in _VIEW_MOVES:
+                columns, rows = MapRenderer.get_view_size()
+                dx, dy = _VIEW_MOVES[choice]
+                MapRenderer.move_view(dx * columns // 2, dy * rows // 2)
+                MapRenderer.render_frame(self.world_map, self.turn_count)
+            elif choice == "o":
+                MapRenderer.toggle_overview()
+                MapRenderer.render_frame(self.world_map, self.turn_count)
             else:
                 print("Invalid choice. Please try again.")
 
@@ -113,11 +268,36 @@ class Simulation:
         Run the main simulation loop
         with keyboard interrupt handling for pausing.
         """
+        render_loop = (
+            RenderLoop(config.render_fps) if config.render_fps > 0 else None
+        )
+        if render_loop:
+            render_loop.start()
+        paused = False
         try:
             while self._is_running:
-                self.next_turn(with_delay=True)
+                self.next_turn(with_delay=True, render=False)
+                self._render_auto_frame(render_loop)
         except KeyboardInterrupt:
+            paused = True
+        finally:
+            if render_loop:
+                render_loop.stop()
+
+        if paused:
             self._handle_pause_menu()
+        elif render_loop or self.turn_count % config.render_every:
+            # The last turn may not have been drawn
+            MapRenderer.render_frame(self.world_map, self.turn_count)
+
+    def _render_auto_frame(self, render_loop: RenderLoop | None) -> None:
+        """Hand the finished turn to the renderer in automatic mode."""
+        if render_loop:
+            render_loop.publish(self.world_map, self.turn_count)
+        elif self.turn_count % config.render_every == 0:
+            MapRenderer.render_frame(self.world_map, self.turn_count)
+        else:
+            game_logger.clear()
 
     def _handle_pause_menu(self) -> None:
         """Handle the pause menu and user choices."""
@@ -136,6 +316,19 @@ class Simulation:
             else:
                 print("Invalid choice. Please try again.")
 
+    def _print_progress(self, elapsed: float, turns_run: int) -> None:
+        """
+        Print a one-line progress report of a headless run that stepped
+        turns_run turns in elapsed seconds.
+        """
+        herbivores, predators = self.world_map.get_creatures_count()
+        grass = self.world_map.count_by_type(EntityType.GRASS)
+        print(
+            f"[turn {self.turn_count}] herbivores={herbivores} "
+            f"predators={predators} grass={grass} "
+            f"({turns_run / elapsed:.1f} turns/sec)"
+        )
+
     @property
     def _is_simulation_running(self) -> bool:
         """
@@ -0,0 +1,31 @@
+import random
+
+from pathfinding.astar import _GoalIndex
+
+
+def _true_distance(goals: set[int], width: int, x: int, y: int) -> int:
+    return min(
+        abs(index % width - x) + abs(index // width - y) for index in goals
+    )
+
+
+def test_estimate_reviewed_counterexample():
+    width = 40
+    goals = {8 * width + 0, 24 * width + 24}
+    index = _GoalIndex(goals, width)
+    assert index.estimate(15, 15) <= _true_distance(goals, width, 15, 15)
+
+
+def test_estimate_never_overestimates():
+    rng = random.Random(0)
+    for _ in range(150):
+        width, height = rng.randint(1, 48), rng.randint(1, 48)
+        goals = {
+            rng.randrange(width * height) for _ in range(rng.randint(1, 3))
+        }
+        index = _GoalIndex(goals, width)
+        for y in range(height):
+            for x in range(width):
+                assert index.estimate(x, y) <= _true_distance(
+                    goals, width, x, y
+                )
@@ -0,0 +1,43 @@
+import random
+
+import simulation  # noqa: F401  (imports the modules in a working order)
+from entities.entity_factory import EntityFactory
+from pathfinding import AStarPathFinder, BFSPathFinder
+from utils import EntityType
+from world import MapFactory
+
+
+def _random_map(rng: random.Random, width: int, height: int):
+    world_map = MapFactory.create_map("grid", width, height)
+    rock = EntityFactory.create_entity(EntityType.ROCK)
+    for index in rng.sample(range(width * height), width * height // 4):
+        world_map.add_entity(
+            world_map.get_coord(index % width, index // width), rock
+        )
+    return world_map
+
+
+def test_sparse_search_matches_buffered_and_bfs():
+    rng = random.Random(1)
+    buffered = AStarPathFinder()
+    sparse = AStarPathFinder()
+    sparse.MAX_BUFFER_CELLS = 0
+    bfs = BFSPathFinder()
+    for _ in range(60):
+        width, height = rng.randint(2, 30), rng.randint(2, 30)
+        world_map = _random_map(rng, width, height)
+        empty = world_map.get_empty_cells()
+        if len(empty) < 2:
+            continue
+        start = rng.choice(empty)
+        targets = rng.sample(empty, min(len(empty), rng.randint(1, 4)))
+        max_distance = rng.choice([None, rng.randint(1, 12)])
+        paths = [
+            finder.find_nearest_target_path(
+                start, world_map, targets, None, max_distance
+            )
+            for finder in (buffered, sparse, bfs)
+        ]
+        lengths = [None if path is None else len(path) for path in paths]
+        assert lengths[0] == lengths[1] == lengths[2]
+        assert paths[0] == paths[1]
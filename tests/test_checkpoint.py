@@ -0,0 +1,79 @@
+import itertools
+
+import pytest
+
+import simulation  # noqa: F401  (imports the modules in a working order)
+from checkpoint import load_checkpoint, save_checkpoint
+from config import configure
+from sim_logging import game_logger
+from simulation import Simulation
+from utils import seed_random
+from world import MapFactory
+
+COMBINATIONS = list(
+    itertools.product(
+        ("dict", "grid", "chunked"),
+        ("bfs", "flow_field", "incremental_flow_field", "nearest_targets"),
+        ("sequential", "two_phase"),
+        (False, True),
+    )
+)
+
+
+@pytest.fixture(autouse=True)
+def _default_config():
+    yield
+    configure()
+    game_logger.configure(counts_only=False)
+
+
+def _state(sim: Simulation):
+    world_map = sim.world_map
+    creatures = sorted(
+        (coord.x, coord.y, creature.entity_type.code, creature.hp)
+        for coord, creature in world_map.get_creatures_with_coords().items()
+    )
+    return world_map.get_code_grid().tolist(), creatures, sim.turn_count
+
+
+def _run(overrides: dict, seed: int, turns: int) -> Simulation:
+    configure(**overrides)
+    seed_random(seed)
+    game_logger.configure(counts_only=True)
+    sim = Simulation(MapFactory.create_map())
+    sim.run_headless(
+        max_turns=turns, until_extinction=False, progress_interval=0
+    )
+    return sim
+
+
+@pytest.mark.parametrize("backend,mode,turn_mode,caching", COMBINATIONS)
+def test_round_trip_continues_like_uninterrupted_run(
+    tmp_path, backend, mode, turn_mode, caching
+):
+    overrides = dict(
+        map_width=24,
+        map_height=16,
+        map_backend=backend,
+        map_chunk_size=8,
+        initial_herbivores=20,
+        initial_predators=5,
+        path_finding_mode=mode,
+        turn_mode=turn_mode,
+        path_caching=caching,
+    )
+    uninterrupted = _run(overrides, 3, 30)
+
+    interrupted = _run(overrides, 3, 12)
+    path = str(tmp_path / "checkpoint.npz")
+    save_checkpoint(interrupted, path)
+    # The checkpoint restores the config and the random state itself
+    configure()
+    seed_random(99)
+    restored = load_checkpoint(path)
+    assert _state(restored) == _state(interrupted)
+
+    restored.run_headless(
+        max_turns=30, until_extinction=False, progress_interval=0
+    )
+    assert _state(restored) == _state(uninterrupted)
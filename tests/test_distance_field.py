@@ -0,0 +1,41 @@
+import random
+
+from pathfinding.distance_field import DistanceField
+
+
+def _rebuilt(width: int, height: int, sources: set[int], blocked: set[int]):
+    field = DistanceField(width, height)
+    field.rebuild(sources, blocked)
+    return field.distances
+
+
+def test_incremental_repair_matches_rebuild():
+    rng = random.Random(5)
+    for _ in range(40):
+        width, height = rng.randint(1, 24), rng.randint(1, 24)
+        size = width * height
+        blocked = set(rng.sample(range(size), size // 5))
+        sources = set(
+            rng.sample(sorted(set(range(size)) - blocked), min(3, size // 2))
+        )
+        field = DistanceField(width, height)
+        field.rebuild(sources, blocked)
+
+        for _ in range(30):
+            cells = rng.sample(range(size), rng.randint(1, max(1, size // 8)))
+            change = rng.randrange(4)
+            if change == 0:
+                field.add_sources(cells)
+                sources.update(cells)
+                blocked.difference_update(cells)
+            elif change == 1:
+                field.remove_sources(cells)
+                sources.difference_update(cells)
+            elif change == 2:
+                cells = [cell for cell in cells if cell not in sources]
+                field.block(cells)
+                blocked.update(cells)
+            else:
+                field.unblock(cells)
+                blocked.difference_update(cells)
+            assert field.distances == _rebuilt(width, height, sources, blocked)
@@ -0,0 +1,73 @@
+import itertools
+
+import pytest
+
+import simulation  # noqa: F401  (imports the modules in a working order)
+from config import configure
+from sim_logging import game_logger
+from simulation import Simulation
+from utils import seed_random
+from world import MapFactory
+
+COMBINATIONS = list(
+    itertools.product(
+        ("dict", "grid", "chunked"),
+        ("bfs", "flow_field", "incremental_flow_field", "nearest_targets"),
+    )
+)
+
+
+@pytest.fixture(autouse=True)
+def _default_config():
+    yield
+    configure()
+    game_logger.configure(counts_only=False)
+
+
+def _run(
+    backend: str,
+    mode: str,
+    seed: int,
+    batch_size: int = 256,
+    reverse: bool = False,
+):
+    configure(
+        map_width=40,
+        map_height=30,
+        map_backend=backend,
+        map_chunk_size=16,
+        initial_herbivores=60,
+        initial_predators=12,
+        path_finding_mode=mode,
+        turn_mode="two_phase",
+        intent_batch_size=batch_size,
+    )
+    seed_random(seed)
+    game_logger.configure(counts_only=True)
+    world_map = MapFactory.create_map()
+    if reverse:
+        # List the creatures in the opposite order to the map's own
+        listed = world_map.get_creatures_with_coords
+        world_map.get_creatures_with_coords = lambda: dict(
+            reversed(listed().items())
+        )
+    sim = Simulation(world_map)
+    sim.run_headless(
+        max_turns=25, until_extinction=False, progress_interval=0
+    )
+    creatures = sorted(
+        (coord.x, coord.y, creature.entity_type.code, creature.hp)
+        for coord, creature in world_map.get_creatures_with_coords().items()
+    )
+    return world_map.get_code_grid().tolist(), creatures
+
+
+@pytest.mark.parametrize("backend,mode", COMBINATIONS)
+def test_same_seed_runs_are_identical(backend, mode):
+    assert _run(backend, mode, 1) == _run(backend, mode, 1)
+
+
+@pytest.mark.parametrize("backend,mode", COMBINATIONS)
+def test_outcome_does_not_depend_on_creature_order(backend, mode):
+    expected = _run(backend, mode, 2)
+    assert _run(backend, mode, 2, batch_size=7, reverse=True) == expected
@@ -1,8 +1,19 @@
-from .enums import Direction, EntityType
-from .helpers import calculate_entity_counts
+from .enums import EMPTY_CELL_CODE, Direction, EntityType
+from .helpers import (
+    calculate_entity_counts,
+    get_numpy_rng,
+    get_random_state,
+    seed_random,
+    set_random_state,
+)
 
 __all__ = [
     "calculate_entity_counts",
+    "EMPTY_CELL_CODE",
     "EntityType",
     "Direction",
+    "get_numpy_rng",
+    "get_random_state",
+    "seed_random",
+    "set_random_state",
 ]
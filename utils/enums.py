@@ -26,6 +26,27 @@ class EntityType(Enum):
         """Returns types of resources."""
         return [cls.GRASS]
 
+    @property
+    def code(self) -> int:
+        """Returns the integer code used by array-based storage."""
+        return _ENTITY_TYPE_CODES[self]
+
+    @classmethod
+    def from_code(cls, code: int) -> "EntityType":
+        """Returns the entity type for an integer storage code."""
+        return _ENTITY_TYPES_BY_CODE[code]
+
+
+# Code 0 is reserved for empty cells
+EMPTY_CELL_CODE = 0
+_ENTITY_TYPE_CODES = {
+    entity_type: code for code, entity_type in enumerate(EntityType, start=1)
+}
+_ENTITY_TYPES_BY_CODE = {
+    code: entity_type for entity_type, code in _ENTITY_TYPE_CODES.items()
+}
+
+
 @unique
 class Direction(Enum):
     """Movement directions."""
@@ -1,5 +1,12 @@
+import random
+
+import numpy as np
+
 from config import config
 
+# Generator for vectorized sampling, reseeded by seed_random
+_numpy_rng = np.random.default_rng()
+
 
 def calculate_entity_counts(
     width: int, height: int
@@ -11,3 +18,34 @@ def calculate_entity_counts(
     tree_count = int(total_cells * config.initial_tree_percent)
 
     return grass_count, rock_count, tree_count
+
+
+def get_numpy_rng() -> np.random.Generator:
+    """Returns the NumPy generator used for vectorized sampling."""
+    return _numpy_rng
+
+
+def seed_random(seed: int) -> None:
+    """Seeds every random number generator used by the simulation."""
+    global _numpy_rng
+    random.seed(seed)
+    _numpy_rng = np.random.default_rng(seed)
+
+
+def get_random_state() -> dict:
+    """
+    Returns the state of every random number generator as plain
+    JSON-serializable values.
+    """
+    version, internal_state, gauss_next = random.getstate()
+    return {
+        "python": [version, list(internal_state), gauss_next],
+        "numpy": _numpy_rng.bit_generator.state,
+    }
+
+
+def set_random_state(state: dict) -> None:
+    """Restores generator states returned by get_random_state."""
+    version, internal_state, gauss_next = state["python"]
+    random.setstate((version, tuple(internal_state), gauss_next))
+    _numpy_rng.bit_generator.state = state["numpy"]
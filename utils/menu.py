@@ -23,6 +23,8 @@ def show_step_menu() -> str:
     options = {
         "1": "Next turn (press Enter)",
         "2": "Stop simulation",
+        "w/a/s/d": "Move the view of a map larger than the terminal",
+        "o": "Switch between the view and the overview",
     }
     return show_menu("Select action:", options, "> ")
 
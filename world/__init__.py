@@ -1,4 +1,19 @@
+from .block_counts import BlockCounts
+from .chunked_map import ChunkedMap
 from .coordinate import Coordinate
+from .creature_store import CreatureStore
+from .grid_map import GridMap
 from .map import Map
+from .map_change import MapChange
+from .map_factory import MapFactory
 
-__all__ = ["Coordinate", "Map"]
+__all__ = [
+    "BlockCounts",
+    "ChunkedMap",
+    "Coordinate",
+    "CreatureStore",
+    "Map",
+    "MapChange",
+    "GridMap",
+    "MapFactory",
+]
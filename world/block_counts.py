@@ -0,0 +1,115 @@
+import numpy as np
+
+from utils import EMPTY_CELL_CODE, EntityType
+
+
+class BlockCounts:
+    """
+    Number of entities of each type in square blocks of map cells.
+
+    The map is cut into block_size x block_size blocks (smaller at the
+    right and bottom edges). counts[code, by, bx] is the number of
+    entities with that EntityType code in block (bx, by); row
+    EMPTY_CELL_CODE stays zero. The map keeps the counts up to date as
+    entities are added, removed and moved, so zoomed-out views can be
+    drawn without reading every cell.
+
+    dirty[by, bx] is True for the blocks where an entity was added,
+    removed or moved since the last clear_dirty().
+    """
+
+    def __init__(self, width: int, height: int, block_size: int) -> None:
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.block_size = block_size
+        self.shape = (-(-height // block_size), -(-width // block_size))
+        self.counts = np.zeros((len(EntityType) + 1, *self.shape), np.int32)
+        # Number of map cells in each block
+        rows = np.minimum(
+            block_size, height - np.arange(self.shape[0]) * block_size
+        )
+        columns = np.minimum(
+            block_size, width - np.arange(self.shape[1]) * block_size
+        )
+        self.areas = np.outer(rows, columns).astype(np.int32)
+        self.dirty = np.zeros(self.shape, bool)
+
+    @classmethod
+    def from_code_grid(
+        cls, grid: np.ndarray, block_size: int
+    ) -> "BlockCounts":
+        """Count the entities of an int8 (height, width) code grid."""
+        height, width = grid.shape
+        block_counts = cls(width, height, block_size)
+        ys, xs = np.nonzero(grid != EMPTY_CELL_CODE)
+        block_counts.add_many(grid[ys, xs], xs, ys)
+        return block_counts
+
+    def add(self, entity_type: EntityType, x: int, y: int) -> None:
+        """Count an entity placed on a cell."""
+        size = self.block_size
+        block_y, block_x = y // size, x // size
+        self.counts[entity_type.code, block_y, block_x] += 1
+        self.dirty[block_y, block_x] = True
+
+    def remove(self, entity_type: EntityType, x: int, y: int) -> None:
+        """Stop counting an entity removed from a cell."""
+        size = self.block_size
+        block_y, block_x = y // size, x // size
+        self.counts[entity_type.code, block_y, block_x] -= 1
+        self.dirty[block_y, block_x] = True
+
+    def move(
+        self, entity_type: EntityType, x: int, y: int, to_x: int, to_y: int
+    ) -> None:
+        """Update the counts after an entity moved."""
+        size = self.block_size
+        block_y, block_x = y // size, x // size
+        to_block_y, to_block_x = to_y // size, to_x // size
+        self.dirty[block_y, block_x] = True
+        if block_y == to_block_y and block_x == to_block_x:
+            return
+        self.dirty[to_block_y, to_block_x] = True
+        code = entity_type.code
+        self.counts[code, block_y, block_x] -= 1
+        self.counts[code, to_block_y, to_block_x] += 1
+
+    def add_many(self, codes, xs, ys) -> None:
+        """Count entities placed on many cells, given as parallel arrays."""
+        codes = np.asarray(codes, dtype=np.intp)
+        if not len(codes):
+            return
+        size = self.block_size
+        blocks = (
+            np.asarray(ys, dtype=np.intp) // size * self.shape[1]
+            + np.asarray(xs, dtype=np.intp) // size
+        )
+        self.dirty.reshape(-1)[blocks] = True
+        self.counts.reshape(-1)[:] += np.bincount(
+            codes * self.dirty.size + blocks, minlength=self.counts.size
+        ).astype(np.int32)
+
+    def clear_dirty(self) -> None:
+        """Mark every block as unchanged."""
+        self.dirty.fill(False)
+
+    def downsample(self, factor: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Merge factor x factor groups of blocks.
+
+        Returns:
+            The merged counts and the number of cells of every merged
+            block
+        """
+        block_rows, block_columns = self.shape
+        rows = -(-block_rows // factor)
+        columns = -(-block_columns // factor)
+        pad = (
+            (0, rows * factor - block_rows),
+            (0, columns * factor - block_columns),
+        )
+        counts = np.pad(self.counts, ((0, 0), *pad))
+        areas = np.pad(self.areas, pad)
+        counts = counts.reshape(-1, rows, factor, columns, factor)
+        areas = areas.reshape(rows, factor, columns, factor)
+        return counts.sum(axis=(2, 4)), areas.sum(axis=(1, 3))
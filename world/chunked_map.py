@@ -0,0 +1,493 @@
+import numpy as np
+
+from config import config
+from entities.base.entity import Entity
+from utils import EMPTY_CELL_CODE, EntityType
+
+from .coordinate import Coordinate
+from .map import Map
+
+
+class ChunkedMap(Map):
+    """
+    Map backend for very large, mostly empty worlds.
+
+    Occupancy is stored as square tiles (chunks) of EntityType codes,
+    config.map_chunk_size cells on a side. A chunk holding a few
+    entities keeps their codes in a dict by cell; above
+    SPARSE_CHUNK_SHARE of its cells it becomes a dense int8 array, and
+    back when it falls to half that. A chunk is dropped when it is
+    empty again, so memory follows the occupied cells rather than the
+    map area. The block counts use chunk-sized blocks and double as
+    per-chunk type counts: scans for a type only visit the chunks that
+    hold it.
+
+    Static entities are shared prototypes and creatures live in the side
+    table, as in GridMap. Grass and creatures change every turn and are
+    queried by every creature, so their coordinates are kept in sets;
+    rocks and trees are read from the chunks when asked for. Shared
+    coordinates are interned in a dict, pruned at the start of a turn
+    to the cells of the chunks in use once it has doubled in size.
+    """
+
+    _indexed_types = (EntityType.GRASS, *EntityType.creatures())
+    # Share of the cells of a chunk above which it is stored densely
+    SPARSE_CHUNK_SHARE = 1 / 128
+
+    def __init__(
+        self, width: int | None = None, height: int | None = None
+    ) -> None:
+        self.chunk_size = config.map_chunk_size
+        super().__init__(width, height)
+        # Dense chunks by (chunk x, chunk y), indexed as [y, x]
+        self._chunks: dict[tuple[int, int], np.ndarray] = {}
+        # Sparse chunks by (chunk x, chunk y): codes by the cell index
+        # y * chunk_size + x inside the chunk
+        self._sparse_chunks: dict[tuple[int, int], dict[int, int]] = {}
+        self._sparse_limit = int(
+            self.chunk_size * self.chunk_size * self.SPARSE_CHUNK_SHARE
+        )
+        # Interned coordinates left after the last pruning
+        self._cells_kept = 0
+        # Entity returned for a static cell, indexed by type code
+        self._prototypes = np.full(len(EntityType) + 1, None, dtype=object)
+        self._creature_codes = np.array(
+            [entity_type.code for entity_type in EntityType.creatures()],
+            dtype=np.int8,
+        )
+
+    @property
+    def chunk_count(self) -> int:
+        """Number of chunks currently in use, dense or sparse."""
+        return len(self._chunks) + len(self._sparse_chunks)
+
+    @property
+    def dense_chunk_count(self) -> int:
+        """Number of chunks currently stored as dense arrays."""
+        return len(self._chunks)
+
+    def begin_turn(self) -> None:
+        """Start a new turn, pruning the interned coordinates if needed."""
+        super().begin_turn()
+        if len(self._cells) > 2 * self._cells_kept + 4096:
+            self._prune_cells()
+
+    def add_entity(self, coord: Coordinate, entity: Entity) -> None:
+        """Add an entity to the specified coordinate."""
+        if not self.is_cell_empty(coord.x, coord.y):
+            self.remove_entity(coord)
+        code = entity.entity_type.code
+        self._set_code(coord.x, coord.y, code)
+        if (
+            entity.entity_type not in EntityType.creatures()
+            and self._prototypes[code] is None
+        ):
+            self._prototypes[code] = entity
+        self._index_add(coord, entity)
+        size = self.chunk_size
+        self._update_chunk(coord.x // size, coord.y // size)
+
+    def add_entities(
+        self, coords: list[Coordinate], entities: list[Entity]
+    ) -> None:
+        """
+        Add entities to empty cells in bulk.
+        The caller must ensure every cell in coords is empty.
+        """
+        if not coords:
+            return
+        creature_types = EntityType.creatures()
+        size = self.chunk_size
+        for coord, entity in zip(coords, entities):
+            code = entity.entity_type.code
+            if (
+                self._prototypes[code] is None
+                and entity.entity_type not in creature_types
+            ):
+                self._prototypes[code] = entity
+            self._set_code(coord.x, coord.y, code)
+        self._index_add_many(coords, entities)
+        for chunk_x, chunk_y in {
+            (coord.x // size, coord.y // size) for coord in coords
+        }:
+            self._update_chunk(chunk_x, chunk_y)
+
+    def add_static_entities(self, entity: Entity, indexes: np.ndarray) -> None:
+        """
+        Place one shared static entity on many empty cells, given by
+        their flat y * width + x indexes.
+        The caller must ensure every cell is empty.
+        """
+        code = entity.entity_type.code
+        if self._prototypes[code] is None:
+            self._prototypes[code] = entity
+        indexes = np.asarray(indexes, dtype=np.int64)
+        size = self.chunk_size
+        chunk_columns = self.block_counts.shape[1]
+        xs, ys = indexes % self.width, indexes // self.width
+        keys = (ys // size) * chunk_columns + xs // size
+        order = np.argsort(keys, kind="stable")
+        keys, xs, ys = keys[order], xs[order], ys[order]
+        # Cells are written one chunk at a time, in runs of equal keys
+        bounds = np.append(
+            np.flatnonzero(np.diff(keys, prepend=-1)), len(keys)
+        ).tolist()
+        counts = self.block_counts.counts
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            chunk_y, chunk_x = divmod(int(keys[start]), chunk_columns)
+            local_ys = ys[start:end] - chunk_y * size
+            local_xs = xs[start:end] - chunk_x * size
+            filled = int(counts[:, chunk_y, chunk_x].sum()) + end - start
+            if filled > self._sparse_limit:
+                chunk = self._dense_chunk(chunk_x, chunk_y)
+                chunk[local_ys, local_xs] = code
+            else:
+                self._sparse_chunks.setdefault((chunk_x, chunk_y), {}).update(
+                    dict.fromkeys((local_ys * size + local_xs).tolist(), code)
+                )
+        self._index_static_entities(entity, indexes)
+
+    def remove_entity(self, coord: Coordinate) -> Entity | None:
+        """Remove an entity from the specified coordinate and return it."""
+        entity = self.get_entity(coord)
+        if entity is not None:
+            size = self.chunk_size
+            self._set_code(coord.x, coord.y, EMPTY_CELL_CODE)
+            self._index_remove(coord, entity)
+            self._update_chunk(coord.x // size, coord.y // size)
+        return entity
+
+    def get_entity(self, coord: Coordinate) -> Entity | None:
+        """Get the entity at the specified coordinate."""
+        if not self.is_valid_coord(coord.x, coord.y):
+            return None
+        code = self._get_code(coord.x, coord.y)
+        if code == EMPTY_CELL_CODE:
+            return None
+        creature = self._creatures.get(coord)
+        if creature is not None:
+            return creature
+        return self._prototypes[code]
+
+    def get_entity_by_type(self, entity_type: "EntityType") -> list[Entity]:
+        """Get all entities of the specified type."""
+        if entity_type in self._coords_by_type:
+            return [
+                self.get_entity(coord)
+                for coord in self._coords_by_type[entity_type]
+            ]
+        prototype = self._prototypes[entity_type.code]
+        return [prototype] * self.count_by_type(entity_type)
+
+    def get_all_entities_with_coords(self) -> dict[Coordinate, Entity]:
+        """
+        Returns a dictionary with all entities and their coordinates.
+        """
+        return {
+            coord: self.get_entity(coord)
+            for entity_type in EntityType
+            for coord in self.get_coords_by_type(entity_type)
+        }
+
+    def is_cell_empty(self, x: int, y: int) -> bool:
+        """Check if the cell is empty."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return True
+        return self._get_code(x, y) == EMPTY_CELL_CODE
+
+    def get_empty_cells(self) -> list[Coordinate]:
+        """Get all empty cells, ordered by column and then by row."""
+        xs, ys = np.nonzero(self.get_empty_mask().T)
+        return [
+            self.get_coord(x, y) for x, y in zip(xs.tolist(), ys.tolist())
+        ]
+
+    def get_row(self, y: int) -> list[Entity | None]:
+        """Get the entities of a single map row (None for empty cells)."""
+        codes = self.get_code_window(0, y, self.width, 1)[0]
+        row = self._prototypes[codes].tolist()
+        for x in np.flatnonzero(np.isin(codes, self._creature_codes)).tolist():
+            row[x] = self._creatures[self.get_coord(x, y)]
+        return row
+
+    def index_to_coord(self, index: int) -> Coordinate:
+        """Convert a flat y * width + x cell index to a coordinate."""
+        coord = self._cells.get(index)
+        if coord is None:
+            coord = Coordinate(index % self.width, index // self.width)
+            self._cells[index] = coord
+        return coord
+
+    def get_coords(self, indexes: np.ndarray) -> list[Coordinate]:
+        """Convert an array of flat cell indexes to coordinates."""
+        cells = self._cells
+        width = self.width
+        coords = []
+        for index in indexes.tolist():
+            coord = cells.get(index)
+            if coord is None:
+                coord = Coordinate(index % width, index // width)
+                cells[index] = coord
+            coords.append(coord)
+        return coords
+
+    def get_occupied_indexes(self) -> np.ndarray:
+        """
+        Sorted flat y * width + x indexes of the occupied cells, read
+        from the chunks in use only.
+        """
+        width = self.width
+        parts = [np.empty(0, dtype=np.int64)]
+        for x, y, codes in self.get_code_tiles():
+            ys, xs = np.nonzero(codes != EMPTY_CELL_CODE)
+            parts.append((ys + y) * width + xs + x)
+        return np.sort(np.concatenate(parts))
+
+    def get_blocked_mask(self) -> bytearray:
+        """
+        Get a flat occupancy mask indexed by y * width + x,
+        where 1 marks an occupied cell and 0 an empty one.
+        """
+        mask = bytearray(self.width * self.height)
+        cells = np.frombuffer(mask, dtype=np.uint8).reshape(
+            self.height, self.width
+        )
+        for x, y, codes in self.get_code_tiles():
+            rows, columns = codes.shape
+            cells[y : y + rows, x : x + columns] = codes != EMPTY_CELL_CODE
+        del cells
+        return mask
+
+    def get_empty_mask(self) -> np.ndarray:
+        """Get a boolean (height, width) array, True for empty cells."""
+        empty = np.ones((self.height, self.width), dtype=bool)
+        for x, y, codes in self.get_code_tiles():
+            rows, columns = codes.shape
+            empty[y : y + rows, x : x + columns] = codes == EMPTY_CELL_CODE
+        return empty
+
+    def get_code_grid(self) -> np.ndarray:
+        """
+        Get a new int8 (height, width) array of EntityType codes,
+        with EMPTY_CELL_CODE for empty cells.
+        """
+        return self.get_code_window(0, 0, self.width, self.height)
+
+    def get_code_tiles(self) -> list[tuple[int, int, np.ndarray]]:
+        """
+        Get (x, y, codes) for rectangles of cells that together hold
+        every entity; here read-only views of the dense chunks and one
+        cell for each entity of a sparse chunk.
+        """
+        size = self.chunk_size
+        tiles = []
+        for (chunk_x, chunk_y), chunk in self._chunks.items():
+            view = chunk.view()
+            view.flags.writeable = False
+            tiles.append((chunk_x * size, chunk_y * size, view))
+        for (chunk_x, chunk_y), cells in self._sparse_chunks.items():
+            for index, code in cells.items():
+                tiles.append(
+                    (
+                        chunk_x * size + index % size,
+                        chunk_y * size + index // size,
+                        np.full((1, 1), code, dtype=np.int8),
+                    )
+                )
+        return tiles
+
+    def get_code_window(
+        self, x: int, y: int, width: int, height: int
+    ) -> np.ndarray:
+        """
+        Get the int8 (height, width) array of EntityType codes of the
+        cells from (x, y) to (x + width - 1, y + height - 1).
+        """
+        window = np.full((height, width), EMPTY_CELL_CODE, dtype=np.int8)
+        size = self.chunk_size
+        for (chunk_x, chunk_y), cells in self._overlapping_chunks(
+            self._sparse_chunks, x, y, width, height
+        ):
+            left, top = chunk_x * size, chunk_y * size
+            for index, code in cells.items():
+                cell_x, cell_y = left + index % size, top + index // size
+                if x <= cell_x < x + width and y <= cell_y < y + height:
+                    window[cell_y - y, cell_x - x] = code
+        for (chunk_x, chunk_y), chunk in self._overlapping_chunks(
+            self._chunks, x, y, width, height
+        ):
+            left, top = chunk_x * size, chunk_y * size
+            rows, columns = chunk.shape
+            x0, x1 = max(x, left), min(x + width, left + columns)
+            y0, y1 = max(y, top), min(y + height, top + rows)
+            window[y0 - y : y1 - y, x0 - x : x1 - x] = chunk[
+                y0 - top : y1 - top, x0 - left : x1 - left
+            ]
+        return window
+
+    def move_entity(
+        self, current_coord: Coordinate, target_coord: Coordinate
+    ) -> None:
+        """
+        Move an entity from one coordinate to another.
+        Preconditions are the same as for Map.move_entity.
+        """
+        entity_to_move = self.get_entity(current_coord)
+        if entity_to_move is None:
+            raise ValueError(
+                f"No entity at {current_coord} to move"
+            )
+
+        if not self.is_cell_empty(target_coord.x, target_coord.y):
+            raise ValueError(
+                f"Target cell {target_coord} is not empty"
+            )
+
+        size = self.chunk_size
+        self._set_code(
+            target_coord.x,
+            target_coord.y,
+            self._get_code(current_coord.x, current_coord.y),
+        )
+        self._set_code(current_coord.x, current_coord.y, EMPTY_CELL_CODE)
+        self._index_move(current_coord, target_coord, entity_to_move)
+        self._update_chunk(current_coord.x // size, current_coord.y // size)
+        self._update_chunk(target_coord.x // size, target_coord.y // size)
+
+    def _create_cell_cache(self) -> dict[int, Coordinate]:
+        """Storage of the shared coordinates, keyed by flat cell index."""
+        return {}
+
+    def _get_count_block_size(self) -> int:
+        """Side of the blocks of cells counted in block_counts."""
+        return self.chunk_size
+
+    def _get_code(self, x: int, y: int) -> int:
+        """Code of a cell inside the map."""
+        size = self.chunk_size
+        key = (x // size, y // size)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            return chunk[y % size, x % size]
+        cells = self._sparse_chunks.get(key)
+        if cells is None:
+            return EMPTY_CELL_CODE
+        return cells.get((y % size) * size + x % size, EMPTY_CELL_CODE)
+
+    def _set_code(self, x: int, y: int, code: int) -> None:
+        """
+        Write the code of a cell in its chunk, kept in the form it has;
+        _update_chunk adapts the form once the indexes are updated.
+        """
+        size = self.chunk_size
+        key = (x // size, y // size)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            chunk[y % size, x % size] = code
+            return
+        cells = self._sparse_chunks.setdefault(key, {})
+        if code == EMPTY_CELL_CODE:
+            cells.pop((y % size) * size + x % size, None)
+        else:
+            cells[(y % size) * size + x % size] = code
+
+    def _dense_chunk(self, chunk_x: int, chunk_y: int) -> np.ndarray:
+        """Get a chunk as a dense array, converting or allocating it."""
+        key = (chunk_x, chunk_y)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            size = self.chunk_size
+            shape = (
+                min(size, self.height - chunk_y * size),
+                min(size, self.width - chunk_x * size),
+            )
+            chunk = np.full(shape, EMPTY_CELL_CODE, dtype=np.int8)
+            for index, code in self._sparse_chunks.pop(key, {}).items():
+                chunk[index // size, index % size] = code
+            self._chunks[key] = chunk
+        return chunk
+
+    def _update_chunk(self, chunk_x: int, chunk_y: int) -> None:
+        """
+        Drop a chunk once no entity is counted in it, and switch its
+        form when its count crosses the sparse limits.
+        """
+        key = (chunk_x, chunk_y)
+        count = int(self.block_counts.counts[:, chunk_y, chunk_x].sum())
+        if count == 0:
+            self._chunks.pop(key, None)
+            self._sparse_chunks.pop(key, None)
+        elif count > self._sparse_limit:
+            if key in self._sparse_chunks:
+                self._dense_chunk(chunk_x, chunk_y)
+        elif count <= self._sparse_limit // 2 and key in self._chunks:
+            chunk = self._chunks.pop(key)
+            ys, xs = np.nonzero(chunk != EMPTY_CELL_CODE)
+            self._sparse_chunks[key] = dict(
+                zip(
+                    (ys * self.chunk_size + xs).tolist(),
+                    chunk[ys, xs].tolist(),
+                )
+            )
+
+    def _prune_cells(self) -> None:
+        """Keep only the interned coordinates of chunks in use."""
+        size = self.chunk_size
+        width = self.width
+        used = self._chunks.keys() | self._sparse_chunks.keys()
+        self._cells = {
+            index: coord
+            for index, coord in self._cells.items()
+            if (index % width // size, index // width // size) in used
+        }
+        self._cells_kept = len(self._cells)
+
+    def _overlapping_chunks(
+        self, chunks: dict, x: int, y: int, width: int, height: int
+    ) -> list[tuple[tuple[int, int], object]]:
+        """Items of chunks (dense or sparse) overlapping a rectangle."""
+        size = self.chunk_size
+        chunk_x0, chunk_y0 = x // size, y // size
+        chunk_x1 = (x + width - 1) // size
+        chunk_y1 = (y + height - 1) // size
+        # A large rectangle is cheaper to match against the chunks in use
+        # than to enumerate
+        if (chunk_x1 - chunk_x0 + 1) * (chunk_y1 - chunk_y0 + 1) > len(
+            chunks
+        ):
+            return [
+                (key, chunk)
+                for key, chunk in chunks.items()
+                if chunk_x0 <= key[0] <= chunk_x1
+                and chunk_y0 <= key[1] <= chunk_y1
+            ]
+        return [
+            ((chunk_x, chunk_y), chunks[(chunk_x, chunk_y)])
+            for chunk_y in range(chunk_y0, chunk_y1 + 1)
+            for chunk_x in range(chunk_x0, chunk_x1 + 1)
+            if (chunk_x, chunk_y) in chunks
+        ]
+
+    def _find_cells(self, code: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        x and y arrays of the cells holding a type code, looking only at
+        the chunks whose counts include it.
+        """
+        size = self.chunk_size
+        xs_parts = [np.empty(0, dtype=np.intp)]
+        ys_parts = [np.empty(0, dtype=np.intp)]
+        chunk_ys, chunk_xs = np.nonzero(self.block_counts.counts[code])
+        for chunk_x, chunk_y in zip(chunk_xs.tolist(), chunk_ys.tolist()):
+            chunk = self._chunks.get((chunk_x, chunk_y))
+            if chunk is None:
+                cells = self._sparse_chunks[(chunk_x, chunk_y)]
+                indexes = np.array(
+                    [index for index, value in cells.items() if value == code],
+                    dtype=np.intp,
+                )
+                ys, xs = np.divmod(indexes, size)
+            else:
+                ys, xs = np.nonzero(chunk == code)
+            xs_parts.append(xs + chunk_x * size)
+            ys_parts.append(ys + chunk_y * size)
+        return np.concatenate(xs_parts), np.concatenate(ys_parts)
@@ -1,13 +1,34 @@
 class Coordinate:
-    """Represents coordinate point on the game map."""
+    """
+    Represents coordinate point on the game map.
+
+    Coordinates are immutable and slotted, and their hash is computed
+    once. Map hands out one shared instance per cell (Map.get_coord), so
+    the hot paths compare coordinates by identity and rarely allocate.
+    """
+
+    __slots__ = ("x", "y", "_hash")
+
     def __init__(self, x: int, y: int) -> None:
-        self.x = x
-        self.y = y
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+        object.__setattr__(self, "_hash", hash((x, y)))
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("Coordinate is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Coordinate is immutable")
+
+    def __reduce__(self) -> tuple:
+        return Coordinate, (self.x, self.y)
 
     def __hash__(self) -> int:
-        return hash((self.x, self.y))
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         return (
             isinstance(other, Coordinate)
             and self.x == other.x
@@ -16,3 +37,6 @@ class Coordinate:
 
     def __str__(self) -> str:
         return f"({self.x}, {self.y})"
+
+    def __repr__(self) -> str:
+        return f"Coordinate({self.x}, {self.y})"
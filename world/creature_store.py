@@ -0,0 +1,108 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from utils import EMPTY_CELL_CODE
+
+from .coordinate import Coordinate
+
+if TYPE_CHECKING:
+    from entities.base import Creature
+
+
+class CreatureStore:
+    """
+    Struct-of-arrays storage for the creatures placed on a map.
+
+    HP, max HP, speed, type code and position of every creature live in
+    contiguous NumPy arrays indexed by creature id. A Creature on the map
+    is a thin view that reads and writes its slot, so per-turn sweeps
+    such as hunger are single array operations. Ids of removed creatures
+    are reused and the arrays only grow, doubling when full.
+    """
+
+    # Per-creature arrays, resized together
+    _FIELDS = ("hp", "max_hp", "speed", "type_code", "x", "y", "active")
+
+    def __init__(self, capacity: int = 64) -> None:
+        self._capacity = 0
+        self.hp = np.zeros(0, dtype=np.float64)
+        self.max_hp = np.zeros(0, dtype=np.float64)
+        self.speed = np.zeros(0, dtype=np.int32)
+        self.type_code = np.zeros(0, dtype=np.int8)
+        self.x = np.zeros(0, dtype=np.int32)
+        self.y = np.zeros(0, dtype=np.int32)
+        # True for slots holding a creature that is on the map
+        self.active = np.zeros(0, dtype=bool)
+        self._creatures: list["Creature | None"] = []
+        self._free_ids: list[int] = []
+        self._count = 0
+        self._grow(capacity)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, creature: "Creature", coord: Coordinate) -> None:
+        """Copy a creature into a free slot and bind it to the store."""
+        if not self._free_ids:
+            self._grow(self._capacity * 2)
+        creature_id = self._free_ids.pop()
+
+        self.hp[creature_id] = creature.hp
+        self.max_hp[creature_id] = creature.max_hp
+        self.speed[creature_id] = creature.speed
+        self.type_code[creature_id] = creature.entity_type.code
+        self.x[creature_id] = coord.x
+        self.y[creature_id] = coord.y
+        self.active[creature_id] = True
+        self._creatures[creature_id] = creature
+        self._count += 1
+        creature.bind_store(self, creature_id)
+
+    def remove(self, creature: "Creature") -> None:
+        """Free the slot of a creature, which keeps its last values."""
+        creature_id = creature.creature_id
+        creature.unbind_store()
+        self.active[creature_id] = False
+        self.type_code[creature_id] = EMPTY_CELL_CODE
+        self._creatures[creature_id] = None
+        self._free_ids.append(creature_id)
+        self._count -= 1
+
+    def move(self, creature: "Creature", coord: Coordinate) -> None:
+        """Update the stored position of a creature."""
+        creature_id = creature.creature_id
+        self.x[creature_id] = coord.x
+        self.y[creature_id] = coord.y
+
+    def get(self, creature_id: int) -> "Creature | None":
+        """Get the creature bound to an id."""
+        return self._creatures[creature_id]
+
+    def get_coord(self, creature_id: int) -> Coordinate:
+        """Get the stored position of a creature."""
+        return Coordinate(int(self.x[creature_id]), int(self.y[creature_id]))
+
+    def damage_all(self, amount: float) -> np.ndarray:
+        """
+        Subtract amount from the HP of every creature.
+
+        Returns:
+            Ids of the creatures left with no HP, in ascending order
+        """
+        active = self.active
+        self.hp[active] -= amount
+        return np.flatnonzero(active & (self.hp <= 0))
+
+    def _grow(self, capacity: int) -> None:
+        """Resize every array to capacity and register the new ids."""
+        old_capacity = self._capacity
+        for name in self._FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:old_capacity] = old
+            setattr(self, name, new)
+        self._creatures.extend([None] * (capacity - old_capacity))
+        # Lowest ids are handed out first
+        self._free_ids.extend(range(capacity - 1, old_capacity - 1, -1))
+        self._capacity = capacity
@@ -0,0 +1,230 @@
+import numpy as np
+
+from entities.base.entity import Entity
+from utils import EMPTY_CELL_CODE, EntityType
+
+from .coordinate import Coordinate
+from .map import Map
+
+
+class GridMap(Map):
+    """
+    Map backend storing occupancy as a dense array of EntityType codes.
+
+    Static entities are stateless, so one prototype instance per type is
+    kept and returned for every cell of that type. Creatures live in the
+    side table inherited from Map (_creatures). Rocks and trees are not
+    kept in coordinate sets; their cells are read from the array.
+    """
+
+    _indexed_types = (EntityType.GRASS, *EntityType.creatures())
+
+    def __init__(
+        self, width: int | None = None, height: int | None = None
+    ) -> None:
+        super().__init__(width, height)
+        self._grid = np.full(
+            (self.height, self.width), EMPTY_CELL_CODE, dtype=np.int8
+        )
+        # Entity returned for a static cell, indexed by type code
+        self._prototypes = np.full(len(EntityType) + 1, None, dtype=object)
+        self._creature_codes = np.array(
+            [entity_type.code for entity_type in EntityType.creatures()],
+            dtype=np.int8,
+        )
+
+    @property
+    def grid(self) -> np.ndarray:
+        """Read-only view of the occupancy array, indexed as [y, x]."""
+        view = self._grid.view()
+        view.flags.writeable = False
+        return view
+
+    def add_entity(self, coord: Coordinate, entity: Entity) -> None:
+        """Add an entity to the specified coordinate."""
+        if self._grid[coord.y, coord.x] != EMPTY_CELL_CODE:
+            self.remove_entity(coord)
+        code = entity.entity_type.code
+        self._grid[coord.y, coord.x] = code
+        if (
+            entity.entity_type not in EntityType.creatures()
+            and self._prototypes[code] is None
+        ):
+            self._prototypes[code] = entity
+        self._index_add(coord, entity)
+
+    def add_entities(
+        self, coords: list[Coordinate], entities: list[Entity]
+    ) -> None:
+        """
+        Add entities to empty cells in bulk.
+        The caller must ensure every cell in coords is empty.
+        """
+        if not coords:
+            return
+        creature_types = EntityType.creatures()
+        codes = []
+        for entity in entities:
+            code = entity.entity_type.code
+            codes.append(code)
+            if (
+                self._prototypes[code] is None
+                and entity.entity_type not in creature_types
+            ):
+                self._prototypes[code] = entity
+        xs = np.fromiter((coord.x for coord in coords), np.intp, len(coords))
+        ys = np.fromiter((coord.y for coord in coords), np.intp, len(coords))
+        self._grid[ys, xs] = codes
+        self._index_add_many(coords, entities)
+
+    def add_static_entities(self, entity: Entity, indexes: np.ndarray) -> None:
+        """
+        Place one shared static entity on many empty cells, given by
+        their flat y * width + x indexes.
+        The caller must ensure every cell is empty.
+        """
+        code = entity.entity_type.code
+        if self._prototypes[code] is None:
+            self._prototypes[code] = entity
+        self._grid.reshape(-1)[indexes] = code
+        self._index_static_entities(entity, indexes)
+
+    def add_static_grid(
+        self, grid: np.ndarray, entities: list[Entity]
+    ) -> None:
+        """
+        Place shared static entities on the cells of an int8 (height,
+        width) code grid: each of entities on the cells holding its type
+        code. Other codes are ignored. The caller must ensure every cell
+        filled is empty.
+        """
+        codes = [entity.entity_type.code for entity in entities]
+        # Code lookup table, cheaper than np.isin on a large grid
+        copied = np.zeros(len(EntityType) + 1, dtype=bool)
+        copied[codes] = True
+        np.copyto(self._grid, grid, where=copied[grid])
+        flat = grid.ravel()
+        for entity, code in zip(entities, codes):
+            if self._prototypes[code] is None:
+                self._prototypes[code] = entity
+            indexes = np.flatnonzero(flat == code)
+            if len(indexes):
+                self._index_static_entities(entity, indexes)
+
+    def remove_entity(self, coord: Coordinate) -> Entity | None:
+        """Remove an entity from the specified coordinate and return it."""
+        entity = self.get_entity(coord)
+        if entity is not None:
+            self._grid[coord.y, coord.x] = EMPTY_CELL_CODE
+            self._index_remove(coord, entity)
+        return entity
+
+    def get_entity(self, coord: Coordinate) -> Entity | None:
+        """Get the entity at the specified coordinate."""
+        if not self.is_valid_coord(coord.x, coord.y):
+            return None
+        code = self._grid[coord.y, coord.x]
+        if code == EMPTY_CELL_CODE:
+            return None
+        creature = self._creatures.get(coord)
+        if creature is not None:
+            return creature
+        return self._prototypes[code]
+
+    def get_all_entities_with_coords(self) -> dict[Coordinate, Entity]:
+        """
+        Returns a dictionary with all entities and their coordinates.
+        """
+        return {
+            coord: self.get_entity(coord)
+            for entity_type in EntityType
+            for coord in self.get_coords_by_type(entity_type)
+        }
+
+    def is_cell_empty(self, x: int, y: int) -> bool:
+        """Check if the cell is empty."""
+        if not self.is_valid_coord(x, y):
+            return True
+        return self._grid[y, x] == EMPTY_CELL_CODE
+
+    def get_empty_cells(self) -> list[Coordinate]:
+        """Get all empty cells, ordered by column and then by row."""
+        xs, ys = np.nonzero(self._grid.T == EMPTY_CELL_CODE)
+        return [
+            self.get_coord(x, y) for x, y in zip(xs.tolist(), ys.tolist())
+        ]
+
+    def get_occupied_indexes(self) -> np.ndarray:
+        """Sorted flat y * width + x indexes of the occupied cells."""
+        return np.flatnonzero(self._grid != EMPTY_CELL_CODE)
+
+    def get_empty_mask(self) -> np.ndarray:
+        """Get a boolean (height, width) array, True for empty cells."""
+        return self._grid == EMPTY_CELL_CODE
+
+    def get_code_grid(self) -> np.ndarray:
+        """
+        Get a new int8 (height, width) array of EntityType codes,
+        with EMPTY_CELL_CODE for empty cells.
+        """
+        return self._grid.copy()
+
+    def get_code_tiles(self) -> list[tuple[int, int, np.ndarray]]:
+        """
+        Get (x, y, codes) for rectangles of cells that together hold
+        every entity; here one read-only view of the whole grid.
+        """
+        return [(0, 0, self.grid)]
+
+    def get_code_window(
+        self, x: int, y: int, width: int, height: int
+    ) -> np.ndarray:
+        """
+        Get the int8 (height, width) array of EntityType codes of the
+        cells from (x, y) to (x + width - 1, y + height - 1).
+        """
+        return self._grid[y : y + height, x : x + width].copy()
+
+    def get_blocked_mask(self) -> bytearray:
+        """
+        Get a flat occupancy mask indexed by y * width + x,
+        where 1 marks an occupied cell and 0 an empty one.
+        """
+        return bytearray((self._grid != EMPTY_CELL_CODE).tobytes())
+
+    def get_row(self, y: int) -> list[Entity | None]:
+        """Get the entities of a single map row (None for empty cells)."""
+        codes = self._grid[y]
+        row = self._prototypes[codes].tolist()
+        for x in np.flatnonzero(np.isin(codes, self._creature_codes)).tolist():
+            row[x] = self._creatures[self.get_coord(x, y)]
+        return row
+
+    def move_entity(
+        self, current_coord: Coordinate, target_coord: Coordinate
+    ) -> None:
+        """
+        Move an entity from one coordinate to another.
+        Preconditions are the same as for Map.move_entity.
+        """
+        entity_to_move = self.get_entity(current_coord)
+        if entity_to_move is None:
+            raise ValueError(
+                f"No entity at {current_coord} to move"
+            )
+
+        if not self.is_cell_empty(target_coord.x, target_coord.y):
+            raise ValueError(
+                f"Target cell {target_coord} is not empty"
+            )
+
+        self._grid[target_coord.y, target_coord.x] = (
+            self._grid[current_coord.y, current_coord.x]
+        )
+        self._grid[current_coord.y, current_coord.x] = EMPTY_CELL_CODE
+        self._index_move(current_coord, target_coord, entity_to_move)
+
+    def _find_cells(self, code: int) -> tuple[np.ndarray, np.ndarray]:
+        """x and y arrays of the cells holding a type code."""
+        ys, xs = np.nonzero(self._grid == code)
+        return xs, ys
@@ -1,27 +1,167 @@
 import random
 
+import numpy as np
+
 from config import config
 from entities.base.entity import Entity
-from utils import Direction, EntityType
+from utils import EMPTY_CELL_CODE, Direction, EntityType, get_numpy_rng
 
+from .block_counts import BlockCounts
 from .coordinate import Coordinate
+from .creature_store import CreatureStore
+from .map_change import MapChange, MapSubscriber
+from .target_index import TargetIndex
+
+# Types creatures move towards, kept in the target index
+_TARGET_TYPES = (EntityType.GRASS, EntityType.HERBIVORE)
+
+# (dx, dy) of the 4 cardinal moves, in Direction.movement_directions order
+_MOVEMENT_OFFSETS = tuple(
+    direction.value for direction in Direction.movement_directions()
+)
 
 
 class Map:
     """Represents the game map."""
 
-    def __init__(self) -> None:
-        self.width = config.map_width
-        self.height = config.map_height
+    # Types whose coordinates are kept in sets by the indexes; backends
+    # leaving some out find their cells with _find_cells
+    _indexed_types: tuple[EntityType, ...] = tuple(EntityType)
+
+    def __init__(
+        self, width: int | None = None, height: int | None = None
+    ) -> None:
+        self.width = width if width is not None else config.map_width
+        self.height = height if height is not None else config.map_height
         self._entities = {}
+        # Indexes kept in sync with _entities by add/remove/move, read
+        # through _coords_by_type
+        self._type_coords: dict[EntityType, set[Coordinate]] = {
+            entity_type: set() for entity_type in self._indexed_types
+        }
+        self._creatures: dict[Coordinate, Entity] = {}
+        # Shared Coordinate per flat cell index, created on first use
+        self._cells = self._create_cell_cache()
+        # Array storage of creature stats, kept in sync with _creatures
+        self.creature_store = CreatureStore()
+        # Entity counts per block of cells, for zoomed-out rendering, and
+        # the blocks changed during the current turn
+        self.block_counts = BlockCounts(
+            self.width, self.height, self._get_count_block_size()
+        )
+        # Target positions in buckets, read through target_index
+        self._target_index = TargetIndex(
+            self.width, self.height, config.target_bucket_size, _TARGET_TYPES
+        )
+        # (type, flat indexes) of static cells not yet in the coordinate
+        # sets and the target index, registered on first access
+        self._pending_static: list[tuple[EntityType, np.ndarray]] = []
+        # Incremented at the start of every simulation turn
+        self.turn = 0
+        # Incremented by every change of the entities on the map
+        self.version = 0
+        self._subscribers: list[MapSubscriber] = []
+
+    @property
+    def _coords_by_type(self) -> dict[EntityType, set[Coordinate]]:
+        """Coordinate sets of the indexed types."""
+        if self._pending_static:
+            self._register_pending_static()
+        return self._type_coords
+
+    @property
+    def target_index(self) -> TargetIndex:
+        """Target positions in buckets, for nearest-target queries."""
+        if self._pending_static:
+            self._register_pending_static()
+        return self._target_index
+
+    def build_indexes(self) -> None:
+        """
+        Add the static cells still pending to the coordinate sets and
+        the target index, so that later queries only read the map.
+        """
+        if self._pending_static:
+            self._register_pending_static()
+
+    def begin_turn(self) -> None:
+        """
+        Mark the start of a new simulation turn. The dirty blocks of the
+        block counts are cleared, so they show what the turn changed.
+        """
+        self.turn += 1
+        self.block_counts.clear_dirty()
+
+    def subscribe(self, subscriber: MapSubscriber) -> None:
+        """
+        Call subscriber after every change of the map, see MapChange.
+        Bulk additions publish one change per cell.
+        """
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: MapSubscriber) -> None:
+        """Stop calling a subscriber."""
+        self._subscribers.remove(subscriber)
+
+    def _publish(
+        self,
+        change: MapChange,
+        coord: Coordinate,
+        entity: Entity,
+        to_coord: Coordinate | None = None,
+    ) -> None:
+        """Pass a change to every subscriber."""
+        for subscriber in self._subscribers:
+            subscriber(change, coord, entity, to_coord)
 
     def add_entity(self, coord: Coordinate, entity: Entity) -> None:
         """Add an entity to the specified coordinate."""
+        if coord in self._entities:
+            self.remove_entity(coord)
         self._entities[coord] = entity
+        self._index_add(coord, entity)
+
+    def add_entities(
+        self, coords: list[Coordinate], entities: list[Entity]
+    ) -> None:
+        """
+        Add entities to empty cells in bulk.
+        The caller must ensure every cell in coords is empty.
+        """
+        self._entities.update(zip(coords, entities))
+        self._index_add_many(coords, entities)
+
+    def add_static_entities(self, entity: Entity, indexes: np.ndarray) -> None:
+        """
+        Place one shared static entity on many empty cells, given by
+        their flat y * width + x indexes.
+        The caller must ensure every cell is empty.
+        """
+        coords = self.get_coords(indexes)
+        self._entities.update(dict.fromkeys(coords, entity))
+        self._index_static_entities(entity, indexes, coords)
+
+    def add_static_grid(
+        self, grid: np.ndarray, entities: list[Entity]
+    ) -> None:
+        """
+        Place shared static entities on the cells of an int8 (height,
+        width) code grid: each of entities on the cells holding its type
+        code. Other codes are ignored. The caller must ensure every cell
+        filled is empty.
+        """
+        flat = grid.ravel()
+        for entity in entities:
+            indexes = np.flatnonzero(flat == entity.entity_type.code)
+            if len(indexes):
+                self.add_static_entities(entity, indexes)
 
     def remove_entity(self, coord: Coordinate) -> Entity | None:
         """Remove an entity from the specified coordinate and return it."""
-        return self._entities.pop(coord, None)
+        entity = self._entities.pop(coord, None)
+        if entity is not None:
+            self._index_remove(coord, entity)
+        return entity
 
     def get_entity(self, coord: Coordinate) -> Entity | None:
         """Get the entity at the specified coordinate."""
@@ -31,20 +171,37 @@ class Map:
         self, entity_type: "EntityType"
     ) -> list[Coordinate]:
         """Get all coordinates containing entities of the specified type."""
+        type_coords = self._coords_by_type.get(entity_type)
+        if type_coords is not None:
+            return list(type_coords)
+        xs, ys = self._find_cells(entity_type.code)
         return [
-            coord
-            for coord, entity in self._entities.items()
-            if entity.entity_type == entity_type
+            self.get_coord(x, y) for x, y in zip(xs.tolist(), ys.tolist())
         ]
 
+    def get_coord_set_by_type(
+        self, entity_type: "EntityType"
+    ) -> set[Coordinate]:
+        """Get a copy of the coordinate set of the specified type."""
+        type_coords = self._coords_by_type.get(entity_type)
+        if type_coords is not None:
+            return set(type_coords)
+        return set(self.get_coords_by_type(entity_type))
+
     def get_entity_by_type(self, entity_type: "EntityType") -> list[Entity]:
         """Get all entities of the specified type."""
         return [
-            entity
-            for entity in self._entities.values()
-            if entity.entity_type == entity_type
+            self.get_entity(coord)
+            for coord in self.get_coords_by_type(entity_type)
         ]
 
+    def count_by_type(self, entity_type: "EntityType") -> int:
+        """Return number of entities of the specified type."""
+        type_coords = self._coords_by_type.get(entity_type)
+        if type_coords is not None:
+            return len(type_coords)
+        return int(self.block_counts.counts[entity_type.code].sum())
+
     def get_all_entities_with_coords(self) -> dict[Coordinate, Entity]:
         """
         Returns a copy of dictionary with all entities
@@ -52,10 +209,34 @@ class Map:
         """
         return self._entities.copy()
 
+    def get_creatures_with_coords(self) -> dict[Coordinate, Entity]:
+        """
+        Returns a copy of dictionary with creatures only, in the same
+        order as they appear in get_all_entities_with_coords().
+        """
+        return self._creatures.copy()
+
+    def find_nearest(
+        self,
+        entity_type: "EntityType",
+        coord: Coordinate,
+        count: int | None = None,
+        max_distance: int | None = None,
+    ) -> list[Coordinate]:
+        """
+        Get the coordinates of the count entities of a target type
+        nearest to coord by Manhattan distance, nearest first. All of
+        them if count is None, and only those within max_distance if it
+        is given.
+        """
+        return self.target_index.nearest(
+            entity_type, coord.x, coord.y, count, max_distance
+        )
+
     def get_creatures_count(self) -> tuple[int, int]:
         """Return number of herbivores and predators on the map."""
-        herbivores = len(self.get_entity_by_type(EntityType.HERBIVORE))
-        predators = len(self.get_entity_by_type(EntityType.PREDATOR))
+        herbivores = self.count_by_type(EntityType.HERBIVORE)
+        predators = self.count_by_type(EntityType.PREDATOR)
         return herbivores, predators
 
     def is_valid_coord(self, x: int, y: int) -> bool:
@@ -64,7 +245,157 @@ class Map:
 
     def is_cell_empty(self, x: int, y: int) -> bool:
         """Check if the cell is empty."""
-        return self.get_entity(Coordinate(x, y)) is None
+        if not self.is_valid_coord(x, y):
+            return True
+        return self.get_entity(self.get_coord(x, y)) is None
+
+    def get_empty_cells(self) -> list[Coordinate]:
+        """Get all empty cells, ordered by column and then by row."""
+        return [
+            self.get_coord(x, y)
+            for x in range(self.width)
+            for y in range(self.height)
+            if self.is_cell_empty(x, y)
+        ]
+
+    def sample_empty_cells(self, probability: float) -> list[Coordinate]:
+        """
+        Choose every empty cell independently with the given probability,
+        using the NumPy generator. The cells are ordered by column and
+        then by row.
+
+        Instead of a sample per cell, the gaps between the ranks of the
+        chosen cells among the empty ones are drawn from a geometric
+        distribution, and ranks are mapped to cells with the occupied
+        ones. The work is proportional to the chosen and occupied cells
+        rather than the map area, and the draws only depend on the
+        number of empty cells, so every backend chooses the same cells.
+        """
+        occupied = self.get_occupied_indexes()
+        empty_count = self.width * self.height - len(occupied)
+        if probability <= 0 or empty_count == 0:
+            return []
+        rng = get_numpy_rng()
+        batch = int(empty_count * probability) + 16
+        parts = []
+        last = -1
+        while last < empty_count - 1:
+            ranks = last + np.cumsum(rng.geometric(probability, batch))
+            last = int(ranks[-1])
+            parts.append(ranks[ranks < empty_count])
+        ranks = np.concatenate(parts)
+        # The empty cell of a rank follows every occupied cell that has
+        # at most that many empty cells before it
+        indexes = ranks + np.searchsorted(
+            occupied - np.arange(len(occupied)), ranks, side="right"
+        )
+        xs, ys = indexes % self.width, indexes // self.width
+        order = np.lexsort((ys, xs))
+        return [
+            self.get_coord(x, y)
+            for x, y in zip(xs[order].tolist(), ys[order].tolist())
+        ]
+
+    def get_row(self, y: int) -> list[Entity | None]:
+        """Get the entities of a single map row (None for empty cells)."""
+        return [
+            self._entities.get(self.get_coord(x, y))
+            for x in range(self.width)
+        ]
+
+    def get_coord(self, x: int, y: int) -> Coordinate:
+        """Get the shared coordinate of a cell inside the map."""
+        return self.index_to_coord(y * self.width + x)
+
+    def index_to_coord(self, index: int) -> Coordinate:
+        """Convert a flat y * width + x cell index to a coordinate."""
+        coord = self._cells[index]
+        if coord is None:
+            coord = Coordinate(index % self.width, index // self.width)
+            self._cells[index] = coord
+        return coord
+
+    def get_coords(self, indexes: np.ndarray) -> list[Coordinate]:
+        """Convert an array of flat cell indexes to coordinates."""
+        cells = self._cells
+        width = self.width
+        coords = []
+        for index in indexes.tolist():
+            coord = cells[index]
+            if coord is None:
+                coord = Coordinate(index % width, index // width)
+                cells[index] = coord
+            coords.append(coord)
+        return coords
+
+    def coord_to_index(self, coord: Coordinate) -> int:
+        """Convert a coordinate to its flat y * width + x cell index."""
+        return coord.y * self.width + coord.x
+
+    def get_occupied_indexes(self) -> np.ndarray:
+        """Sorted flat y * width + x indexes of the occupied cells."""
+        width = self.width
+        return np.sort(
+            np.fromiter(
+                (coord.y * width + coord.x for coord in self._entities),
+                np.int64,
+                len(self._entities),
+            )
+        )
+
+    def get_blocked_mask(self) -> bytearray:
+        """
+        Get a flat occupancy mask indexed by y * width + x,
+        where 1 marks an occupied cell and 0 an empty one.
+        """
+        mask = bytearray(self.width * self.height)
+        for coord in self._entities:
+            mask[coord.y * self.width + coord.x] = 1
+        return mask
+
+    def get_empty_mask(self) -> np.ndarray:
+        """Get a boolean (height, width) array, True for empty cells."""
+        blocked = np.frombuffer(self.get_blocked_mask(), dtype=np.uint8)
+        return blocked.reshape(self.height, self.width) == 0
+
+    def get_code_grid(self) -> np.ndarray:
+        """
+        Get a new int8 (height, width) array of EntityType codes,
+        with EMPTY_CELL_CODE for empty cells.
+        """
+        grid = np.full(
+            (self.height, self.width), EMPTY_CELL_CODE, dtype=np.int8
+        )
+        for entity_type, coords in self._coords_by_type.items():
+            for coord in coords:
+                grid[coord.y, coord.x] = entity_type.code
+        return grid
+
+    def get_code_tiles(self) -> list[tuple[int, int, np.ndarray]]:
+        """
+        Get (x, y, codes) for rectangles of cells that together hold
+        every entity: codes is an int8 array of EntityType codes indexed
+        as [y, x] from the cell (x, y), not to be modified. Cells outside
+        the rectangles are empty.
+        """
+        return [(0, 0, self.get_code_grid())]
+
+    def get_code_window(
+        self, x: int, y: int, width: int, height: int
+    ) -> np.ndarray:
+        """
+        Get the int8 (height, width) array of EntityType codes of the
+        cells from (x, y) to (x + width - 1, y + height - 1).
+        """
+        window = np.full((height, width), EMPTY_CELL_CODE, dtype=np.int8)
+        entities = self._entities
+        for row in range(height):
+            base = (y + row) * self.width + x
+            for column in range(width):
+                entity = entities.get(self.index_to_coord(base + column))
+                if entity is not None:
+                    window[row, column] = entity.entity_type.code
+        return window
 
     def find_random_empty_cell(self) -> Coordinate:
         """Find a random empty cell on the map."""
@@ -74,7 +405,7 @@ class Map:
             x = random.randint(0, self.width - 1)
             y = random.randint(0, self.height - 1)
             if self.is_cell_empty(x, y):
-                return Coordinate(x, y)
+                return self.get_coord(x, y)
             attempts += 1
         raise RuntimeError("Failed to find an empty cell on the map.")
 
@@ -105,6 +436,7 @@ class Map:
         # Safe move
         self._entities.pop(current_coord)
         self._entities[target_coord] = entity_to_move
+        self._index_move(current_coord, target_coord, entity_to_move)
 
     def get_neighbors_cells(self, coord: Coordinate) -> list[Coordinate]:
         """
@@ -117,9 +449,158 @@ class Map:
             List of valid neighboring coordinates
         """
         neighbors = []
-        for direction in Direction.movement_directions():
-            dx, dy = direction.value
+        for dx, dy in _MOVEMENT_OFFSETS:
             nx, ny = coord.x + dx, coord.y + dy
-            if self.is_valid_coord(nx, ny):
-                neighbors.append(Coordinate(nx, ny))
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                neighbors.append(self.index_to_coord(ny * self.width + nx))
         return neighbors
+
+    def _create_cell_cache(self) -> list[Coordinate | None]:
+        """Storage of the shared coordinates, indexed by flat cell index."""
+        return [None] * (self.width * self.height)
+
+    def _get_count_block_size(self) -> int:
+        """Side of the blocks of cells counted in block_counts."""
+        return config.overview_block_size
+
+    def _find_cells(self, code: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        x and y arrays of the cells holding a type code. Only needed by
+        backends that leave some types out of _indexed_types.
+        """
+        raise NotImplementedError
+
+    def _index_static_entities(
+        self,
+        entity: Entity,
+        indexes: np.ndarray,
+        coords: list[Coordinate] | None = None,
+    ) -> None:
+        """
+        Register cells filled by add_static_entities in the indexes.
+
+        coords are the coordinates of indexes, if already known; they
+        are then added to the coordinate sets and the target index at
+        once. Otherwise the cells are only added on the first access of
+        those, so bulk loads create no coordinate per cell up front.
+        """
+        self.version += 1
+        entity_type = entity.entity_type
+        self.block_counts.add_many(
+            np.full(len(indexes), entity_type.code),
+            indexes % self.width,
+            indexes // self.width,
+        )
+        if entity_type in self._type_coords or self._target_index.covers(
+            entity_type
+        ):
+            if coords is None:
+                self._pending_static.append((entity_type, indexes))
+            else:
+                type_coords = self._coords_by_type.get(entity_type)
+                if type_coords is not None:
+                    type_coords.update(coords)
+                self.target_index.add_many(entity_type, coords)
+        if self._subscribers:
+            if coords is None:
+                coords = self.get_coords(indexes)
+            for coord in coords:
+                self._publish(MapChange.ADD, coord, entity)
+
+    def _register_pending_static(self) -> None:
+        """Add the pending static cells to the sets and target index."""
+        pending, self._pending_static = self._pending_static, []
+        for entity_type, indexes in pending:
+            coords = self.get_coords(indexes)
+            type_coords = self._type_coords.get(entity_type)
+            if type_coords is not None:
+                type_coords.update(coords)
+            self._target_index.add_many(entity_type, coords)
+
+    def _index_add(self, coord: Coordinate, entity: Entity) -> None:
+        """Register a newly placed entity in the type indexes."""
+        self.version += 1
+        # The cell was empty, so no pending static cell can be affected
+        type_coords = self._type_coords.get(entity.entity_type)
+        if type_coords is not None:
+            type_coords.add(coord)
+        self.block_counts.add(entity.entity_type, coord.x, coord.y)
+        self._target_index.add(entity.entity_type, coord)
+        if entity.entity_type in EntityType.creatures():
+            self._creatures[coord] = entity
+            self.creature_store.add(entity, coord)
+        if self._subscribers:
+            self._publish(MapChange.ADD, coord, entity)
+
+    def _index_add_many(
+        self, coords: list[Coordinate], entities: list[Entity]
+    ) -> None:
+        """Register a batch of newly placed entities in the type indexes."""
+        self.version += 1
+        creature_types = EntityType.creatures()
+        # The cells were empty, so no pending static cell can be affected
+        coords_by_type = self._type_coords
+        for coord, entity in zip(coords, entities):
+            entity_type = entity.entity_type
+            type_coords = coords_by_type.get(entity_type)
+            if type_coords is not None:
+                type_coords.add(coord)
+            if entity_type in creature_types:
+                self._creatures[coord] = entity
+                self.creature_store.add(entity, coord)
+        for entity_type in self._target_index.entity_types:
+            self._target_index.add_many(
+                entity_type,
+                [
+                    coord
+                    for coord, entity in zip(coords, entities)
+                    if entity.entity_type is entity_type
+                ],
+            )
+        self.block_counts.add_many(
+            [entity.entity_type.code for entity in entities],
+            [coord.x for coord in coords],
+            [coord.y for coord in coords],
+        )
+        if self._subscribers:
+            for coord, entity in zip(coords, entities):
+                self._publish(MapChange.ADD, coord, entity)
+
+    def _index_remove(self, coord: Coordinate, entity: Entity) -> None:
+        """Drop a removed entity from the type indexes."""
+        self.version += 1
+        type_coords = self._coords_by_type.get(entity.entity_type)
+        if type_coords is not None:
+            type_coords.discard(coord)
+        self.block_counts.remove(entity.entity_type, coord.x, coord.y)
+        self.target_index.remove(entity.entity_type, coord)
+        if self._creatures.pop(coord, None) is not None:
+            self.creature_store.remove(entity)
+        if self._subscribers:
+            self._publish(MapChange.REMOVE, coord, entity)
+
+    def _index_move(
+        self,
+        current_coord: Coordinate,
+        target_coord: Coordinate,
+        entity: Entity,
+    ) -> None:
+        """Update the type indexes after an entity moved."""
+        self.version += 1
+        type_coords = self._coords_by_type.get(entity.entity_type)
+        if type_coords is not None:
+            type_coords.discard(current_coord)
+            type_coords.add(target_coord)
+        self.block_counts.move(
+            entity.entity_type,
+            current_coord.x,
+            current_coord.y,
+            target_coord.x,
+            target_coord.y,
+        )
+        self.target_index.move(entity.entity_type, current_coord, target_coord)
+        if self._creatures.pop(current_coord, None) is not None:
+            self._creatures[target_coord] = entity
+            self.creature_store.move(entity, target_coord)
+        if self._subscribers:
+            self._publish(MapChange.MOVE, current_coord, entity, target_coord)
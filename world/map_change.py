@@ -0,0 +1,26 @@
+from collections.abc import Callable
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from entities.base.entity import Entity
+
+    from .coordinate import Coordinate
+
+
+class MapChange(IntEnum):
+    """
+    Kinds of changes a map publishes to its subscribers.
+
+    A subscriber is called as subscriber(change, coord, entity, to_coord)
+    after the change is made; to_coord is only set for moves.
+    """
+
+    ADD = 1  # entity placed on coord
+    REMOVE = 2  # entity removed from coord
+    MOVE = 3  # entity moved from coord to to_coord
+
+
+MapSubscriber = Callable[
+    [MapChange, "Coordinate", "Entity", "Coordinate | None"], None
+]
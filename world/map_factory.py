@@ -0,0 +1,46 @@
+from config import config
+
+from .chunked_map import ChunkedMap
+from .grid_map import GridMap
+from .map import Map
+
+
+class MapFactory:
+    _registry: dict[str, type[Map]] = {
+        "dict": Map,
+        "grid": GridMap,
+        "chunked": ChunkedMap,
+    }
+
+    @classmethod
+    def create_map(
+        cls,
+        backend: str | None = None,
+        width: int | None = None,
+        height: int | None = None,
+    ) -> Map:
+        """
+        Create a map with the given storage backend.
+
+        Args:
+            backend: Registered backend name, config.map_backend if omitted
+            width: Map width, config.map_width if omitted
+            height: Map height, config.map_height if omitted
+        """
+        backend = backend or config.map_backend
+        if backend not in cls._registry:
+            raise ValueError(f"Map backend {backend} is not registered")
+        return cls._registry[backend](width, height)
+
+    @classmethod
+    def get_backend_names(cls) -> list[str]:
+        """Return the names of the registered backends."""
+        return list(cls._registry)
+
+    @classmethod
+    def get_backend_name(cls, world_map: Map) -> str:
+        """Return the registered name of the backend of a map."""
+        for name, map_class in cls._registry.items():
+            if type(world_map) is map_class:
+                return name
+        raise ValueError(f"{type(world_map).__name__} is not registered")
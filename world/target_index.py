@@ -0,0 +1,222 @@
+import heapq
+from collections.abc import Iterable
+
+from utils import EntityType
+
+from .coordinate import Coordinate
+
+
+class TargetIndex:
+    """
+    Coordinates of the entities of some types, grouped into square
+    buckets of bucket_size x bucket_size cells for nearest-target
+    queries.
+
+    Only non-empty buckets are stored, so the index costs memory in
+    proportion to the entities, not to the map area. The map keeps it up
+    to date as entities are added, removed and moved; entities of types
+    the index does not cover are ignored.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        bucket_size: int,
+        entity_types: Iterable[EntityType],
+    ) -> None:
+        if bucket_size < 1:
+            raise ValueError("bucket_size must be at least 1")
+        self.bucket_size = bucket_size
+        # Rings of buckets needed to cover the map from any bucket
+        self._max_ring = max(
+            -(-width // bucket_size), -(-height // bucket_size)
+        )
+        self._buckets: dict[
+            EntityType, dict[tuple[int, int], set[Coordinate]]
+        ] = {entity_type: {} for entity_type in entity_types}
+
+    @property
+    def entity_types(self) -> tuple[EntityType, ...]:
+        """Types whose entities are indexed."""
+        return tuple(self._buckets)
+
+    def covers(self, entity_type: EntityType) -> bool:
+        """Whether entities of the type are indexed."""
+        return entity_type in self._buckets
+
+    def add(self, entity_type: EntityType, coord: Coordinate) -> None:
+        """Index an entity placed on a cell."""
+        buckets = self._buckets.get(entity_type)
+        if buckets is None:
+            return
+        size = self.bucket_size
+        key = (coord.x // size, coord.y // size)
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = {coord}
+        else:
+            bucket.add(coord)
+
+    def add_many(
+        self, entity_type: EntityType, coords: Iterable[Coordinate]
+    ) -> None:
+        """Index entities of one type placed on many cells."""
+        buckets = self._buckets.get(entity_type)
+        if buckets is None:
+            return
+        size = self.bucket_size
+        for coord in coords:
+            key = (coord.x // size, coord.y // size)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = {coord}
+            else:
+                bucket.add(coord)
+
+    def remove(self, entity_type: EntityType, coord: Coordinate) -> None:
+        """Stop indexing an entity removed from a cell."""
+        buckets = self._buckets.get(entity_type)
+        if buckets is None:
+            return
+        size = self.bucket_size
+        key = (coord.x // size, coord.y // size)
+        bucket = buckets[key]
+        bucket.discard(coord)
+        if not bucket:
+            del buckets[key]
+
+    def move(
+        self, entity_type: EntityType, coord: Coordinate, to_coord: Coordinate
+    ) -> None:
+        """Update the index after an entity moved."""
+        if entity_type in self._buckets:
+            self.remove(entity_type, coord)
+            self.add(entity_type, to_coord)
+
+    def nearest(
+        self,
+        entity_type: EntityType,
+        x: int,
+        y: int,
+        count: int | None = None,
+        max_distance: int | None = None,
+    ) -> list[Coordinate]:
+        """
+        The count entities of a type nearest to (x, y) by Manhattan
+        distance, nearest first; all of them if count is None. Entities
+        further than max_distance are left out. Ties are broken by row,
+        then column.
+
+        Buckets are visited in square rings around the bucket of (x, y)
+        until no unvisited bucket can hold a nearer entity, or one within
+        max_distance. Once a ring has more slots than there are non-empty
+        buckets, the remaining non-empty buckets are visited directly,
+        nearest first.
+        """
+        buckets = self._buckets[entity_type]
+        if (count is not None and count < 1) or not buckets:
+            return []
+        size = self.bucket_size
+        bucket_x, bucket_y = x // size, y // size
+        # (distance, y, x, coord) of every entity of the visited buckets
+        found: list[tuple[int, int, int, Coordinate]] = []
+
+        ring = 0
+        while ring <= self._max_ring:
+            # Cells of this ring and beyond are further away than this
+            bound = (ring - 1) * size if ring else -1
+            if max_distance is not None and bound >= max_distance:
+                break
+            if (
+                ring
+                and count is not None
+                and len(found) >= count
+                and heapq.nsmallest(count, found)[-1][0] <= bound
+            ):
+                break
+            if 8 * ring > len(buckets):
+                self._visit_remaining(
+                    buckets, x, y, ring, count, max_distance, found
+                )
+                break
+            for key in self._ring_keys(bucket_x, bucket_y, ring):
+                bucket = buckets.get(key)
+                if bucket is not None:
+                    self._collect(bucket, x, y, found)
+            ring += 1
+
+        if max_distance is not None:
+            found = [item for item in found if item[0] <= max_distance]
+        if count is None:
+            found.sort()
+        else:
+            found = heapq.nsmallest(count, found)
+        return [coord for *_, coord in found]
+
+    def _visit_remaining(
+        self,
+        buckets: dict[tuple[int, int], set[Coordinate]],
+        x: int,
+        y: int,
+        ring: int,
+        count: int | None,
+        max_distance: int | None,
+        found: list[tuple[int, int, int, Coordinate]],
+    ) -> None:
+        """
+        Visit the non-empty buckets at least ring rings away, in order
+        of their distance to (x, y), while they may hold a nearer entity
+        within max_distance.
+        """
+        size = self.bucket_size
+        bucket_x, bucket_y = x // size, y // size
+        remaining = sorted(
+            (self._bucket_distance(key, x, y), key)
+            for key in buckets
+            if max(abs(key[0] - bucket_x), abs(key[1] - bucket_y)) >= ring
+        )
+        for distance, key in remaining:
+            if max_distance is not None and distance > max_distance:
+                break
+            if count is not None and len(found) >= count:
+                if distance > heapq.nsmallest(count, found)[-1][0]:
+                    break
+            self._collect(buckets[key], x, y, found)
+
+    def _bucket_distance(self, key: tuple[int, int], x: int, y: int) -> int:
+        """Manhattan distance from (x, y) to the nearest cell of a bucket."""
+        size = self.bucket_size
+        left, top = key[0] * size, key[1] * size
+        dx = left - x if x < left else max(0, x - (left + size - 1))
+        dy = top - y if y < top else max(0, y - (top + size - 1))
+        return dx + dy
+
+    @staticmethod
+    def _collect(
+        bucket: set[Coordinate],
+        x: int,
+        y: int,
+        found: list[tuple[int, int, int, Coordinate]],
+    ) -> None:
+        """Add the entities of a bucket with their distance to (x, y)."""
+        for coord in bucket:
+            found.append(
+                (abs(coord.x - x) + abs(coord.y - y), coord.y, coord.x, coord)
+            )
+
+    @staticmethod
+    def _ring_keys(
+        bucket_x: int, bucket_y: int, ring: int
+    ) -> list[tuple[int, int]]:
+        """Keys of the buckets ring buckets away (Chebyshev distance)."""
+        if ring == 0:
+            return [(bucket_x, bucket_y)]
+        keys = []
+        for dx in range(-ring, ring + 1):
+            keys.append((bucket_x + dx, bucket_y - ring))
+            keys.append((bucket_x + dx, bucket_y + ring))
+        for dy in range(-ring + 1, ring):
+            keys.append((bucket_x - ring, bucket_y + dy))
+            keys.append((bucket_x + ring, bucket_y + dy))
+        return keys